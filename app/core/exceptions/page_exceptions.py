@@ -0,0 +1,10 @@
+from dataclasses import dataclass, field
+
+
+@dataclass
+class InvalidCursorError(Exception):
+    cursor: str
+    message: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.message = f"Cursor: {self.cursor} is not valid for this listing."
@@ -0,0 +1,12 @@
+from dataclasses import dataclass, field
+
+
+@dataclass
+class ExchangeRateUnavailableError(Exception):
+    from_currency: str
+    to_currency: str
+    message: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.message = (f"Exchange rate {self.from_currency}-"
+                        f"{self.to_currency} is unavailable.")
@@ -1,13 +1,21 @@
 from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, Iterator, List, Optional
 
 from app.core.factories.repo_factory import RepoFactory
 from app.core.interactors.campaign_interactor import CampaignInteractor
+from app.core.interactors.export_interactor import ExportInteractor
 from app.core.interactors.payment_interactor import PaymentInteractor
 from app.core.interactors.product_interactor import ProductInteractor
 from app.core.interactors.receipt_interactor import ReceiptInteractor
+from app.core.interactors.report_interactor import ReportInteractor
 from app.core.interactors.shift_interactor import ShiftInteractor
+from app.core.models.catalog import ChangeAction, ChangeKind
+from app.core.models.export import ExportFilter
+from app.core.models.page import CampaignQuery, ProductQuery
 from app.core.models.product import DiscountedProduct
-from app.core.models.report import XReport, ZReport
+from app.core.models.report import ReportTotals
+from app.core.repositories.rate_provider import IRateProvider
 from app.core.schemas.campaign_schema import (
     AddProductInComboRequest,
     AddProductInComboResponse,
@@ -23,7 +31,11 @@ from app.core.schemas.campaign_schema import (
     GetAllCampaignsResponse,
     GetOneCampaignResponse,
 )
+from app.core.schemas.payment_schema import RateCacheStatsResponse
 from app.core.schemas.products_schema import (
+    CampaignChangeResponse,
+    CampaignProductChangeResponse,
+    CatalogChangesResponse,
     CreateProductRequest,
     CreateProductResponse,
     GetAllProductResponse,
@@ -39,16 +51,27 @@ from app.core.schemas.receipt_schema import (
     CreateReceiptResponse,
     GetOneReceiptResponse,
 )
-from app.core.schemas.report_schema import ReportResponse
+from app.core.schemas.report_schema import (
+    ReportResponse,
+    SalesAnalyticsResponse,
+    SalesReportResponse,
+    TopProductsResponse,
+    ZReportsResponse,
+)
 from app.core.schemas.shift_schema import (
     CreateShiftResponse,
     GetOneShiftResponse,
     UpdateShiftStateRequest,
 )
 from app.core.services.campaign_service import CampaignService
+from app.core.services.columnar_report import fallback_report_engine
+from app.core.services.db_executor import DatabaseExecutor
+from app.core.services.export_service import ExportService
 from app.core.services.payment_service import PaymentService
 from app.core.services.product_service import ProductService
+from app.core.services.rate_cache import RateCache
 from app.core.services.receipt_service import ReceiptService
+from app.core.services.report_service import ReportService
 from app.core.services.shift_service import ShiftService
 from app.core.state.shift_state import OpenShiftState
 
@@ -60,11 +83,17 @@ class POSCore:
     shift_interactor: ShiftInteractor
     campaign_interactor: CampaignInteractor
     payment_interactor: PaymentInteractor
+    report_interactor: ReportInteractor
+    export_interactor: ExportInteractor
 
 
     @classmethod
-    def create(cls, database: RepoFactory) -> 'POSCore':
-        product_service = ProductService(database.products())
+    def create(cls, database: RepoFactory,
+               rate_provider: Optional[IRateProvider] = None,
+               db_executor: Optional[DatabaseExecutor] = None,
+               rate_cache: Optional[RateCache] = None) -> 'POSCore':
+        product_service = ProductService(database.products(),
+                                         database.catalog_version())
         receipt_service = ReceiptService(database.receipts())
         shift_service = ShiftService(database.shifts())
         campaign_service = CampaignService(
@@ -72,8 +101,16 @@ class POSCore:
             receipt_discount_repo=database.receipt_discount_campaign(),
             combo_campaign_repo=database.combo_campaign(),
             buy_get_gift_repo=database.buy_n_get_n_campaign(),
+            catalog_version_repository=database.catalog_version(),
         )
-        payment_service = PaymentService()
+        payment_service = PaymentService(database.payments(),
+                                         rate_provider=rate_provider,
+                                         rate_cache=rate_cache or RateCache())
+        report_service = ReportService(database.reports())
+        report_engine = (database.report_engine() or
+                         fallback_report_engine(
+                             shift_service=shift_service,
+                             payment_service=payment_service))
         return cls(
             product_interactor=ProductInteractor(
                 product_service=product_service,
@@ -83,14 +120,27 @@ class POSCore:
                 product_service=product_service,
                 shift_service=shift_service,
                 campaign_service=campaign_service),
-            shift_interactor=ShiftInteractor(shift_service=shift_service),
+            shift_interactor=ShiftInteractor(
+                shift_service=shift_service,
+                report_engine=report_engine),
             campaign_interactor=CampaignInteractor(
                 campaign_service=campaign_service,
                 product_service=product_service),
             payment_interactor=PaymentInteractor(
                 payment_service=payment_service,
                 receipt_service=receipt_service,
-                shift_service=shift_service),
+                shift_service=shift_service,
+                report_service=report_service,
+                campaign_service=campaign_service,
+                db_executor=db_executor or DatabaseExecutor()),
+            report_interactor=ReportInteractor(
+                report_service=report_service,
+                report_engine=report_engine,
+                shift_service=shift_service,
+                payment_service=payment_service,
+                product_service=product_service),
+            export_interactor=ExportInteractor(
+                export_service=ExportService(database.exports())),
         )
 
 
@@ -104,9 +154,40 @@ class POSCore:
         return CreateProductResponse(product=product)
 
 
-    def get_all_products(self) -> GetAllProductResponse:
-        products = self.product_interactor.execute_get_all()
-        return GetAllProductResponse(products=products)
+    def get_catalog_version(self) -> int:
+        return self.product_interactor.execute_get_catalog_version()
+
+    def get_catalog_changes(self, since: int) -> CatalogChangesResponse:
+        delta = self.product_interactor.execute_get_changes(since=since)
+        products = {product.id: product for product in delta.products}
+        response = CatalogChangesResponse(
+            since=delta.since, version=delta.version, created=[], updated=[],
+            deleted=[], campaigns=[], campaign_products=[])
+        for change in delta.changes:
+            if change.kind == ChangeKind.CAMPAIGN:
+                response.campaigns.append(CampaignChangeResponse(
+                    campaign_id=change.entity_id, action=change.action))
+            elif change.kind == ChangeKind.CAMPAIGN_PRODUCT:
+                response.campaign_products.append(
+                    CampaignProductChangeResponse(
+                        campaign_id=change.entity_id,
+                        product_id=change.related_id, action=change.action))
+            elif change.action == ChangeAction.DELETED:
+                response.deleted.append(change.entity_id)
+            elif change.entity_id in products:
+                product = products[change.entity_id]
+                if change.action == ChangeAction.CREATED:
+                    response.created.append(product)
+                else:
+                    response.updated.append(product)
+        return response
+
+    def get_products(self, query: ProductQuery, cursor: Optional[str],
+                     limit: int) -> GetAllProductResponse:
+        page = self.product_interactor.execute_get_page(
+            query=query, cursor=cursor, limit=limit)
+        return GetAllProductResponse(products=page.items,
+                                     next_cursor=page.next_cursor)
 
     def get_one_product(self, product_id: str) -> GetOneProductResponse:
         product_decorator = self.product_interactor.execute_get_one(
@@ -195,7 +276,9 @@ class POSCore:
             items=receipt.items,
             status="open" if receipt.status else "closed",
             total=receipt.total,
-            discounted_total=receipt.discount_total)
+            discounted_total=receipt.discount_total,
+            opened_at=receipt.opened_at,
+            paid_at=receipt.paid_at)
 
     def delete_receipt(self, receipt_id: str) -> None:
         self.receipt_interactor.execute_delete(receipt_id=receipt_id)
@@ -206,6 +289,21 @@ class POSCore:
             receipt_id=receipt_id, to_currency=to_currency)
         return converted_amount
 
+    async def refresh_rates(self) -> List[str]:
+        return await self.payment_interactor.execute_refresh_rates()
+
+    def get_rate_cache_stats(self) -> RateCacheStatsResponse:
+        stats = self.payment_interactor.execute_get_rate_cache_stats()
+        lookups = stats.hits + stats.stale_hits + stats.misses
+        return RateCacheStatsResponse(
+            hits=stats.hits,
+            stale_hits=stats.stale_hits,
+            misses=stats.misses,
+            coalesced=stats.coalesced,
+            refresh_failures=stats.refresh_failures,
+            hit_ratio=(stats.hits + stats.stale_hits) / lookups
+            if lookups else 0.0)
+
 
     # Shifts
     def create_shift(self) -> CreateShiftResponse:
@@ -221,7 +319,9 @@ class POSCore:
             id=shift.id,
             receipts=shift.receipts,
             state="Open" if isinstance(shift.state, OpenShiftState) else "Closed",
-            total=shift.get_price())
+            total=shift.get_price(),
+            opened_at=shift.opened_at,
+            closed_at=shift.closed_at)
 
     def update_shift_status(self, shift_id: str,
                             request: UpdateShiftStateRequest) -> None:
@@ -235,9 +335,12 @@ class POSCore:
             campaign_id=campaign_id)
         return GetOneCampaignResponse(campaign=campaign)
 
-    def get_all_campaigns(self) -> GetAllCampaignsResponse:
-        campaigns = self.campaign_interactor.execute_get_all()
-        return GetAllCampaignsResponse(campaigns=campaigns)
+    def get_campaigns(self, query: CampaignQuery, cursor: Optional[str],
+                      limit: int) -> GetAllCampaignsResponse:
+        page = self.campaign_interactor.execute_get_page(
+            query=query, cursor=cursor, limit=limit)
+        return GetAllCampaignsResponse(campaigns=page.items,
+                                       next_cursor=page.next_cursor)
 
     def delete_campaigns(self, campaign_id: str) -> None:
         return self.campaign_interactor.execute_delete(
@@ -313,12 +416,40 @@ class POSCore:
 
     # Reports
     def get_xreport(self) -> ReportResponse:
-        report = XReport()
-        return report.make_report(self.shift_interactor.shift_service)
+        return self.report_interactor.execute_xreport()
 
     def get_zreport(self, shift_id: str) -> ReportResponse:
-        report = ZReport(shift_id=shift_id)
-        return report.make_report(self.shift_interactor.shift_service)
-
-
-
+        return self.report_interactor.execute_zreport(shift_id=shift_id)
+
+    def get_zreports(self, shift_ids: List[str]) -> ZReportsResponse:
+        reports = self.report_interactor.execute_zreports(shift_ids=shift_ids)
+        return ZReportsResponse(reports=reports)
+
+    def get_sales_report(self, day: Optional[date]) -> SalesReportResponse:
+        return self.report_interactor.execute_sales_report(day=day)
+
+    def get_sales_analytics(self, granularity: str, start: datetime,
+                            end: datetime) -> SalesAnalyticsResponse:
+        return self.report_interactor.execute_sales_analytics(
+            granularity=granularity, start=start, end=end)
+
+    def get_top_products(self, shift_id: Optional[str], by: str,
+                         limit: int) -> TopProductsResponse:
+        return self.report_interactor.execute_top_products(
+            shift_id=shift_id, by=by, limit=limit)
+
+    def rebuild_reports(self,
+                        totals: Optional[Dict[str, ReportTotals]] = None
+                        ) -> int:
+        return self.report_interactor.execute_rebuild(totals=totals)
+
+    # Exports
+    def export_receipts(self, export_filter: ExportFilter,
+                        export_format: str) -> Iterator[str]:
+        return self.export_interactor.execute_export_receipts(
+            export_filter=export_filter, export_format=export_format)
+
+    def export_sales_lines(self, export_filter: ExportFilter,
+                           export_format: str) -> Iterator[str]:
+        return self.export_interactor.execute_export_sales_lines(
+            export_filter=export_filter, export_format=export_format)
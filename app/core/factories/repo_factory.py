@@ -1,4 +1,4 @@
-from typing import Protocol
+from typing import Optional, Protocol
 
 from app.core.repositories.campaign_repository import (
     IBuyNGetNCampaignRepository,
@@ -6,8 +6,17 @@ from app.core.repositories.campaign_repository import (
     IProductDiscountCampaignRepository,
     IReceiptDiscountCampaignRepository,
 )
+from app.core.repositories.catalog_repository import (
+    ICatalogVersionRepository,
+)
+from app.core.repositories.export_repository import IExportRepository
+from app.core.repositories.payment_repository import IPaymentRepository
 from app.core.repositories.product_repository import IProductRepository
 from app.core.repositories.receipt_repesitory import IReceiptRepository
+from app.core.repositories.report_repository import (
+    IReportEngine,
+    IReportRepository,
+)
 from app.core.repositories.shift_repository import IShiftRepository
 
 
@@ -31,4 +40,19 @@ class RepoFactory(Protocol):
         pass
 
     def buy_n_get_n_campaign(self) -> IBuyNGetNCampaignRepository:
-        pass
\ No newline at end of file
+        pass
+
+    def payments(self) -> IPaymentRepository:
+        pass
+
+    def reports(self) -> IReportRepository:
+        pass
+
+    def report_engine(self) -> Optional[IReportEngine]:
+        pass
+
+    def exports(self) -> IExportRepository:
+        pass
+
+    def catalog_version(self) -> ICatalogVersionRepository:
+        pass
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import List
+from typing import Optional
 
 from app.core.models import NO_ID
 from app.core.models.campaign import (
@@ -10,6 +10,7 @@ from app.core.models.campaign import (
     DiscountCampaign,
     ReceiptCampaign,
 )
+from app.core.models.page import CampaignQuery, Page
 from app.core.models.product import NumProduct
 from app.core.models.receipt import ProductForReceipt
 from app.core.services.campaign_service import CampaignService
@@ -24,8 +25,10 @@ class CampaignInteractor:
     def execute_get_one(self, campaign_id: str) -> Campaign:
         return self.campaign_service.get_one_campaign(campaign_id=campaign_id)
 
-    def execute_get_all(self) -> List[Campaign]:
-        return self.campaign_service.get_all_campaigns()
+    def execute_get_page(self, query: CampaignQuery, cursor: Optional[str],
+                         limit: int) -> Page[Campaign]:
+        return self.campaign_service.get_campaigns_page(
+            query=query, cursor=cursor, limit=limit)
 
     def execute_delete(self, campaign_id: str) -> None:
         self.campaign_service.delete_campaign(campaign_id=campaign_id)
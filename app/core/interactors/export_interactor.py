@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+from typing import Iterator
+
+from app.core.models.export import ExportFilter, ReceiptRow, SalesLineRow
+from app.core.services.export_service import (
+    ExportService,
+    write_csv,
+    write_ndjson,
+)
+
+
+@dataclass
+class ExportInteractor:
+    export_service: ExportService
+
+    def execute_export_receipts(self, export_filter: ExportFilter,
+                                export_format: str) -> Iterator[str]:
+        rows = self.export_service.get_receipts(export_filter=export_filter)
+        if export_format == "csv":
+            return write_csv(rows, ReceiptRow)
+        return write_ndjson(rows, ReceiptRow)
+
+    def execute_export_sales_lines(self, export_filter: ExportFilter,
+                                   export_format: str) -> Iterator[str]:
+        rows = self.export_service.get_sales_lines(export_filter=export_filter)
+        if export_format == "csv":
+            return write_csv(rows, SalesLineRow)
+        return write_ndjson(rows, SalesLineRow)
@@ -1,8 +1,19 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import List, Tuple
 
+from app.core.exceptions.receipt_exceptions import ReceiptClosedErrorMessage
+from app.core.exceptions.shift_exceptions import ShiftClosedErrorMessage
+from app.core.models.payment import Payment
+from app.core.models.receipt import Receipt
+from app.core.models.shift import Shift
+from app.core.services.campaign_service import CampaignService
+from app.core.services.db_executor import DatabaseExecutor
 from app.core.services.payment_service import PaymentService
+from app.core.services.rate_cache import RateCacheStats
 from app.core.services.receipt_service import ReceiptService
+from app.core.services.report_service import ReportService
 from app.core.services.shift_service import ShiftService
+from app.core.state.shift_state import ClosedShiftState
 
 
 @dataclass
@@ -10,27 +21,59 @@ class PaymentInteractor:
     payment_service: PaymentService
     receipt_service: ReceiptService
     shift_service: ShiftService
+    report_service: ReportService
+    campaign_service: CampaignService
+    db_executor: DatabaseExecutor = field(default_factory=DatabaseExecutor)
 
     async def execute_pay(self,
                           receipt_id: str,
                           to_currency: str) -> float:
-        receipt = self.receipt_service.get_one_receipt(
+        # Repository calls block, so they run on the database executor while
+        # the event loop keeps serving payments that are waiting on FX rates
+        receipt, shift, amount = await self.db_executor.run(
+            self._get_payable, receipt_id=receipt_id)
+        payment = await self.payment_service.pay(
+            receipt=receipt,
+            to_currency=to_currency,
+            amount=amount)
+        await self.db_executor.run(self._settle, receipt=receipt,
+                                   shift=shift, payment=payment)
+        return payment.converted_amount
+
+    def _get_payable(self,
+                     receipt_id: str) -> Tuple[Receipt, Shift, float]:
+        # Cost depends on the receipt only, never on the size of its shift
+        receipt = self.receipt_service.get_open_receipt(
             receipt_id=receipt_id)
-        amount = receipt.get_price()
-        if receipt.get_discounted_price() is not None:
-            amount = receipt.get_discounted_price()
+        shift = self.shift_service.get_one_shift(shift_id=receipt.shift_id,
+                                                 include_receipts=False)
+        if isinstance(shift.state, ClosedShiftState):
+            raise ShiftClosedErrorMessage(shift_id=shift.id)
+
+        amount = self.campaign_service.get_payable_amount(receipt=receipt)
+        return receipt, shift, amount
+
+    def _settle(self, receipt: Receipt, shift: Shift,
+                payment: Payment) -> None:
+        def record() -> None:
+            self.shift_service.attach_receipt(shift=shift, receipt=receipt)
+            self.report_service.record_payment(receipt=receipt,
+                                               payment=payment)
 
-        if to_currency == "GEL":
-            converted_amount = amount
-        else:
-            converted_amount = await self.payment_service.pay(
-                from_currency="GEL",
-                to_currency= to_currency,
-                amount=amount)
-        self.receipt_service.update_status(receipt=receipt, status=False)
-        shift = self.shift_service.get_one_shift(shift_id=receipt.shift_id)
-        self.shift_service.add_receipt(receipt=receipt, shift=shift)
-        return converted_amount
+        if self.payment_service.settle(receipt=receipt, payment=payment,
+                                       on_settled=record):
+            return
 
+        # FX is awaited between the checks and the settle, so either may
+        # have changed since _get_payable
+        shift = self.shift_service.get_one_shift(shift_id=shift.id,
+                                                 include_receipts=False)
+        if isinstance(shift.state, ClosedShiftState):
+            raise ShiftClosedErrorMessage(shift_id=shift.id)
+        raise ReceiptClosedErrorMessage(receipt_id=receipt.id)
 
+    def execute_get_rate_cache_stats(self) -> RateCacheStats:
+        return self.payment_service.get_rate_cache_stats()
 
+    async def execute_refresh_rates(self) -> List[str]:
+        return await self.payment_service.refresh_rates()
@@ -1,7 +1,9 @@
 from dataclasses import dataclass
-from typing import List
+from typing import Optional
 
 from app.core.models import NO_ID
+from app.core.models.catalog import CatalogChanges
+from app.core.models.page import Page, ProductQuery
 from app.core.models.product import Product, ProductDecorator
 from app.core.services.campaign_service import CampaignService
 from app.core.services.product_service import ProductService
@@ -37,5 +39,13 @@ class ProductInteractor:
             product=product)
         return product_decorator
 
-    def execute_get_all(self) -> List[Product]:
-        return self.product_service.get_all_products()
\ No newline at end of file
+    def execute_get_catalog_version(self) -> int:
+        return self.product_service.get_catalog_version()
+
+    def execute_get_changes(self, since: int) -> CatalogChanges:
+        return self.product_service.get_catalog_changes(since=since)
+
+    def execute_get_page(self, query: ProductQuery, cursor: Optional[str],
+                         limit: int) -> Page[Product]:
+        return self.product_service.get_products_page(
+            query=query, cursor=cursor, limit=limit)
\ No newline at end of file
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from datetime import datetime
 from typing import cast
 
 from app.core.exceptions.shift_exceptions import ShiftClosedErrorMessage
@@ -21,8 +22,10 @@ class ReceiptInteractor:
     campaign_service: CampaignService
 
     def execute_create(self, shift_id: str) -> Receipt:
-        receipt = Receipt(id=NO_ID, shift_id=shift_id, items=[], total=0.0)
-        shift = self.shift_service.get_one_shift(shift_id=receipt.shift_id)
+        receipt = Receipt(id=NO_ID, shift_id=shift_id, items=[], total=0.0,
+                          opened_at=datetime.now())
+        shift = self.shift_service.get_one_shift(shift_id=receipt.shift_id,
+                                                 include_receipts=False)
         if isinstance(shift.state, ClosedShiftState):
             raise ShiftClosedErrorMessage(shift_id=shift.id)
 
@@ -0,0 +1,77 @@
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+from app.core.models.report import ReportTotals
+from app.core.repositories.report_repository import IReportEngine
+from app.core.schemas.report_schema import (
+    ReportResponse,
+    SalesAnalyticsResponse,
+    SalesReportResponse,
+    TopProductsResponse,
+)
+from app.core.services.payment_service import PaymentService
+from app.core.services.product_service import ProductService
+from app.core.services.report_service import LIFETIME_SCOPE, ReportService
+from app.core.services.shift_service import ShiftService
+
+
+@dataclass
+class ReportInteractor:
+    report_service: ReportService
+    report_engine: IReportEngine
+    shift_service: ShiftService
+    payment_service: PaymentService
+    product_service: ProductService
+
+    def execute_xreport(self) -> ReportResponse:
+        return self.report_service.get_xreport()
+
+    def execute_zreport(self, shift_id: str) -> ReportResponse:
+        return self.execute_zreports(shift_ids=[shift_id])[shift_id]
+
+    def execute_zreports(self,
+                         shift_ids: List[str]) -> Dict[str, ReportResponse]:
+        reports = self.shift_service.get_zreports(shift_ids=shift_ids)
+        # Shifts closed before snapshots existed are computed on demand
+        for shift_id in shift_ids:
+            if shift_id not in reports:
+                reports[shift_id] = self.report_engine.make_zreport(
+                    shift_id=shift_id)
+
+        return reports
+
+    def execute_sales_report(self, day: Optional[date]) -> SalesReportResponse:
+        return self.report_service.get_sales_report(day=day)
+
+    def execute_sales_analytics(self, granularity: str, start: datetime,
+                                end: datetime) -> SalesAnalyticsResponse:
+        return self.report_service.get_sales_analytics(
+            granularity=granularity, start=start, end=end)
+
+    def execute_top_products(self, shift_id: Optional[str], by: str,
+                             limit: int) -> TopProductsResponse:
+        if shift_id is not None:
+            # Raises for an unknown shift instead of ranking an empty one
+            self.shift_service.get_one_shift(shift_id=shift_id,
+                                             include_receipts=False)
+        return self.report_service.get_top_products(
+            shift_id=shift_id, by=by, limit=limit,
+            get_unsold=self.product_service.get_unsold_ids)
+
+    def execute_rebuild(self,
+                        totals: Optional[Dict[str, ReportTotals]] = None
+                        ) -> int:
+        # Totals aggregated elsewhere, e.g. across a process pool, are
+        # stored as they are
+        if totals is None:
+            receipts = []
+            for shift in self.shift_service.get_all_shifts():
+                receipts += shift.receipts
+            payments = self.payment_service.get_payments(
+                receipt_ids=[receipt.id for receipt in receipts])
+            totals = self.report_service.aggregate(receipts=receipts,
+                                                   payments=payments)
+
+        self.report_service.rebuild(totals=totals)
+        return totals.get(LIFETIME_SCOPE, ReportTotals()).number_of_receipts
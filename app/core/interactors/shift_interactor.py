@@ -1,16 +1,20 @@
 from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
 
 from app.core.models import NO_ID
 from app.core.models.shift import Shift
+from app.core.repositories.report_repository import IReportEngine
 from app.core.services.shift_service import ShiftService
 
 
 @dataclass
 class ShiftInteractor:
     shift_service: ShiftService
+    report_engine: IReportEngine
 
     def execute_create(self) -> Shift:
-        shift = Shift(id=NO_ID, receipts=[])
+        shift = Shift(id=NO_ID, receipts=[], opened_at=datetime.now())
         return self.shift_service.create_shift(shift=shift)
 
     def execute_get_one(self, shift_id: str) -> Shift:
@@ -18,5 +22,10 @@ class ShiftInteractor:
 
     def execute_change_status(self, shift_id: str, status: bool) -> None:
         shift = self.shift_service.get_one_shift(shift_id=shift_id)
-        self.shift_service.update_status(shift=shift, status=status)
-
+        # The Z snapshot is built from the shift's receipts as it closes,
+        # so it covers receipts paid before running totals existed too
+        make_report = (None if status else
+                       partial(self.report_engine.make_zreport,
+                               shift_id=shift.id))
+        self.shift_service.update_status(shift=shift, status=status,
+                                         make_report=make_report)
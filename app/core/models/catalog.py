@@ -0,0 +1,35 @@
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import List
+
+from app.core.models.product import Product
+
+
+class ChangeKind(str, Enum):
+    PRODUCT = "product"
+    CAMPAIGN = "campaign"
+    CAMPAIGN_PRODUCT = "campaign_product"
+
+
+class ChangeAction(str, Enum):
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+
+
+@dataclass
+class CatalogChange:
+    kind: ChangeKind
+    entity_id: str
+    action: ChangeAction
+    # Product id of a campaign membership change
+    related_id: str = ""
+    version: int = 0
+
+
+@dataclass
+class CatalogChanges:
+    since: int
+    version: int
+    changes: List[CatalogChange] = field(default_factory=list)
+    products: List[Product] = field(default_factory=list)
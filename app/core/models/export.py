@@ -0,0 +1,59 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, overload
+
+
+@overload
+def to_local_naive(moment: datetime) -> datetime:
+    ...
+
+
+@overload
+def to_local_naive(moment: Optional[datetime]) -> Optional[datetime]:
+    ...
+
+
+def to_local_naive(moment: Optional[datetime]) -> Optional[datetime]:
+    # Payments are stamped in naive local time, so aware bounds are converted
+    # to it before any backend compares them
+    if moment is None or moment.tzinfo is None:
+        return moment
+    return moment.astimezone().replace(tzinfo=None)
+
+
+@dataclass
+class ExportFilter:
+    shift_id: Optional[str] = None
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+
+    def __post_init__(self) -> None:
+        self.start = to_local_naive(self.start)
+        self.end = to_local_naive(self.end)
+
+
+@dataclass
+class ReceiptRow:
+    id: str
+    shift_id: str
+    total: float
+    discount_total: Optional[float]
+    currency: Optional[str]
+    rate: Optional[float]
+    converted_amount: Optional[float]
+    paid_at: Optional[datetime]
+
+
+@dataclass
+class SalesLineRow:
+    receipt_id: str
+    shift_id: str
+    item_id: str
+    item_type: str
+    quantity: int
+    price: float
+    total: float
+    discount_price: Optional[float]
+    discount_total: Optional[float]
+    currency: Optional[str]
+    paid_at: Optional[datetime]
@@ -12,3 +12,17 @@ class ICalculatePrice(Protocol):
         pass
 
 
+class SoldItem(Protocol):
+    # Every receipt line stores these; ICalculatePrice does not declare them
+    id: str
+    quantity: int
+    price: float
+    total: float
+    discount_price: Optional[float]
+    discount_total: Optional[float]
+
+    def get_price(self) -> float:
+        pass
+
+    def get_discounted_price(self) -> Optional[float]:
+        pass
@@ -0,0 +1,71 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from typing import Callable, Generic, List, Literal, Optional, TypeVar
+
+from app.core.exceptions.page_exceptions import InvalidCursorError
+from app.core.models.campaign import CampaignType
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+ProductOrder = Literal["id", "name"]
+
+T = TypeVar("T")
+
+
+@dataclass
+class ProductQuery:
+    order_by: ProductOrder = "id"
+    name_prefix: Optional[str] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+
+
+@dataclass
+class CampaignQuery:
+    campaign_type: Optional[CampaignType] = None
+
+
+@dataclass
+class Page(Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+def make_page(items: List[T], limit: int,
+              key: Callable[[T], List[str]]) -> Page[T]:
+    # Repositories return one row more than asked for to tell whether
+    # another page follows
+    if len(items) <= limit:
+        return Page(items=items)
+
+    items = items[:limit]
+    return Page(items=items, next_cursor=encode_cursor(key(items[-1])))
+
+
+def encode_cursor(values: List[str]) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: Optional[str], size: int) -> Optional[List[str]]:
+    if cursor is None:
+        return None
+
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise InvalidCursorError(cursor=cursor)
+    if (not isinstance(values, list) or len(values) != size
+            or not all(isinstance(value, str) for value in values)):
+        raise InvalidCursorError(cursor=cursor)
+
+    return values
+
+
+def prefix_upper_bound(prefix: str) -> str:
+    # Every string starting with prefix sorts below this one, so a prefix
+    # filter becomes an index range in both backends
+    return prefix + chr(0x10FFFF)
@@ -0,0 +1,13 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+
+
+@dataclass
+class Payment:
+    receipt_id: str
+    shift_id: str
+    currency: str
+    rate: float
+    amount: float
+    converted_amount: float
+    paid_at: datetime = field(default_factory=datetime.now)
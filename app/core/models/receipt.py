@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from datetime import datetime
 from typing import List, Optional
 
 from app.core.models.models import ICalculatePrice
@@ -75,6 +76,8 @@ class Receipt(ICalculatePrice):
     total: float
     discount_total: Optional[float] = None
     status: bool = True
+    opened_at: Optional[datetime] = None
+    paid_at: Optional[datetime] = None
 
     def get_price(self) -> float:
         return sum(item.get_price() for item in self.items)
@@ -1,20 +1,71 @@
 from abc import abstractmethod
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from typing import Dict, List, cast
 
 from app.core.exceptions.shift_exceptions import ShiftOpenedErrorMessage
+from app.core.models.models import SoldItem
+from app.core.models.payment import Payment
 from app.core.models.product import NumProduct
 from app.core.models.receipt import Receipt
 from app.core.schemas.report_schema import ReportResponse
+from app.core.services.payment_service import BASE_CURRENCY, PaymentService
 from app.core.services.shift_service import ShiftService
 from app.core.state.shift_state import OpenShiftState
 
 
+@dataclass
+class ReportTotals:
+    number_of_receipts: int = 0
+    revenue: Dict[str, float] = field(default_factory=dict)
+    sold_count: Dict[str, int] = field(default_factory=dict)
+    sold_amount: Dict[str, float] = field(default_factory=dict)
+
+    def add_receipt(self, receipt: Receipt,
+                    currency: str,
+                    amount: float) -> 'ReportTotals':
+        self.number_of_receipts += 1
+        self.revenue[currency] = self.revenue.get(currency, 0.0) + amount
+        for item in cast(List[SoldItem], receipt.items):
+            self.sold_count[item.id] = (self.sold_count.get(item.id, 0) +
+                                        item.quantity)
+            self.sold_amount[item.id] = (
+                self.sold_amount.get(item.id, 0.0) +
+                (item.get_discounted_price() or item.get_price()))
+        return self
+
+    def merge(self, other: 'ReportTotals') -> 'ReportTotals':
+        self.number_of_receipts += other.number_of_receipts
+        for currency, amount in other.revenue.items():
+            self.revenue[currency] = self.revenue.get(currency, 0.0) + amount
+        for item_id, quantity in other.sold_count.items():
+            self.sold_count[item_id] = self.sold_count.get(item_id, 0) + quantity
+        for item_id, amount in other.sold_amount.items():
+            self.sold_amount[item_id] = (self.sold_amount.get(item_id, 0.0) +
+                                         amount)
+        return self
+
+    def get_revenue(self) -> Dict[str, float]:
+        revenue = {BASE_CURRENCY: 0.0}
+        revenue.update(self.revenue)
+        return revenue
+
+    def to_response(self) -> ReportResponse:
+        return ReportResponse(
+            number_of_receipts=self.number_of_receipts,
+            revenue=self.get_revenue(),
+            sold_product_count=[
+                NumProduct(product_id=item_id, num=quantity)
+                for item_id, quantity in self.sold_count.items()])
+
+
 @dataclass
 class Report:
-    def make_report(self, shift_service: ShiftService) -> ReportResponse:
+    def make_report(self, shift_service: ShiftService,
+                    payment_service: PaymentService) -> ReportResponse:
         receipts = self.get_shift_data(shift_service)
-        revenue = self._get_revenue(receipts)
+        payments = payment_service.get_payments(
+            receipt_ids=[receipt.id for receipt in receipts])
+        revenue = self._get_revenue(receipts, payments)
         sold_count = self._get_sold_count(receipts)
 
         response = ReportResponse(
@@ -24,32 +75,33 @@ class Report:
         return response
 
 
-    def _get_revenue(self, receipts: List[Receipt]) -> dict[str, float]:
-        result = {}
-        revenue = float(sum(
-            receipt.get_discounted_price() or receipt.get_price() for
-            receipt in
-            receipts))
+    def _get_revenue(self, receipts: List[Receipt],
+                     payments: Dict[str, Payment]) -> dict[str, float]:
+        result = {BASE_CURRENCY: 0.0}
+        for receipt in receipts:
+            payment = payments.get(receipt.id)
+            # Receipts paid before payments were recorded count as GEL
+            if payment is None:
+                amount = receipt.get_discounted_price() or receipt.get_price()
+                result[BASE_CURRENCY] += amount
+            else:
+                result[payment.currency] = (result.get(payment.currency, 0.0) +
+                                            payment.converted_amount)
 
-        result["GEL"] = revenue
         return result
 
     def _get_sold_count(self, receipts: List[Receipt]) -> List[NumProduct]:
-        ret_list: List[NumProduct] = []
+        sold_count: Dict[str, NumProduct] = {}
         for receipt in receipts:
-            for item in receipt.items:
-                existing_product = next((p for p in ret_list
-                                         if p.product_id == item.id),
-                                         None)
-
+            for item in cast(List[SoldItem], receipt.items):
+                existing_product = sold_count.get(item.id)
                 if existing_product:
                     existing_product.num += item.quantity
                 else:
-                    product = NumProduct(product_id=item.id,
-                                         num=item.quantity)
-                    ret_list.append(product)
+                    sold_count[item.id] = NumProduct(product_id=item.id,
+                                                     num=item.quantity)
 
-        return ret_list
+        return list(sold_count.values())
 
     @abstractmethod
     def get_shift_data(self, shift_service: ShiftService) -> List[Receipt]:
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from datetime import datetime
 from typing import List, Optional
 
 from app.core.models.models import ICalculatePrice
@@ -11,6 +12,8 @@ class Shift(ICalculatePrice):
     id: str
     receipts: List[Receipt]
     state: ShiftState = OpenShiftState()
+    opened_at: Optional[datetime] = None
+    closed_at: Optional[datetime] = None
 
     def get_price(self) -> float:
         return sum(
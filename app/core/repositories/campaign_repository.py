@@ -3,6 +3,7 @@ from typing import List, Optional, Protocol
 
 from app.core.models.campaign import (
     BuyNGetNCampaign,
+    Campaign,
     ComboCampaign,
     DiscountCampaign,
     ReceiptCampaign,
@@ -10,6 +11,13 @@ from app.core.models.campaign import (
 from app.core.models.receipt import ProductForReceipt
 
 
+@dataclass
+class ICampaignPageRepository(Protocol):
+    def get_page(self, after_id: Optional[str],
+                 limit: int) -> List[Campaign]:
+        pass
+
+
 @dataclass
 class IProductDiscountCampaignRepository(Protocol):
     def create(self,
@@ -19,6 +27,10 @@ class IProductDiscountCampaignRepository(Protocol):
     def get_all(self) -> List[DiscountCampaign]:
         pass
 
+    def get_page(self, after_id: Optional[str],
+                 limit: int) -> List[Campaign]:
+        pass
+
     def get_one_campaign(self,
                 campaign_id: str) -> Optional[DiscountCampaign]:
         pass
@@ -48,6 +60,10 @@ class IComboCampaignRepository(Protocol):
     def get_all(self) -> List[ComboCampaign]:
         pass
 
+    def get_page(self, after_id: Optional[str],
+                 limit: int) -> List[Campaign]:
+        pass
+
     def get_one_campaign(self, campaign_id: str) -> Optional[ComboCampaign]:
         pass
 
@@ -68,6 +84,10 @@ class IBuyNGetNCampaignRepository(Protocol):
     def get_all(self) -> List[BuyNGetNCampaign]:
         pass
 
+    def get_page(self, after_id: Optional[str],
+                 limit: int) -> List[Campaign]:
+        pass
+
     def get_one_campaign(self, campaign_id: str) -> Optional[BuyNGetNCampaign]:
         pass
 
@@ -84,6 +104,10 @@ class IReceiptDiscountCampaignRepository(Protocol):
     def get_all(self) -> List[ReceiptCampaign]:
         pass
 
+    def get_page(self, after_id: Optional[str],
+                 limit: int) -> List[Campaign]:
+        pass
+
     def get_one_campaign(self, campaign_id: str) -> Optional[ReceiptCampaign]:
         pass
 
@@ -0,0 +1,16 @@
+from dataclasses import dataclass
+from typing import List, Protocol
+
+from app.core.models.catalog import CatalogChange
+
+
+@dataclass
+class ICatalogVersionRepository(Protocol):
+    def get_version(self) -> int:
+        pass
+
+    def record_change(self, change: CatalogChange) -> int:
+        pass
+
+    def get_changes(self, since: int, until: int) -> List[CatalogChange]:
+        pass
@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+from typing import Iterator, Protocol
+
+from app.core.models.export import ExportFilter, ReceiptRow, SalesLineRow
+
+
+@dataclass
+class IExportRepository(Protocol):
+    def iter_receipts(self, export_filter: ExportFilter) -> Iterator[ReceiptRow]:
+        pass
+
+    def iter_sales_lines(self,
+                         export_filter: ExportFilter) -> Iterator[SalesLineRow]:
+        pass
@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Protocol
+
+from app.core.models.payment import Payment
+
+
+@dataclass
+class IPaymentRepository(Protocol):
+    def settle(self, payment: Payment,
+               on_settled: Callable[[], None]) -> bool:
+        pass
+
+    def get_by_receipts(self, receipt_ids: List[str]) -> Dict[str, Payment]:
+        pass
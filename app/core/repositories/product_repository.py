@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from typing import List, Optional, Protocol
 
+from app.core.models.page import ProductQuery
 from app.core.models.product import Product
 
 
@@ -15,6 +16,16 @@ class IProductRepository(Protocol):
     def get_all(self) -> List[Product]:
         pass
 
+    def get_many(self, product_ids: List[str]) -> List[Product]:
+        pass
+
+    def get_page(self, query: ProductQuery, after: Optional[List[str]],
+                 limit: int) -> List[Product]:
+        pass
+
+    def get_ids(self, after: Optional[str], limit: int) -> List[str]:
+        pass
+
     def update(self, product_id: str, price: float) -> None:
         pass
 
@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+from typing import Protocol
+
+
+@dataclass
+class IRateProvider(Protocol):
+    async def get_rate(self, from_currency: str, to_currency: str) -> float:
+        pass
+
+    async def open(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from datetime import datetime
 from typing import List, Optional, Protocol
 
 from app.core.models.receipt import Receipt
@@ -18,7 +19,8 @@ class IReceiptRepository(Protocol):
     def delete(self, receipt_id: str) -> None:
         pass
 
-    def update(self, receipt_id: str, status: bool) -> None:
+    def update(self, receipt_id: str, status: bool,
+               paid_at: Optional[datetime] = None) -> None:
         pass
 
     def add_product(self, receipt: Receipt) -> Receipt:
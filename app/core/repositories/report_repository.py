@@ -0,0 +1,33 @@
+from dataclasses import dataclass
+from typing import Dict, List, Protocol
+
+from app.core.models.report import ReportTotals
+from app.core.schemas.report_schema import ReportResponse
+
+
+@dataclass
+class IReportRepository(Protocol):
+    def add(self, scopes: List[str], totals: ReportTotals) -> None:
+        pass
+
+    def get(self, scope: str, include_items: bool = True) -> ReportTotals:
+        pass
+
+    def replace(self, totals: Dict[str, ReportTotals]) -> None:
+        pass
+
+    def get_range(self, start_scope: str,
+                  end_scope: str) -> Dict[str, ReportTotals]:
+        pass
+
+    def get_scopes(self) -> List[str]:
+        pass
+
+
+@dataclass
+class IReportEngine(Protocol):
+    def make_xreport(self) -> ReportResponse:
+        pass
+
+    def make_zreport(self, shift_id: str) -> ReportResponse:
+        pass
@@ -1,7 +1,10 @@
 from dataclasses import dataclass
-from typing import List, Optional, Protocol
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Protocol
 
+from app.core.models.receipt import Receipt
 from app.core.models.shift import Shift
+from app.core.schemas.report_schema import ReportResponse
 
 
 @dataclass
@@ -9,7 +12,8 @@ class IShiftRepository(Protocol):
     def create(self, shift: Shift) -> Shift:
         pass
 
-    def get_one(self, shift_id: str) -> Optional[Shift]:
+    def get_one(self, shift_id: str,
+                include_receipts: bool = True) -> Optional[Shift]:
         pass
 
     def get_all(self) -> List[Shift]:
@@ -18,8 +22,17 @@ class IShiftRepository(Protocol):
     def delete(self, shift_id: str) -> None:
         pass
 
-    def update(self, shift_id: str, status: bool) -> None:
+    def update(self, shift_id: str, status: bool,
+               make_report: Optional[Callable[[], ReportResponse]] = None,
+               closed_at: Optional[datetime] = None) -> None:
         pass
 
     def add_receipt(self, shift: Shift) -> Shift:
+        pass
+
+    def attach_receipt(self, shift_id: str, receipt: Receipt) -> None:
+        pass
+
+    def get_reports(self,
+                    shift_ids: List[str]) -> Dict[str, ReportResponse]:
         pass
\ No newline at end of file
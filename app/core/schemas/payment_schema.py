@@ -4,3 +4,12 @@ from pydantic import BaseModel
 class PaymentRequest(BaseModel):
     to_currency: str
     amount: float
+
+
+class RateCacheStatsResponse(BaseModel):
+    hits: int
+    stale_hits: int
+    misses: int
+    coalesced: int
+    refresh_failures: int
+    hit_ratio: float
@@ -2,6 +2,7 @@ from typing import List, Optional
 
 from pydantic import BaseModel
 
+from app.core.models.catalog import ChangeAction
 from app.core.models.product import Product
 
 
@@ -18,6 +19,29 @@ class CreateProductResponse(BaseModel):
 
 class GetAllProductResponse(BaseModel):
     products: List[Product]
+    next_cursor: Optional[str] = None
+
+
+class CampaignChangeResponse(BaseModel):
+    campaign_id: str
+    action: ChangeAction
+
+
+class CampaignProductChangeResponse(BaseModel):
+    campaign_id: str
+    product_id: str
+    action: ChangeAction
+
+
+class CatalogChangesResponse(BaseModel):
+    since: int
+    # Pass back as `since` on the next request
+    version: int
+    created: List[Product]
+    updated: List[Product]
+    deleted: List[str]
+    campaigns: List[CampaignChangeResponse]
+    campaign_products: List[CampaignProductChangeResponse]
 
 
 class GetOneProductResponse(BaseModel):
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import List, Optional
 
 from pydantic import BaseModel
@@ -50,6 +51,8 @@ class GetOneReceiptResponse(BaseModel):
     items: List[ReceiptItem]
     total: float
     discounted_total: Optional[float] = None
+    opened_at: Optional[datetime] = None
+    paid_at: Optional[datetime] = None
 
 
 
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
-from typing import List
+from datetime import date
+from typing import Dict, List, Optional
 
 from app.core.models.product import NumProduct
 
@@ -9,3 +10,44 @@ class ReportResponse:
     number_of_receipts: int
     revenue: dict[str, float]
     sold_product_count: List[NumProduct]
+
+
+@dataclass
+class ZReportsResponse:
+    reports: Dict[str, ReportResponse]
+
+
+@dataclass
+class SalesReportResponse:
+    number_of_receipts: int
+    revenue: Dict[str, float]
+    day: Optional[date] = None
+
+
+@dataclass
+class ProductSales:
+    product_id: str
+    quantity: int
+    amount: float
+
+
+@dataclass
+class TopProductsResponse:
+    by: str
+    shift_id: Optional[str]
+    top: List[ProductSales]
+    bottom: List[ProductSales]
+
+
+@dataclass
+class SalesBucket:
+    bucket: str
+    number_of_receipts: int
+    revenue: Dict[str, float]
+    products: List[ProductSales]
+
+
+@dataclass
+class SalesAnalyticsResponse:
+    granularity: str
+    buckets: List[SalesBucket]
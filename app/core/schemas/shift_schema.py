@@ -1,4 +1,5 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -16,6 +17,8 @@ class GetOneShiftResponse(BaseModel):
     receipts: List[Receipt]
     state: str
     total: float
+    opened_at: Optional[datetime] = None
+    closed_at: Optional[datetime] = None
 
 
 class UpdateShiftStateRequest(BaseModel):
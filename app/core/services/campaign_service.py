@@ -1,22 +1,41 @@
-from dataclasses import dataclass, field
-from typing import List, Protocol
+import heapq
+from dataclasses import dataclass, field, replace
+from itertools import islice
+from typing import Dict, Optional, Protocol
 
 from app.core.exceptions.campaign_exceptions import GetCampaignErrorMessage
 from app.core.models.campaign import (
     BuyNGetNCampaign,
     Campaign,
+    CampaignType,
     ComboCampaign,
     DiscountCampaign,
     ReceiptCampaign,
 )
+from app.core.models.catalog import (
+    CatalogChange,
+    ChangeAction,
+    ChangeKind,
+)
+from app.core.models.page import (
+    MAX_PAGE_SIZE,
+    CampaignQuery,
+    Page,
+    decode_cursor,
+    make_page,
+)
 from app.core.models.product import DiscountedProduct, Product, ProductDecorator
 from app.core.models.receipt import ProductForReceipt, Receipt
 from app.core.repositories.campaign_repository import (
     IBuyNGetNCampaignRepository,
+    ICampaignPageRepository,
     IComboCampaignRepository,
     IProductDiscountCampaignRepository,
     IReceiptDiscountCampaignRepository,
 )
+from app.core.repositories.catalog_repository import (
+    ICatalogVersionRepository,
+)
 
 
 @dataclass
@@ -149,6 +168,7 @@ class CampaignService:
     receipt_discount_repo: IReceiptDiscountCampaignRepository
     combo_campaign_repo: IComboCampaignRepository
     buy_get_gift_repo: IBuyNGetNCampaignRepository
+    catalog_version_repository: ICatalogVersionRepository
 
     def _build_chain(self) -> ICampaignChain:
         return BuyNGetNCampaignChain(
@@ -177,44 +197,86 @@ class CampaignService:
         campaign = self.receipt_discount_repo.get_discount_on_amount(
             amount=total)
         if campaign is not None:
-            total -= campaign.discount
-            receipt.discount_total = total
+            # Priced on a copy; the stored receipt must not keep the discount
+            return replace(receipt, discount_total=total - campaign.discount)
 
         return receipt
 
+    def get_payable_amount(self, receipt: Receipt) -> float:
+        # Priced from the items, with the receipt campaign applied once
+        amount = receipt.get_price()
+        discounted = receipt.get_discounted_price()
+        if discounted is not None:
+            amount = discounted
+
+        campaign = self.receipt_discount_repo.get_discount_on_amount(
+            amount=amount)
+        if campaign is not None:
+            amount -= campaign.discount
+
+        return amount
+
     def get_one_campaign(self, campaign_id: str) -> Campaign:
         start_chain = self._build_chain()
         return start_chain.get_campaign(campaign_id=campaign_id)
 
-    def get_all_campaigns(self) -> List[Campaign]:
-        return (self.product_discount_repo.get_all() +
-                self.receipt_discount_repo.get_all() +
-                self.combo_campaign_repo.get_all() +
-                self.buy_get_gift_repo.get_all())
+    def get_campaigns_page(self, query: CampaignQuery, cursor: Optional[str],
+                           limit: int) -> Page[Campaign]:
+        limit = min(limit, MAX_PAGE_SIZE)
+        after = decode_cursor(cursor, size=1)
+        after_id = after[0] if after else None
+        repositories: Dict[CampaignType, ICampaignPageRepository] = {
+            CampaignType.DISCOUNT: self.product_discount_repo,
+            CampaignType.RECEIPT_DISCOUNT: self.receipt_discount_repo,
+            CampaignType.COMBO: self.combo_campaign_repo,
+            CampaignType.BUY_N_GET_N: self.buy_get_gift_repo,
+        }
+        # Each table yields at most one page in id order; merging them keeps
+        # the cost per request independent of how many campaigns exist
+        pages = [repository.get_page(after_id=after_id, limit=limit + 1)
+                 for campaign_type, repository in repositories.items()
+                 if query.campaign_type in (None, campaign_type)]
+        campaigns = list(islice(
+            heapq.merge(*pages, key=lambda campaign: campaign.id), limit + 1))
+        return make_page(campaigns, limit, key=lambda campaign: [campaign.id])
 
     def delete_campaign(self, campaign_id: str) -> None:
         start_chain = self._build_chain()
-        return start_chain.delete_campaign(campaign_id=campaign_id)
+        start_chain.delete_campaign(campaign_id=campaign_id)
+        self._catalog_changed(ChangeKind.CAMPAIGN, campaign_id,
+                              ChangeAction.DELETED)
 
     def create_discount(self,
                 discount_campaign: DiscountCampaign) -> DiscountCampaign:
-        return self.product_discount_repo.create(
+        discount_campaign = self.product_discount_repo.create(
             discount_campaign=discount_campaign)
+        self._catalog_changed(ChangeKind.CAMPAIGN, discount_campaign.id,
+                              ChangeAction.CREATED)
+        return discount_campaign
 
     def create_combo(self,
             combo_campaign: ComboCampaign) -> ComboCampaign:
-        return self.combo_campaign_repo.create(
+        combo_campaign = self.combo_campaign_repo.create(
             combo_campaign=combo_campaign)
+        self._catalog_changed(ChangeKind.CAMPAIGN, combo_campaign.id,
+                              ChangeAction.CREATED)
+        return combo_campaign
 
     def create_receipt_discount(self,
             receipt_campaign: ReceiptCampaign) -> ReceiptCampaign:
-        return self.receipt_discount_repo.create(
+        receipt_campaign = self.receipt_discount_repo.create(
             receipt_campaign=receipt_campaign)
+        self._catalog_changed(ChangeKind.CAMPAIGN, receipt_campaign.id,
+                              ChangeAction.CREATED)
+        return receipt_campaign
 
     def create_buy_n_get_n(self,
             buy_n_get_n_campaign: BuyNGetNCampaign) -> BuyNGetNCampaign:
-        return self.buy_get_gift_repo.create(
+        buy_n_get_n_campaign = self.buy_get_gift_repo.create(
             buy_n_get_n_campaign=buy_n_get_n_campaign)
+        self._catalog_changed(ChangeKind.CAMPAIGN, buy_n_get_n_campaign.id,
+                              ChangeAction.CREATED)
+        return buy_n_get_n_campaign
 
     def add_product_in_combo(self,
                         product: Product,
@@ -225,15 +287,21 @@ class CampaignService:
             quantity=quantity,
             price=product.price)
         product_for_combo.total = product.price * quantity
-        return self.combo_campaign_repo.add_product(
+        combo = self.combo_campaign_repo.add_product(
             product=product_for_combo,
             campaign_id=campaign_id)
+        self._catalog_changed(ChangeKind.CAMPAIGN_PRODUCT, campaign_id,
+                              ChangeAction.CREATED, product_id=product.id)
+        return combo
 
     def add_product_in_discount(self, product_id: str,
                 campaign_id: str) -> DiscountCampaign:
-        return self.product_discount_repo.add_product(
+        discount = self.product_discount_repo.add_product(
             product_id=product_id,
             campaign_id=campaign_id)
+        self._catalog_changed(ChangeKind.CAMPAIGN_PRODUCT, campaign_id,
+                              ChangeAction.CREATED, product_id=product_id)
+        return discount
 
     def execute_delete_from_discount(self,
                     campaign_id: str,
@@ -241,3 +309,12 @@ class CampaignService:
         self.product_discount_repo.delete_product(
             product_id=product_id,
             campaign_id=campaign_id)
+        self._catalog_changed(ChangeKind.CAMPAIGN_PRODUCT, campaign_id,
+                              ChangeAction.DELETED, product_id=product_id)
+
+    def _catalog_changed(self, kind: ChangeKind, campaign_id: str,
+                         action: ChangeAction, product_id: str = "") -> None:
+        # Recorded after the write, so a version never names older data
+        self.catalog_version_repository.record_change(CatalogChange(
+            kind=kind, entity_id=campaign_id, action=action,
+            related_id=product_id))
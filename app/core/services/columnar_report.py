@@ -0,0 +1,124 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, cast
+
+from app.core.models.models import SoldItem
+from app.core.models.payment import Payment
+from app.core.models.receipt import Receipt
+from app.core.models.report import ReportTotals, XReport, ZReport
+from app.core.repositories.report_repository import IReportEngine
+from app.core.schemas.report_schema import ReportResponse
+from app.core.services.payment_service import BASE_CURRENCY, PaymentService
+from app.core.services.report_service import ObjectReportEngine
+from app.core.services.shift_service import ShiftService
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:  # numpy is optional, reports fall back to objects
+    NUMPY_AVAILABLE = False
+
+
+def numpy_available() -> bool:
+    return NUMPY_AVAILABLE
+
+
+@dataclass
+class SalesColumns:
+    # Codes index product_ids/currencies, both kept in first-seen order
+    product_ids: List[str]
+    currencies: List[str]
+    item_codes: Any
+    quantities: Any
+    line_amounts: Any
+    receipt_currencies: Any
+    receipt_amounts: Any
+
+    @classmethod
+    def from_receipts(cls, receipts: List[Receipt],
+                      payments: Dict[str, Payment]) -> 'SalesColumns':
+        product_codes: Dict[str, int] = {}
+        currency_codes: Dict[str, int] = {BASE_CURRENCY: 0}
+        item_codes: List[int] = []
+        quantities: List[int] = []
+        line_amounts: List[float] = []
+        receipt_currencies: List[int] = []
+        receipt_amounts: List[float] = []
+        for receipt in receipts:
+            payment = payments.get(receipt.id)
+            # Receipts paid before payments were recorded count as GEL
+            if payment is None:
+                receipt_currencies.append(0)
+                receipt_amounts.append(receipt.get_discounted_price() or
+                                       receipt.get_price())
+            else:
+                receipt_currencies.append(currency_codes.setdefault(
+                    payment.currency, len(currency_codes)))
+                receipt_amounts.append(payment.converted_amount)
+            for item in cast(List[SoldItem], receipt.items):
+                item_codes.append(product_codes.setdefault(
+                    item.id, len(product_codes)))
+                quantities.append(item.quantity)
+                line_amounts.append(item.get_discounted_price() or
+                                    item.get_price())
+
+        return cls(
+            product_ids=list(product_codes),
+            currencies=list(currency_codes),
+            item_codes=np.asarray(item_codes, dtype=np.int64),
+            quantities=np.asarray(quantities, dtype=np.int64),
+            line_amounts=np.asarray(line_amounts, dtype=np.float64),
+            receipt_currencies=np.asarray(receipt_currencies, dtype=np.int64),
+            receipt_amounts=np.asarray(receipt_amounts, dtype=np.float64))
+
+    def to_totals(self) -> ReportTotals:
+        # bincount is float64 for integer counts too, exact below 2**53
+        sold_count = np.rint(_sum_by_code(
+            self.item_codes, self.quantities,
+            len(self.product_ids))).astype(np.int64)
+        sold_amount = _sum_by_code(self.item_codes, self.line_amounts,
+                                   len(self.product_ids))
+        revenue = _sum_by_code(self.receipt_currencies, self.receipt_amounts,
+                               len(self.currencies))
+        return ReportTotals(
+            number_of_receipts=len(self.receipt_amounts),
+            revenue=dict(zip(self.currencies, revenue.tolist())),
+            sold_count=dict(zip(self.product_ids, sold_count.tolist())),
+            sold_amount=dict(zip(self.product_ids, sold_amount.tolist())))
+
+
+def _sum_by_code(codes: Any, values: Any, size: int) -> Any:
+    # Adds values in input order from 0.0, the same float sums the object
+    # engine produces, fractional cents included
+    return np.bincount(codes, weights=values, minlength=size)
+
+
+@dataclass
+class ColumnarReportEngine(IReportEngine):
+    shift_service: ShiftService
+    payment_service: PaymentService
+
+    def make_xreport(self) -> ReportResponse:
+        receipts = XReport().get_shift_data(self.shift_service)
+        return self._make_report(receipts)
+
+    def make_zreport(self, shift_id: str) -> ReportResponse:
+        receipts = ZReport(shift_id=shift_id).get_shift_data(
+            self.shift_service)
+        return self._make_report(receipts)
+
+    def _make_report(self, receipts: List[Receipt]) -> ReportResponse:
+        payments = self.payment_service.get_payments(
+            receipt_ids=[receipt.id for receipt in receipts])
+        columns = SalesColumns.from_receipts(receipts=receipts,
+                                             payments=payments)
+        return columns.to_totals().to_response()
+
+
+def fallback_report_engine(shift_service: ShiftService,
+                           payment_service: PaymentService) -> IReportEngine:
+    # Used when the backend cannot aggregate reports itself
+    if numpy_available():
+        return ColumnarReportEngine(shift_service=shift_service,
+                                    payment_service=payment_service)
+    return ObjectReportEngine(shift_service=shift_service,
+                              payment_service=payment_service)
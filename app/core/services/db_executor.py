@@ -0,0 +1,39 @@
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class DatabaseExecutor:
+    # Keeps blocking repository calls of async routes off the event loop.
+    # Sync routes reach the same SQLite connection from the threadpool, so
+    # writes are serialized by the connection's transaction lock, not here
+    max_workers: int = 1
+    _executor: Optional[ThreadPoolExecutor] = field(init=False, default=None)
+
+    async def run(self, call: Callable[..., T], *args: Any,
+                  **kwargs: Any) -> T:
+        loop = asyncio.get_running_loop()
+        # run_in_executor does not carry context variables over by itself
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            self._get_executor(),
+            functools.partial(context.run, call, *args, **kwargs))
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Created on first use so each worker process gets its own threads
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="pos-db")
+        return self._executor
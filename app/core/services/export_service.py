@@ -0,0 +1,64 @@
+import csv
+import io
+import json
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Any, Iterable, Iterator, List, Type
+
+from app.core.models.export import ExportFilter, ReceiptRow, SalesLineRow
+from app.core.repositories.export_repository import IExportRepository
+
+# Rows are written in chunks so the response does not flush once per line
+EXPORT_CHUNK_ROWS = 500
+
+
+def _format_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def write_ndjson(rows: Iterable[Any], row_type: Type[Any]) -> Iterator[str]:
+    columns = [column.name for column in fields(row_type)]
+    chunk: List[str] = []
+    for row in rows:
+        record = {name: _format_value(getattr(row, name)) for name in columns}
+        chunk.append(json.dumps(record) + "\n")
+        if len(chunk) >= EXPORT_CHUNK_ROWS:
+            yield "".join(chunk)
+            chunk.clear()
+
+    if chunk:
+        yield "".join(chunk)
+
+
+def write_csv(rows: Iterable[Any], row_type: Type[Any]) -> Iterator[str]:
+    columns = [column.name for column in fields(row_type)]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    count = 0
+    for row in rows:
+        writer.writerow([_format_value(getattr(row, name)) for name in columns])
+        count += 1
+        if count >= EXPORT_CHUNK_ROWS:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            count = 0
+
+    yield buffer.getvalue()
+
+
+@dataclass
+class ExportService:
+    export_repository: IExportRepository
+
+    def get_receipts(self, export_filter: ExportFilter) -> Iterator[ReceiptRow]:
+        return self.export_repository.iter_receipts(
+            export_filter=export_filter)
+
+    def get_sales_lines(self,
+                        export_filter: ExportFilter) -> Iterator[SalesLineRow]:
+        return self.export_repository.iter_sales_lines(
+            export_filter=export_filter)
@@ -1,38 +1,75 @@
-from dataclasses import dataclass
-from typing import Any
+import asyncio
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
 
-import httpx
+from app.core.exceptions.payment_exceptions import (
+    ExchangeRateUnavailableError,
+)
+from app.core.models.payment import Payment
+from app.core.models.receipt import Receipt
+from app.core.repositories.payment_repository import IPaymentRepository
+from app.core.repositories.rate_provider import IRateProvider
+from app.core.services.rate_cache import RateCache, RateCacheStats
 
-BASE_URL = "https://economia.awesomeapi.com.br"
+BASE_CURRENCY = "GEL"
+SUPPORTED_CURRENCIES = ["USD", "EUR"]
 
 
 @dataclass
 class PaymentService:
-    _client = httpx.AsyncClient()
-
-
-    async def _calculate_exchange_rate(self,
-                                from_currency: str,
-                                to_currency: str) -> Any:
-        url = f"{BASE_URL}/json/last/{from_currency}-{to_currency}"
-        try:
-            response = await self._client.get(url)
-            response.raise_for_status()
-            data = response.json()
-            return data.get(f"{from_currency}{to_currency}",
-                            {"error": "Invalid currency"})
-        except httpx.HTTPStatusError:
-            return {"error": "API is down"}
-        except Exception:
-            return {"error": "Unexpected error"}
-
-
-    async def pay(self, from_currency: str, to_currency: str, amount: float) -> float:
-        rate_data = await self._calculate_exchange_rate(from_currency, to_currency)
-        if "error" in rate_data:
-            raise Exception(rate_data["error"])
-
-        rate = float(rate_data["ask"])
-        converted = round(amount * rate, 2)
-
-        return converted
\ No newline at end of file
+    payment_repository: IPaymentRepository
+    rate_provider: Optional[IRateProvider] = None
+    rate_cache: RateCache = field(default_factory=RateCache)
+
+    async def _get_rate(self, from_currency: str, to_currency: str) -> float:
+        if self.rate_provider is None:
+            raise ExchangeRateUnavailableError(from_currency=from_currency,
+                                               to_currency=to_currency)
+
+        return await self.rate_provider.get_rate(from_currency, to_currency)
+
+    async def pay(self, receipt: Receipt, to_currency: str,
+                  amount: float) -> Payment:
+        rate = 1.0
+        converted = amount
+        if to_currency != BASE_CURRENCY:
+            rate = await self.rate_cache.get(BASE_CURRENCY, to_currency,
+                                             self._get_rate)
+            converted = round(amount * rate, 2)
+
+        return Payment(receipt_id=receipt.id,
+                       shift_id=receipt.shift_id,
+                       currency=to_currency,
+                       rate=rate,
+                       amount=amount,
+                       converted_amount=converted)
+
+    async def refresh_rates(self) -> List[str]:
+        # Concurrent, so a refresh takes as long as the slowest pair rather
+        # than the sum of all of them
+        results = await asyncio.gather(
+            *(self.rate_cache.refresh(BASE_CURRENCY, currency, self._get_rate)
+              for currency in SUPPORTED_CURRENCIES),
+            return_exceptions=True)
+        return [currency
+                for currency, result in zip(SUPPORTED_CURRENCIES, results)
+                if isinstance(result, Exception)]
+
+    def get_rate_cache_stats(self) -> RateCacheStats:
+        return self.rate_cache.stats
+
+    def settle(self, receipt: Receipt, payment: Payment,
+               on_settled: Callable[[], None]) -> bool:
+        # Closing the receipt, storing its payment and on_settled are one
+        # transaction; nothing is written if the receipt was paid or its
+        # shift closed in the meantime
+        def settled() -> None:
+            receipt.status = False
+            receipt.paid_at = payment.paid_at
+            on_settled()
+
+        return self.payment_repository.settle(payment=payment,
+                                              on_settled=settled)
+
+    def get_payments(self, receipt_ids: List[str]) -> Dict[str, Payment]:
+        return self.payment_repository.get_by_receipts(receipt_ids=receipt_ids)
\ No newline at end of file
@@ -1,25 +1,75 @@
 from dataclasses import dataclass
-from typing import List
+from typing import Container, List, Optional
 
 from app.core.exceptions.products_exceptions import (
     GetProductError,
     ProductCreationError,
 )
+from app.core.models.catalog import (
+    CatalogChange,
+    CatalogChanges,
+    ChangeAction,
+    ChangeKind,
+)
+from app.core.models.page import (
+    MAX_PAGE_SIZE,
+    Page,
+    ProductQuery,
+    decode_cursor,
+    make_page,
+)
 from app.core.models.product import Product
+from app.core.repositories.catalog_repository import (
+    ICatalogVersionRepository,
+)
 from app.core.repositories.product_repository import IProductRepository
 
 
 @dataclass
 class ProductService:
     product_repository: IProductRepository
+    catalog_version_repository: ICatalogVersionRepository
 
     def create_product(self, product: Product) -> Product:
         if self.product_repository.has_barcode(product.barcode):
             raise ProductCreationError(barcode=product.barcode)
 
         product = self.product_repository.create(product)
+        self._catalog_changed(product.id, ChangeAction.CREATED)
         return product
 
+    def get_catalog_version(self) -> int:
+        return self.catalog_version_repository.get_version()
+
+    def get_catalog_changes(self, since: int) -> CatalogChanges:
+        # Bounded by the version read first, so whatever lands meanwhile is
+        # picked up by the client's next request instead of being skipped
+        version = self.catalog_version_repository.get_version()
+        changes = self.catalog_version_repository.get_changes(
+            since=since, until=version)
+        product_ids = [change.entity_id for change in changes
+                       if change.kind == ChangeKind.PRODUCT
+                       and change.action != ChangeAction.DELETED]
+        return CatalogChanges(
+            since=since, version=version, changes=changes,
+            products=self.product_repository.get_many(product_ids))
+
+    def get_unsold_ids(self, sold: Container[str], limit: int) -> List[str]:
+        # Ids only, in pages, stopping at limit: the scan is bounded by the
+        # number of products sold rather than by the catalog
+        unsold: List[str] = []
+        after = None
+        while len(unsold) < limit:
+            ids = self.product_repository.get_ids(after=after,
+                                                  limit=MAX_PAGE_SIZE)
+            unsold += [product_id for product_id in ids
+                       if product_id not in sold][:limit - len(unsold)]
+            if len(ids) < MAX_PAGE_SIZE:
+                break
+            after = ids[-1]
+
+        return unsold
+
     def get_one_product(self, product_id: str) -> Product:
         product = self.product_repository.get_one(product_id=product_id)
         if not product:
@@ -27,8 +77,21 @@ class ProductService:
 
         return product
 
-    def get_all_products(self) -> List[Product]:
-        return self.product_repository.get_all()
+    def get_products_page(self, query: ProductQuery, cursor: Optional[str],
+                          limit: int) -> Page[Product]:
+        limit = min(limit, MAX_PAGE_SIZE)
+        by_name = query.order_by == "name"
+        after = decode_cursor(cursor, size=2 if by_name else 1)
+        products = self.product_repository.get_page(
+            query=query, after=after, limit=limit + 1)
+        return make_page(products, limit,
+                         key=lambda product: [product.name, product.id]
+                         if by_name else [product.id])
 
     def update_product(self, product: Product, price: float) -> None:
-        self.product_repository.update(product_id=product.id, price=price)
\ No newline at end of file
+        self.product_repository.update(product_id=product.id, price=price)
+        self._catalog_changed(product.id, ChangeAction.UPDATED)
+
+    def _catalog_changed(self, product_id: str, action: ChangeAction) -> None:
+        self.catalog_version_repository.record_change(CatalogChange(
+            kind=ChangeKind.PRODUCT, entity_id=product_id, action=action))
\ No newline at end of file
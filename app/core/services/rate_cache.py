@@ -0,0 +1,103 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Tuple
+
+from app.core.exceptions.payment_exceptions import (
+    ExchangeRateUnavailableError,
+)
+
+CurrencyPair = Tuple[str, str]
+RateFetcher = Callable[[str, str], Awaitable[float]]
+
+
+@dataclass
+class CachedRate:
+    rate: float
+    fetched_at: float
+
+
+@dataclass
+class RateCacheStats:
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    refresh_failures: int = 0
+
+
+@dataclass
+class RateCache:
+    ttl: float = 60.0
+    max_staleness: float = 600.0
+    clock: Callable[[], float] = time.monotonic
+    stats: RateCacheStats = field(default_factory=RateCacheStats)
+    _rates: Dict[CurrencyPair, CachedRate] = field(default_factory=dict)
+    _inflight: Dict[CurrencyPair, 'asyncio.Task[float]'] = field(
+        default_factory=dict)
+
+    async def get(self, from_currency: str, to_currency: str,
+                  fetch: RateFetcher) -> float:
+        pair = (from_currency, to_currency)
+        cached = self._rates.get(pair)
+        if cached is not None:
+            age = self.clock() - cached.fetched_at
+            if age <= self.ttl:
+                self.stats.hits += 1
+                return cached.rate
+            # Stale but still usable: answer now, refresh behind the payment
+            if age <= self.max_staleness:
+                self.stats.stale_hits += 1
+                self._refresh_in_background(pair, fetch)
+                return cached.rate
+
+        self.stats.misses += 1
+        try:
+            return await self.refresh(from_currency, to_currency, fetch)
+        except Exception:
+            raise ExchangeRateUnavailableError(from_currency=from_currency,
+                                               to_currency=to_currency)
+
+    async def refresh(self, from_currency: str, to_currency: str,
+                      fetch: RateFetcher) -> float:
+        # Shielded so one cancelled caller does not cancel the shared fetch
+        return await asyncio.shield(
+            self._start_fetch((from_currency, to_currency), fetch))
+
+    def put(self, from_currency: str, to_currency: str, rate: float) -> None:
+        self._rates[(from_currency, to_currency)] = CachedRate(
+            rate=rate, fetched_at=self.clock())
+
+    def size(self) -> int:
+        return len(self._rates)
+
+    def _start_fetch(self, pair: CurrencyPair,
+                     fetch: RateFetcher) -> 'asyncio.Task[float]':
+        # Single flight: concurrent callers for a pair share one upstream
+        # call, and its result or error reaches every one of them
+        task = self._inflight.get(pair)
+        if task is not None:
+            self.stats.coalesced += 1
+            return task
+
+        task = asyncio.get_running_loop().create_task(
+            self._fetch(pair, fetch))
+        self._inflight[pair] = task
+        task.add_done_callback(lambda _: self._inflight.pop(pair, None))
+        return task
+
+    async def _fetch(self, pair: CurrencyPair, fetch: RateFetcher) -> float:
+        rate = await fetch(*pair)
+        self.put(pair[0], pair[1], rate)
+        return rate
+
+    def _refresh_in_background(self, pair: CurrencyPair,
+                               fetch: RateFetcher) -> None:
+        if pair in self._inflight:
+            return
+        self._start_fetch(pair, fetch).add_done_callback(
+            self._record_background_result)
+
+    def _record_background_result(self, task: 'asyncio.Task[float]') -> None:
+        if not task.cancelled() and task.exception() is not None:
+            self.stats.refresh_failures += 1
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
 from app.core.exceptions.receipt_exceptions import (
     GetReceiptErrorMessage,
@@ -30,6 +31,13 @@ class ReceiptService:
 
         return receipt
 
+    def get_open_receipt(self, receipt_id: str) -> Receipt:
+        receipt = self.get_one_receipt(receipt_id=receipt_id)
+        if not receipt.status:
+            raise ReceiptClosedErrorMessage(receipt_id=receipt.id)
+
+        return receipt
+
     def get_all_receipts(self) -> List[Receipt]:
         return self.receipt_repository.get_all()
 
@@ -38,9 +46,12 @@ class ReceiptService:
             raise ReceiptClosedErrorMessage(receipt_id=receipt.id)
         self.receipt_repository.delete(receipt_id=receipt.id)
 
-    def update_status(self, receipt: Receipt, status: bool) -> None:
+    def update_status(self, receipt: Receipt, status: bool,
+                      paid_at: Optional[datetime] = None) -> None:
         receipt.get_state().close_receipt(receipt=receipt)
-        self.receipt_repository.update(receipt_id=receipt.id, status=status)
+        receipt.paid_at = paid_at
+        self.receipt_repository.update(receipt_id=receipt.id, status=status,
+                                       paid_at=paid_at)
 
     def add_product(self, receipt: Receipt, product: Product,
                     quantity: int) -> Receipt:
@@ -0,0 +1,169 @@
+import heapq
+from dataclasses import dataclass
+from datetime import date, datetime
+from itertools import chain
+from typing import Callable, Container, Dict, List, Optional
+
+from app.core.models.export import to_local_naive
+from app.core.models.payment import Payment
+from app.core.models.receipt import Receipt
+from app.core.models.report import ReportTotals, XReport, ZReport
+from app.core.repositories.report_repository import (
+    IReportEngine,
+    IReportRepository,
+)
+from app.core.schemas.report_schema import (
+    ProductSales,
+    ReportResponse,
+    SalesAnalyticsResponse,
+    SalesBucket,
+    SalesReportResponse,
+    TopProductsResponse,
+)
+from app.core.services.payment_service import BASE_CURRENCY, PaymentService
+from app.core.services.shift_service import ShiftService
+
+LIFETIME_SCOPE = "lifetime"
+
+
+def shift_scope(shift_id: str) -> str:
+    return f"shift:{shift_id}"
+
+
+def day_scope(day: date) -> str:
+    return f"day:{day.isoformat()}"
+
+
+def hour_scope(moment: datetime) -> str:
+    return f"hour:{moment.strftime('%Y-%m-%dT%H')}"
+
+
+def _bucket_scope(granularity: str, moment: datetime) -> str:
+    if granularity == "hour":
+        return hour_scope(moment)
+    return day_scope(moment.date())
+
+
+@dataclass
+class ReportService:
+    report_repository: IReportRepository
+
+    def record_payment(self, receipt: Receipt, payment: Payment) -> None:
+        totals = self._get_receipt_totals(receipt=receipt, payment=payment)
+        self.report_repository.add(
+            scopes=self._get_scopes(receipt=receipt, payment=payment),
+            totals=totals)
+
+    def aggregate(self, receipts: List[Receipt],
+                  payments: Dict[str, Payment]) -> Dict[str, ReportTotals]:
+        totals: Dict[str, ReportTotals] = {}
+        for receipt in receipts:
+            payment = payments.get(receipt.id)
+            receipt_totals = self._get_receipt_totals(receipt, payment)
+            for scope in self._get_scopes(receipt=receipt, payment=payment):
+                totals.setdefault(scope, ReportTotals()).merge(receipt_totals)
+
+        return totals
+
+    def rebuild(self, totals: Dict[str, ReportTotals]) -> None:
+        self.report_repository.replace(totals=totals)
+
+    def get_sales_report(self, day: Optional[date]) -> SalesReportResponse:
+        scope = LIFETIME_SCOPE if day is None else day_scope(day)
+        totals = self.report_repository.get(scope=scope, include_items=False)
+        return SalesReportResponse(
+            number_of_receipts=totals.number_of_receipts,
+            revenue=totals.get_revenue(),
+            day=day)
+
+    def get_sales_analytics(self, granularity: str, start: datetime,
+                            end: datetime) -> SalesAnalyticsResponse:
+        # Buckets are keyed by naive local time, like paid_at
+        start, end = to_local_naive(start), to_local_naive(end)
+        # Buckets are pre-aggregated, so a range read never touches receipts
+        totals = self.report_repository.get_range(
+            start_scope=_bucket_scope(granularity, start),
+            end_scope=_bucket_scope(granularity, end))
+        buckets = []
+        for scope, bucket_totals in totals.items():
+            buckets.append(SalesBucket(
+                bucket=scope.split(":", 1)[1],
+                number_of_receipts=bucket_totals.number_of_receipts,
+                revenue=bucket_totals.get_revenue(),
+                products=[
+                    ProductSales(product_id=item_id,
+                                 quantity=quantity,
+                                 amount=bucket_totals.sold_amount.get(
+                                     item_id, 0.0))
+                    for item_id, quantity in bucket_totals.sold_count.items()
+                ]))
+
+        return SalesAnalyticsResponse(granularity=granularity, buckets=buckets)
+
+    def get_top_products(self, shift_id: Optional[str], by: str, limit: int,
+                         get_unsold: Callable[[Container[str], int],
+                                              List[str]]
+                         ) -> TopProductsResponse:
+        scope = LIFETIME_SCOPE if shift_id is None else shift_scope(shift_id)
+        totals = self.report_repository.get(scope=scope)
+        counters = totals.sold_count if by == "quantity" else totals.sold_amount
+        # Heap selection is O(n log limit), the full list is never sorted
+        top = heapq.nlargest(limit, counters.items(), key=lambda pair: pair[1])
+        # Catalog products that never sold are the slowest movers of all
+        unsold = ((product_id, 0)
+                  for product_id in get_unsold(counters, limit))
+        bottom = heapq.nsmallest(limit, chain(unsold, counters.items()),
+                                 key=lambda pair: pair[1])
+        return TopProductsResponse(
+            by=by,
+            shift_id=shift_id,
+            top=[self._get_product_sales(totals, item_id)
+                 for item_id, _ in top],
+            bottom=[self._get_product_sales(totals, item_id)
+                    for item_id, _ in bottom])
+
+    def _get_product_sales(self, totals: ReportTotals,
+                           item_id: str) -> ProductSales:
+        return ProductSales(product_id=item_id,
+                            quantity=totals.sold_count.get(item_id, 0),
+                            amount=totals.sold_amount.get(item_id, 0.0))
+
+    def _get_receipt_totals(self, receipt: Receipt,
+                            payment: Optional[Payment]) -> ReportTotals:
+        # Receipts paid before payments were recorded count as GEL
+        if payment is None:
+            return ReportTotals().add_receipt(
+                receipt=receipt,
+                currency=BASE_CURRENCY,
+                amount=receipt.get_discounted_price() or receipt.get_price())
+
+        return ReportTotals().add_receipt(
+            receipt=receipt,
+            currency=payment.currency,
+            amount=payment.converted_amount)
+
+    def _get_scopes(self, receipt: Receipt,
+                    payment: Optional[Payment]) -> List[str]:
+        scopes = [LIFETIME_SCOPE, shift_scope(receipt.shift_id)]
+        if payment is not None:
+            scopes.append(day_scope(payment.paid_at.date()))
+            scopes.append(hour_scope(payment.paid_at))
+
+        return scopes
+
+    def get_xreport(self) -> ReportResponse:
+        return self.report_repository.get(scope=LIFETIME_SCOPE).to_response()
+
+
+@dataclass
+class ObjectReportEngine(IReportEngine):
+    shift_service: ShiftService
+    payment_service: PaymentService
+
+    def make_xreport(self) -> ReportResponse:
+        return XReport().make_report(self.shift_service,
+                                     self.payment_service)
+
+    def make_zreport(self, shift_id: str) -> ReportResponse:
+        return ZReport(shift_id=shift_id).make_report(self.shift_service,
+                                                      self.payment_service)
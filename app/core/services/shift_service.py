@@ -1,10 +1,11 @@
 from dataclasses import dataclass
-from typing import List
+from typing import Callable, Dict, List, Optional
 
 from app.core.exceptions.shift_exceptions import GetShiftErrorMessage
 from app.core.models.receipt import Receipt
 from app.core.models.shift import Shift
 from app.core.repositories.shift_repository import IShiftRepository
+from app.core.schemas.report_schema import ReportResponse
 
 
 @dataclass
@@ -14,8 +15,10 @@ class ShiftService:
     def create_shift(self, shift: Shift) -> Shift:
         return self.shift_repository.create(shift=shift)
 
-    def get_one_shift(self, shift_id: str) -> Shift:
-        shift = self.shift_repository.get_one(shift_id=shift_id)
+    def get_one_shift(self, shift_id: str,
+                      include_receipts: bool = True) -> Shift:
+        shift = self.shift_repository.get_one(
+            shift_id=shift_id, include_receipts=include_receipts)
         if not shift:
             raise GetShiftErrorMessage(shift_id=shift_id)
 
@@ -24,10 +27,23 @@ class ShiftService:
     def get_all_shifts(self) -> List[Shift]:
         return self.shift_repository.get_all()
 
-    def update_status(self, shift: Shift, status: bool) -> None:
+    def update_status(self, shift: Shift, status: bool,
+                      make_report: Optional[Callable[[], ReportResponse]]
+                      ) -> None:
         shift.state.change_status(shift)
-        self.shift_repository.update(shift_id=shift.id, status=status)
+        self.shift_repository.update(shift_id=shift.id, status=status,
+                                     make_report=make_report,
+                                     closed_at=shift.closed_at)
+
+    def get_zreports(self,
+                     shift_ids: List[str]) -> Dict[str, ReportResponse]:
+        return self.shift_repository.get_reports(shift_ids=shift_ids)
 
     def add_receipt(self, shift: Shift, receipt: Receipt) -> Shift:
         shift.state.add_item(shift=shift, receipt=receipt)
-        return self.shift_repository.add_receipt(shift=shift)
\ No newline at end of file
+        return self.shift_repository.add_receipt(shift=shift)
+
+    def attach_receipt(self, shift: Shift, receipt: Receipt) -> None:
+        shift.state.add_item(shift=shift, receipt=receipt)
+        self.shift_repository.attach_receipt(shift_id=shift.id,
+                                             receipt=receipt)
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -25,6 +26,7 @@ class OpenShiftState(ShiftState):
 
     def change_status(self, shift: 'Shift') -> 'Shift':
         shift.state = ClosedShiftState()
+        shift.closed_at = datetime.now()
         return shift
 
 
@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from pydantic import BaseModel
 
 from app.core.exceptions.campaign_exceptions import GetCampaignErrorMessage
+from app.core.exceptions.page_exceptions import InvalidCursorError
 from app.core.exceptions.products_exceptions import GetProductError
 from app.core.facade import POSCore
+from app.core.models.campaign import CampaignType
+from app.core.models.page import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, CampaignQuery
 from app.core.models.product import NumProduct
 from app.core.schemas.campaign_schema import (
     AddProductInComboRequest,
@@ -20,6 +25,8 @@ from app.core.schemas.campaign_schema import (
     GetAllCampaignsResponse,
     GetOneCampaignResponse,
 )
+from app.infra.api.conditional import catalog_response
+from app.infra.api.encoders import FastJSONResponse
 from app.infra.dependables import get_core
 
 campaign_api = APIRouter()
@@ -148,8 +155,20 @@ def get_one_campaign(campaign_id: str,
 
 @campaign_api.get('', status_code=200,
                   response_model=GetAllCampaignsResponse)
-def get_all_campaigns(core: POSCore = Depends(get_core)) -> GetAllCampaignsResponse:
-    return core.get_all_campaigns()
+def get_all_campaigns(limit: int = Query(DEFAULT_PAGE_SIZE, ge=1,
+                                         le=MAX_PAGE_SIZE),
+                      cursor: Optional[str] = None,
+                      campaign_type: Optional[CampaignType] = None,
+                      if_none_match: Optional[str] = Header(None),
+                      core: POSCore = Depends(get_core)) -> Response:
+    try:
+        return catalog_response(
+            if_none_match, core.get_catalog_version(),
+            lambda: FastJSONResponse(core.get_campaigns(
+                query=CampaignQuery(campaign_type=campaign_type),
+                cursor=cursor, limit=limit)))
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=exc.message)
 
 
 @campaign_api.delete('/{campaign_id}', status_code=200)
@@ -0,0 +1,29 @@
+from typing import Callable, Optional
+
+from starlette.responses import Response
+
+
+def catalog_etag(version: int) -> str:
+    return f'"catalog-{version}"'
+
+
+def is_not_modified(if_none_match: Optional[str], etag: str) -> bool:
+    if if_none_match is None:
+        return False
+
+    # If-None-Match compares weakly and may carry several tags
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+def catalog_response(if_none_match: Optional[str], version: int,
+                     render: Callable[[], Response]) -> Response:
+    # The listing is only read and rendered when the client's copy is stale
+    etag = catalog_etag(version)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if is_not_modified(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    response = render()
+    response.headers.update(headers)
+    return response
@@ -0,0 +1,22 @@
+from dataclasses import asdict
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends
+
+from app.infra.dependables import get_sql_tracer
+from app.infra.sql_trace import SqlTracer
+
+debug_api = APIRouter()
+
+
+@debug_api.get('/sql', status_code=200)
+def get_sql_stats(limit: int = 20,
+                  tracer: SqlTracer = Depends(get_sql_tracer)
+                  ) -> Dict[str, Any]:
+    totals = tracer.totals
+    return {
+        "statements": totals.statements,
+        "total_time": totals.total_time,
+        "queries": [asdict(stat) for stat in totals.slowest(limit)],
+        "n_plus_one": [asdict(finding) for finding in tracer.findings],
+    }
@@ -0,0 +1,16 @@
+from typing import Any
+
+from pydantic import BaseModel
+from starlette.responses import Response
+
+
+class FastJSONResponse(Response):
+    # Writes a response model straight to JSON bytes with the serializer
+    # pydantic prepared for its class, skipping FastAPI's re-validation, the
+    # intermediate dict tree and json.dumps
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if not isinstance(content, BaseModel):
+            raise TypeError(f"Expected a response model, got {content!r}")
+        return content.__pydantic_serializer__.to_json(content)
@@ -0,0 +1,47 @@
+from datetime import datetime
+from typing import Iterator, Literal, Optional
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from app.core.facade import POSCore
+from app.core.models.export import ExportFilter
+from app.infra.dependables import get_core
+
+exports_api = APIRouter()
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _stream(content: Iterator[str], name: str, export_format: str) -> StreamingResponse:
+    return StreamingResponse(
+        content,
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition":
+                 f'attachment; filename="{name}.{export_format}"'})
+
+
+@exports_api.get('/receipts', status_code=200)
+def export_receipts(export_format: Literal["ndjson", "csv"] = Query(
+                        "ndjson", alias="format"),
+                    shift_id: Optional[str] = None,
+                    start: Optional[datetime] = None,
+                    end: Optional[datetime] = None,
+                    core: POSCore = Depends(get_core)) -> StreamingResponse:
+    content = core.export_receipts(
+        export_filter=ExportFilter(shift_id=shift_id, start=start, end=end),
+        export_format=export_format)
+    return _stream(content, "receipts", export_format)
+
+
+@exports_api.get('/sales-lines', status_code=200)
+def export_sales_lines(export_format: Literal["ndjson", "csv"] = Query(
+                           "ndjson", alias="format"),
+                       shift_id: Optional[str] = None,
+                       start: Optional[datetime] = None,
+                       end: Optional[datetime] = None,
+                       core: POSCore = Depends(get_core)) -> StreamingResponse:
+    content = core.export_sales_lines(
+        export_filter=ExportFilter(shift_id=shift_id, start=start, end=end),
+        export_format=export_format)
+    return _stream(content, "sales_lines", export_format)
@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Depends
+from starlette.responses import Response
+
+from app.core.facade import POSCore
+from app.infra.dependables import get_core, get_metrics
+from app.infra.metrics import CONTENT_TYPE, Metrics
+
+metrics_api = APIRouter()
+
+
+@metrics_api.get('/metrics', status_code=200)
+def get_metrics_text(core: POSCore = Depends(get_core),
+                     metrics: Metrics = Depends(get_metrics)) -> Response:
+    return Response(metrics.render(core.get_rate_cache_stats()),
+                    media_type=CONTENT_TYPE)
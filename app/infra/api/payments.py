@@ -2,36 +2,69 @@ from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException
 
+from app.core.exceptions.payment_exceptions import (
+    ExchangeRateUnavailableError,
+)
 from app.core.exceptions.receipt_exceptions import ReceiptClosedErrorMessage
+from app.core.exceptions.shift_exceptions import ShiftClosedErrorMessage
 from app.core.facade import POSCore
-from app.infra.dependables import get_core
+from app.core.schemas.payment_schema import RateCacheStatsResponse
+from app.infra.dependables import get_core, get_metrics
+from app.infra.metrics import Metrics
 
 payment_api = APIRouter()
 
 @payment_api.post('/usd/{receipt_id}')
 async def pay_usd(receipt_id: str,
-                  core: POSCore = Depends(get_core)) -> Any:
+                  core: POSCore = Depends(get_core),
+                  metrics: Metrics = Depends(get_metrics)) -> Any:
     try:
-        return await core.pay_receipt(receipt_id=receipt_id,
-                                      to_currency="USD")
+        amount = await core.pay_receipt(receipt_id=receipt_id,
+                                        to_currency="USD")
+        metrics.receipts_paid.inc()
+        return amount
     except ReceiptClosedErrorMessage as exc:
-        return HTTPException(status_code=403, detail=exc.message)
+        raise HTTPException(status_code=403, detail=exc.message)
+    except ShiftClosedErrorMessage as exc:
+        raise HTTPException(status_code=403, detail=exc.message)
+    except ExchangeRateUnavailableError as exc:
+        raise HTTPException(status_code=503, detail=exc.message)
 
 @payment_api.post('/eur/{receipt_id}')
 async def pay_eur(receipt_id: str,
-                  core: POSCore = Depends(get_core)) -> Any:
+                  core: POSCore = Depends(get_core),
+                  metrics: Metrics = Depends(get_metrics)) -> Any:
     try:
-        return await core.pay_receipt(receipt_id=receipt_id,
-                                      to_currency="EUR")
+        amount = await core.pay_receipt(receipt_id=receipt_id,
+                                        to_currency="EUR")
+        metrics.receipts_paid.inc()
+        return amount
     except ReceiptClosedErrorMessage as exc:
-        return HTTPException(status_code=403, detail=exc.message)
+        raise HTTPException(status_code=403, detail=exc.message)
+    except ShiftClosedErrorMessage as exc:
+        raise HTTPException(status_code=403, detail=exc.message)
+    except ExchangeRateUnavailableError as exc:
+        raise HTTPException(status_code=503, detail=exc.message)
 
 @payment_api.post('/gel/{receipt_id}')
 async def pay_gel(receipt_id: str,
-                  core: POSCore = Depends(get_core)) -> Any:
+                  core: POSCore = Depends(get_core),
+                  metrics: Metrics = Depends(get_metrics)) -> Any:
     try:
-        return await core.pay_receipt(receipt_id=receipt_id,
-                                      to_currency="GEL")
+        amount = await core.pay_receipt(receipt_id=receipt_id,
+                                        to_currency="GEL")
+        metrics.receipts_paid.inc()
+        return amount
     except ReceiptClosedErrorMessage as exc:
-        return HTTPException(status_code=403, detail=exc.message)
+        raise HTTPException(status_code=403, detail=exc.message)
+    except ShiftClosedErrorMessage as exc:
+        raise HTTPException(status_code=403, detail=exc.message)
+    except ExchangeRateUnavailableError as exc:
+        raise HTTPException(status_code=503, detail=exc.message)
 
+
+@payment_api.get('/rates/stats', status_code=200,
+                 response_model=RateCacheStatsResponse)
+def get_rate_cache_stats(
+        core: POSCore = Depends(get_core)) -> RateCacheStatsResponse:
+    return core.get_rate_cache_stats()
@@ -1,18 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from pydantic import BaseModel
 
+from app.core.exceptions.page_exceptions import InvalidCursorError
 from app.core.exceptions.products_exceptions import (
     GetProductError,
     ProductCreationError,
 )
 from app.core.facade import POSCore
+from app.core.models.page import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    ProductOrder,
+    ProductQuery,
+)
 from app.core.schemas.products_schema import (
+    CatalogChangesResponse,
     CreateProductRequest,
     CreateProductResponse,
     GetAllProductResponse,
     GetOneProductResponse,
     UpdateProductPriceRequest,
 )
+from app.infra.api.conditional import catalog_response
+from app.infra.api.encoders import FastJSONResponse
 from app.infra.dependables import get_core
 
 products_api = APIRouter()
@@ -36,8 +48,32 @@ def create_product(request: ProductBase,
 
 @products_api.get('/', status_code=200,
                   response_model=GetAllProductResponse)
-def get_products(core: POSCore = Depends(get_core)) -> GetAllProductResponse:
-    return core.get_all_products()
+def get_products(limit: int = Query(DEFAULT_PAGE_SIZE, ge=1,
+                                    le=MAX_PAGE_SIZE),
+                 cursor: Optional[str] = None,
+                 order_by: ProductOrder = "id",
+                 name_prefix: Optional[str] = None,
+                 min_price: Optional[float] = None,
+                 max_price: Optional[float] = None,
+                 if_none_match: Optional[str] = Header(None),
+                 core: POSCore = Depends(get_core)) -> Response:
+    query = ProductQuery(order_by=order_by, name_prefix=name_prefix,
+                         min_price=min_price, max_price=max_price)
+    try:
+        return catalog_response(
+            if_none_match, core.get_catalog_version(),
+            lambda: FastJSONResponse(
+                core.get_products(query=query, cursor=cursor, limit=limit)))
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=exc.message)
+
+
+@products_api.get('/changes', status_code=200,
+                  response_model=CatalogChangesResponse)
+def get_product_changes(since: int = Query(..., ge=0),
+                        core: POSCore = Depends(get_core)) -> Response:
+    # Declared before /{product_id}, which would otherwise capture it
+    return FastJSONResponse(core.get_catalog_changes(since=since))
 
 
 @products_api.get("/{product_id}",
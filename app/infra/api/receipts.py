@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from pydantic import BaseModel
 
 from app.core.exceptions.campaign_exceptions import GetCampaignErrorMessage
@@ -18,7 +18,9 @@ from app.core.schemas.receipt_schema import (
     CreateReceiptResponse,
     GetOneReceiptResponse,
 )
-from app.infra.dependables import get_core
+from app.infra.api.encoders import FastJSONResponse
+from app.infra.dependables import get_core, get_metrics
+from app.infra.metrics import Metrics
 
 receipts_api = APIRouter()
 
@@ -31,8 +33,12 @@ class ReceiptBase(BaseModel):
 @receipts_api.post("", status_code=201,
                    response_model=CreateReceiptResponse)
 def create_receipt(request: ReceiptBase,
-                   core: POSCore = Depends(get_core)) -> CreateReceiptResponse:
-    return core.create_receipt(request=CreateReceiptRequest(**request.dict()))
+                   core: POSCore = Depends(get_core),
+                   metrics: Metrics = Depends(get_metrics)) -> Response:
+    response = core.create_receipt(
+        request=CreateReceiptRequest(**request.dict()))
+    metrics.receipts_created.inc()
+    return FastJSONResponse(response, status_code=201)
 
 
 
@@ -46,14 +52,16 @@ class ProductForReceiptBase(BaseModel):
                    response_model=AddItemInReceiptResponse)
 def add_product_in_receipt(receipt_id: str,
                    request: ProductForReceiptBase,
-                   core: POSCore = Depends(get_core)) -> AddItemInReceiptResponse:
+                   core: POSCore = Depends(get_core)) -> Response:
     if request.quantity < 1:
         raise HTTPException(status_code=400, detail="Invalid quantity")
 
 
     try:
-        return core.add_product_in_receipt(receipt_id=receipt_id,
-                request=AddProductInReceiptRequest(**request.dict()))
+        return FastJSONResponse(core.add_product_in_receipt(
+            receipt_id=receipt_id,
+            request=AddProductInReceiptRequest(**request.dict())),
+            status_code=201)
     except GetReceiptErrorMessage as exc:
         raise HTTPException(status_code=404, detail=exc.message)
     except ReceiptClosedErrorMessage as exc:
@@ -74,13 +82,15 @@ class ComboForReceiptBase(BaseModel):
                    response_model=AddItemInReceiptResponse)
 def add_combo_in_receipt(receipt_id: str,
                    request: ComboForReceiptBase,
-                   core: POSCore = Depends(get_core)) -> AddItemInReceiptResponse:
+                   core: POSCore = Depends(get_core)) -> Response:
     if request.quantity < 1:
         raise HTTPException(status_code=400, detail="Invalid quantity")
 
     try:
-        return core.add_combo_in_receipt(receipt_id=receipt_id,
-                    request=AddComboInReceiptRequest(**request.dict()))
+        return FastJSONResponse(core.add_combo_in_receipt(
+            receipt_id=receipt_id,
+            request=AddComboInReceiptRequest(**request.dict())),
+            status_code=201)
     except GetReceiptErrorMessage as exc:
         raise HTTPException(status_code=404, detail=exc.message)
     except ReceiptClosedErrorMessage as exc:
@@ -100,13 +110,15 @@ class GiftForReceiptBase(BaseModel):
                    response_model=AddItemInReceiptResponse)
 def add_gift_in_receipt(receipt_id: str,
                    request: GiftForReceiptBase,
-                   core: POSCore = Depends(get_core)) -> AddItemInReceiptResponse:
+                   core: POSCore = Depends(get_core)) -> Response:
     if request.quantity < 1:
         raise HTTPException(status_code=400, detail="Invalid quantity")
 
     try:
-        return core.add_gift_in_receipt(receipt_id=receipt_id,
-            request=AddGiftInReceiptRequest(**request.dict()))
+        return FastJSONResponse(core.add_gift_in_receipt(
+            receipt_id=receipt_id,
+            request=AddGiftInReceiptRequest(**request.dict())),
+            status_code=201)
     except GetReceiptErrorMessage as exc:
         raise HTTPException(status_code=404, detail=exc.message)
     except ReceiptClosedErrorMessage as exc:
@@ -134,9 +146,9 @@ def delete_item_from_receipt(receipt_id: str,
 @receipts_api.get("/{receipt_id}", status_code=200,
                   response_model=GetOneReceiptResponse)
 def get_one_receipt(receipt_id: str,
-                    core: POSCore = Depends(get_core)) -> GetOneReceiptResponse:
+                    core: POSCore = Depends(get_core)) -> Response:
     try:
-        return core.get_one_receipt(receipt_id=receipt_id)
+        return FastJSONResponse(core.get_one_receipt(receipt_id=receipt_id))
     except GetReceiptErrorMessage as exc:
         raise HTTPException(status_code=404, detail=exc.message)
 
@@ -1,11 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date, datetime
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 
 from app.core.exceptions.shift_exceptions import (
     GetShiftErrorMessage,
     ShiftOpenedErrorMessage,
 )
 from app.core.facade import POSCore
-from app.core.schemas.report_schema import ReportResponse
+from app.core.schemas.report_schema import (
+    ReportResponse,
+    SalesAnalyticsResponse,
+    SalesReportResponse,
+    TopProductsResponse,
+    ZReportsResponse,
+)
 from app.infra.dependables import get_core
 
 reports_api = APIRouter()
@@ -24,4 +33,44 @@ def get_zreport(shift_id: str, core: POSCore = Depends(get_core)) -> ReportRespo
     except GetShiftErrorMessage as exc:
         raise HTTPException(status_code=404, detail=exc.message)
     except ShiftOpenedErrorMessage as exc:
-        raise HTTPException(status_code=403, detail=exc.message)
\ No newline at end of file
+        raise HTTPException(status_code=403, detail=exc.message)
+
+@reports_api.get('/Zreports', status_code=200,
+                 response_model=ZReportsResponse)
+def get_zreports(shift_id: List[str] = Query(),
+                 core: POSCore = Depends(get_core)) -> ZReportsResponse:
+    try:
+        return core.get_zreports(shift_ids=shift_id)
+    except GetShiftErrorMessage as exc:
+        raise HTTPException(status_code=404, detail=exc.message)
+    except ShiftOpenedErrorMessage as exc:
+        raise HTTPException(status_code=403, detail=exc.message)
+
+
+@reports_api.get('/sales', status_code=200,
+                 response_model=SalesReportResponse)
+def get_sales_report(day: Optional[date] = None,
+                     core: POSCore = Depends(get_core)) -> SalesReportResponse:
+    return core.get_sales_report(day=day)
+
+
+@reports_api.get('/analytics', status_code=200,
+                 response_model=SalesAnalyticsResponse)
+def get_sales_analytics(start: datetime, end: datetime,
+                        granularity: Literal["hour", "day"] = "hour",
+                        core: POSCore = Depends(get_core)
+                        ) -> SalesAnalyticsResponse:
+    return core.get_sales_analytics(granularity=granularity,
+                                    start=start, end=end)
+
+
+@reports_api.get('/top-products', status_code=200,
+                 response_model=TopProductsResponse)
+def get_top_products(shift_id: Optional[str] = None,
+                     by: Literal["quantity", "revenue"] = "quantity",
+                     limit: int = Query(20, ge=1, le=1000),
+                     core: POSCore = Depends(get_core)) -> TopProductsResponse:
+    try:
+        return core.get_top_products(shift_id=shift_id, by=by, limit=limit)
+    except GetShiftErrorMessage as exc:
+        raise HTTPException(status_code=404, detail=exc.message)
@@ -0,0 +1,47 @@
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+@dataclass
+class CircuitBreaker:
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+    clock: Callable[[], float] = time.monotonic
+    state: str = field(default=CLOSED, init=False)
+    _failures: int = field(default=0, init=False)
+    _opened_at: float = field(default=0.0, init=False)
+    _trial_running: bool = field(default=False, init=False)
+
+    def allow(self) -> bool:
+        if self.state == OPEN:
+            if self.clock() - self._opened_at < self.reset_timeout:
+                return False
+            self.state = HALF_OPEN
+        # While half open a single trial call decides the next state
+        if self.state == HALF_OPEN:
+            if self._trial_running:
+                return False
+            self._trial_running = True
+        return True
+
+    def record_success(self) -> None:
+        self.state = CLOSED
+        self._failures = 0
+        self._trial_running = False
+
+    def release_trial(self) -> None:
+        # For a trial call that ended without an outcome, e.g. cancelled;
+        # otherwise the breaker would wait on it forever
+        self._trial_running = False
+
+    def record_failure(self) -> None:
+        self._trial_running = False
+        self._failures += 1
+        if self.state == HALF_OPEN or self._failures >= self.failure_threshold:
+            self.state = OPEN
+            self._opened_at = self.clock()
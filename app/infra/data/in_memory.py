@@ -1,16 +1,34 @@
+import bisect
 import uuid
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from typing import (
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    cast,
+)
 
 from app.core.factories.repo_factory import RepoFactory
 from app.core.models.campaign import (
     BuyNGetNCampaign,
+    Campaign,
     ComboCampaign,
     DiscountCampaign,
     ReceiptCampaign,
 )
+from app.core.models.catalog import CatalogChange, ChangeKind
+from app.core.models.export import ExportFilter, ReceiptRow, SalesLineRow
+from app.core.models.models import SoldItem
+from app.core.models.page import ProductQuery, prefix_upper_bound
+from app.core.models.payment import Payment
 from app.core.models.product import Product
 from app.core.models.receipt import ProductForReceipt, Receipt
+from app.core.models.report import ReportTotals
 from app.core.models.shift import Shift
 from app.core.repositories.campaign_repository import (
     IBuyNGetNCampaignRepository,
@@ -18,22 +36,99 @@ from app.core.repositories.campaign_repository import (
     IProductDiscountCampaignRepository,
     IReceiptDiscountCampaignRepository,
 )
+from app.core.repositories.catalog_repository import (
+    ICatalogVersionRepository,
+)
+from app.core.repositories.export_repository import IExportRepository
+from app.core.repositories.payment_repository import IPaymentRepository
 from app.core.repositories.product_repository import IProductRepository
 from app.core.repositories.receipt_repesitory import IReceiptRepository
+from app.core.repositories.report_repository import (
+    IReportEngine,
+    IReportRepository,
+)
 from app.core.repositories.shift_repository import IShiftRepository
+from app.core.schemas.report_schema import ReportResponse
 from app.core.state.shift_state import ClosedShiftState, OpenShiftState
 
 
+def _matches(product: Product, query: ProductQuery) -> bool:
+    if query.name_prefix is not None and not (
+            query.name_prefix <= product.name
+            < prefix_upper_bound(query.name_prefix)):
+        return False
+    if query.min_price is not None and product.price < query.min_price:
+        return False
+    if query.max_price is not None and product.price > query.max_price:
+        return False
+    return True
+
+
+def _campaign_page(ids: List[str], store: Mapping[str, Campaign],
+                   after_id: Optional[str], limit: int) -> List[Campaign]:
+    start = bisect.bisect_right(ids, after_id) if after_id is not None else 0
+    return [store[campaign_id] for campaign_id in ids[start:start + limit]]
+
+
+def _insert_id(ids: List[str], campaign_id: str) -> None:
+    bisect.insort(ids, campaign_id)
+
+
+def _remove_id(ids: List[str], campaign_id: str) -> None:
+    del ids[bisect.bisect_left(ids, campaign_id)]
+
+
 @dataclass
 class ProductInMemoryRepository(IProductRepository):
     _store: Dict[str, Product] = field(default_factory=dict)
+    # Sorted keys, so a page is a binary search away instead of a full sort
+    _by_id: List[str] = field(default_factory=list)
+    _by_name: List[Tuple[str, str]] = field(default_factory=list)
 
     def create(self, product: Product) -> Product:
         product_id = str(uuid.uuid4())
         setattr(product, "id", product_id)
         self._store[product_id] = product
+        bisect.insort(self._by_id, product_id)
+        bisect.insort(self._by_name, (product.name, product_id))
         return product
 
+    def get_many(self, product_ids: List[str]) -> List[Product]:
+        return [self._store[product_id] for product_id in product_ids
+                if product_id in self._store]
+
+    def get_page(self, query: ProductQuery, after: Optional[List[str]],
+                 limit: int) -> List[Product]:
+        upper = None
+        if query.order_by == "name":
+            start = bisect.bisect_right(self._by_name, tuple(after or ()))
+            if query.name_prefix is not None:
+                upper = prefix_upper_bound(query.name_prefix)
+                start = max(start, bisect.bisect_left(
+                    self._by_name, (query.name_prefix,)))
+            ids = (self._by_name[index][1]
+                   for index in range(start, len(self._by_name)))
+        else:
+            start = bisect.bisect_right(self._by_id, after[0]) if after else 0
+            ids = (self._by_id[index]
+                   for index in range(start, len(self._by_id)))
+
+        products: List[Product] = []
+        for product_id in ids:
+            product = self._store[product_id]
+            if upper is not None and product.name >= upper:
+                break
+            if _matches(product, query):
+                products.append(product)
+                if len(products) == limit:
+                    break
+
+        return products
+
+    def get_ids(self, after: Optional[str], limit: int) -> List[str]:
+        start = bisect.bisect_right(self._by_id, after) if after else 0
+        return self._by_id[start:start + limit]
+
     def get_one(self, product_id: str) -> Optional[Product]:
         return self._store.get(product_id)
 
@@ -70,8 +165,10 @@ class ReceiptInMemoryRepository(IReceiptRepository):
     def get_all(self) -> List[Receipt]:
         return list(self._store.values())
 
-    def update(self, receipt_id: str, status: bool) -> None:
+    def update(self, receipt_id: str, status: bool,
+               paid_at: Optional[datetime] = None) -> None:
         receipt = self._store[receipt_id]
+        receipt.paid_at = paid_at
         receipt.status = status
 
     def delete(self, receipt_id: str) -> None:
@@ -85,6 +182,7 @@ class ReceiptInMemoryRepository(IReceiptRepository):
 @dataclass
 class ShiftInMemoryRepository(IShiftRepository):
     _store: Dict[str, Shift] = field(default_factory=dict)
+    _reports: Dict[str, ReportResponse] = field(default_factory=dict)
 
     def create(self, shift: Shift) -> Shift:
         shift_id = str(uuid.uuid4())
@@ -92,19 +190,38 @@ class ShiftInMemoryRepository(IShiftRepository):
         self._store[shift_id] = shift
         return shift
 
-    def get_one(self, shift_id: str) -> Optional[Shift]:
-        return self._store.get(shift_id)
+    def get_one(self, shift_id: str,
+                include_receipts: bool = True) -> Optional[Shift]:
+        shift = self._store.get(shift_id)
+        if shift is None or include_receipts:
+            return shift
+
+        return Shift(id=shift.id, receipts=[], state=shift.state,
+                     opened_at=shift.opened_at, closed_at=shift.closed_at)
 
     def add_receipt(self, shift: Shift) -> Shift:
         self._store[shift.id] = shift
         return shift
 
+    def attach_receipt(self, shift_id: str, receipt: Receipt) -> None:
+        self._store[shift_id].receipts.append(receipt)
+
     def get_all(self) -> List[Shift]:
         return list(self._store.values())
 
-    def update(self, shift_id: str, status: bool) -> None:
+    def update(self, shift_id: str, status: bool,
+               make_report: Optional[Callable[[], ReportResponse]] = None,
+               closed_at: Optional[datetime] = None) -> None:
         shift = self._store[shift_id]
-        shift.state = OpenShiftState if status else ClosedShiftState
+        shift.state = OpenShiftState() if status else ClosedShiftState()
+        shift.closed_at = closed_at
+        if make_report is not None:
+            self._reports[shift_id] = make_report()
+
+    def get_reports(self,
+                    shift_ids: List[str]) -> Dict[str, ReportResponse]:
+        return {shift_id: self._reports[shift_id] for shift_id in shift_ids
+                if shift_id in self._reports}
 
     def delete(self, shift_id: str) -> None:
         self._store.pop(shift_id)
@@ -115,12 +232,14 @@ class ShiftInMemoryRepository(IShiftRepository):
 class ProductDiscountCampaignInMemoryRepository(
     IProductDiscountCampaignRepository):
     _store: Dict[str, DiscountCampaign] = field(default_factory=dict)
+    _ids: List[str] = field(default_factory=list)
 
     def create(self,
                discount_campaign: DiscountCampaign) -> DiscountCampaign:
         campaign_id = str(uuid.uuid4())
         setattr(discount_campaign, "id", campaign_id)
         self._store[campaign_id] = discount_campaign
+        _insert_id(self._ids, campaign_id)
         return discount_campaign
 
     def get_one_campaign(self,
@@ -145,6 +264,11 @@ class ProductDiscountCampaignInMemoryRepository(
 
     def delete_campaign(self, campaign_id: str) -> None:
         self._store.pop(campaign_id)
+        _remove_id(self._ids, campaign_id)
+
+    def get_page(self, after_id: Optional[str],
+                 limit: int) -> List[Campaign]:
+        return _campaign_page(self._ids, self._store, after_id, limit)
 
     def get_campaign_with_product(self,
                         product_id: str) -> Optional[DiscountCampaign]:
@@ -166,11 +290,13 @@ class ProductDiscountCampaignInMemoryRepository(
 @dataclass
 class ComboCampaignInMemoryRepository(IComboCampaignRepository):
     _store: Dict[str, ComboCampaign]= field(default_factory=dict)
+    _ids: List[str] = field(default_factory=list)
 
     def create(self, combo_campaign: ComboCampaign) -> ComboCampaign:
         campaign_id = str(uuid.uuid4())
         setattr(combo_campaign, "id", campaign_id)
         self._store[campaign_id] = combo_campaign
+        _insert_id(self._ids, campaign_id)
         return combo_campaign
 
     def get_all(self) -> List[ComboCampaign]:
@@ -188,17 +314,24 @@ class ComboCampaignInMemoryRepository(IComboCampaignRepository):
 
     def delete_campaign(self, campaign_id: str) -> None:
         self._store.pop(campaign_id)
+        _remove_id(self._ids, campaign_id)
+
+    def get_page(self, after_id: Optional[str],
+                 limit: int) -> List[Campaign]:
+        return _campaign_page(self._ids, self._store, after_id, limit)
 
 
 @dataclass
 class BuyNGetNCampaignInMemoryRepository(IBuyNGetNCampaignRepository):
     _store: Dict[str, BuyNGetNCampaign] = field(default_factory=dict)
+    _ids: List[str] = field(default_factory=list)
 
     def create(self,
                buy_n_get_n_campaign: BuyNGetNCampaign) -> BuyNGetNCampaign:
         campaign_id = str(uuid.uuid4())
         setattr(buy_n_get_n_campaign, "id", campaign_id)
         self._store[campaign_id] = buy_n_get_n_campaign
+        _insert_id(self._ids, campaign_id)
         return buy_n_get_n_campaign
 
 
@@ -210,18 +343,25 @@ class BuyNGetNCampaignInMemoryRepository(IBuyNGetNCampaignRepository):
 
     def delete_campaign(self, campaign_id: str) -> None:
         self._store.pop(campaign_id)
+        _remove_id(self._ids, campaign_id)
+
+    def get_page(self, after_id: Optional[str],
+                 limit: int) -> List[Campaign]:
+        return _campaign_page(self._ids, self._store, after_id, limit)
 
 
 @dataclass
 class ReceiptDiscountCampaignInMemoryRepository(
     IReceiptDiscountCampaignRepository):
     _store: Dict[str, ReceiptCampaign] = field(default_factory=dict)
+    _ids: List[str] = field(default_factory=list)
 
     def create(self,
             receipt_campaign: ReceiptCampaign) -> ReceiptCampaign:
         campaign_id = str(uuid.uuid4())
         setattr(receipt_campaign, "id", campaign_id)
         self._store[campaign_id] = receipt_campaign
+        _insert_id(self._ids, campaign_id)
         return receipt_campaign
 
     def get_one_campaign(self, campaign_id: str) -> Optional[ReceiptCampaign]:
@@ -232,6 +372,11 @@ class ReceiptDiscountCampaignInMemoryRepository(
 
     def delete_campaign(self, campaign_id: str) -> None:
         self._store.pop(campaign_id)
+        _remove_id(self._ids, campaign_id)
+
+    def get_page(self, after_id: Optional[str],
+                 limit: int) -> List[Campaign]:
+        return _campaign_page(self._ids, self._store, after_id, limit)
 
     def get_discount_on_amount(self, amount: float) -> Optional[ReceiptCampaign]:
         ret_campaign = None
@@ -246,6 +391,149 @@ class ReceiptDiscountCampaignInMemoryRepository(
 
 
 
+@dataclass
+class PaymentInMemoryRepository(IPaymentRepository):
+    receipts: ReceiptInMemoryRepository = field(
+        default_factory=ReceiptInMemoryRepository)
+    shifts: ShiftInMemoryRepository = field(
+        default_factory=ShiftInMemoryRepository)
+    _store: Dict[str, Payment] = field(default_factory=dict)
+
+    def settle(self, payment: Payment,
+               on_settled: Callable[[], None]) -> bool:
+        receipt = self.receipts.get_one(payment.receipt_id)
+        if receipt is None or not receipt.status:
+            return False
+
+        shift = self.shifts.get_one(receipt.shift_id, include_receipts=False)
+        if shift is None or isinstance(shift.state, ClosedShiftState):
+            return False
+
+        self.receipts.update(receipt_id=receipt.id, status=False,
+                             paid_at=payment.paid_at)
+        self._store[payment.receipt_id] = payment
+        on_settled()
+        return True
+
+    def get_by_receipts(self, receipt_ids: List[str]) -> Dict[str, Payment]:
+        return {receipt_id: self._store[receipt_id]
+                for receipt_id in receipt_ids if receipt_id in self._store}
+
+
+
+@dataclass
+class CatalogVersionInMemoryRepository(ICatalogVersionRepository):
+    _version: int = 0
+    # Latest change per entity, kept in version order
+    _changes: Dict[Tuple[ChangeKind, str, str], CatalogChange] = field(
+        default_factory=dict)
+
+    def get_version(self) -> int:
+        return self._version
+
+    def record_change(self, change: CatalogChange) -> int:
+        self._version += 1
+        key = (change.kind, change.entity_id, change.related_id)
+        # Re-inserted so the latest change moves to the end
+        self._changes.pop(key, None)
+        self._changes[key] = replace(change, version=self._version)
+        return self._version
+
+    def get_changes(self, since: int, until: int) -> List[CatalogChange]:
+        changes = []
+        for change in reversed(self._changes.values()):
+            if change.version <= since:
+                break
+            if change.version <= until:
+                changes.append(change)
+
+        changes.reverse()
+        return changes
+
+
+@dataclass
+class ReportInMemoryRepository(IReportRepository):
+    _store: Dict[str, ReportTotals] = field(default_factory=dict)
+
+    def add(self, scopes: List[str], totals: ReportTotals) -> None:
+        for scope in scopes:
+            self._store.setdefault(scope, ReportTotals()).merge(totals)
+
+    def get(self, scope: str, include_items: bool = True) -> ReportTotals:
+        totals = ReportTotals().merge(self._store.get(scope, ReportTotals()))
+        if not include_items:
+            totals.sold_count.clear()
+            totals.sold_amount.clear()
+        return totals
+
+    def replace(self, totals: Dict[str, ReportTotals]) -> None:
+        self._store = totals
+
+    def get_range(self, start_scope: str,
+                  end_scope: str) -> Dict[str, ReportTotals]:
+        return {scope: self.get(scope) for scope in sorted(self._store)
+                if start_scope <= scope <= end_scope}
+
+    def get_scopes(self) -> List[str]:
+        return list(self._store)
+
+
+
+@dataclass
+class ExportInMemoryRepository(IExportRepository):
+    receipts: ReceiptInMemoryRepository
+    payments: PaymentInMemoryRepository
+
+    def _iter_paid(self, export_filter: ExportFilter
+                   ) -> Iterator[Tuple[Receipt, Optional[Payment]]]:
+        for receipt in self.receipts.get_all():
+            if receipt.status:
+                continue
+            if (export_filter.shift_id is not None and
+                    receipt.shift_id != export_filter.shift_id):
+                continue
+            payment = self.payments.get_by_receipts([receipt.id]).get(
+                receipt.id)
+            paid_at = payment.paid_at if payment else None
+            if export_filter.start is not None and (
+                    paid_at is None or paid_at < export_filter.start):
+                continue
+            if export_filter.end is not None and (
+                    paid_at is None or paid_at >= export_filter.end):
+                continue
+            yield receipt, payment
+
+    def iter_receipts(self, export_filter: ExportFilter) -> Iterator[ReceiptRow]:
+        for receipt, payment in self._iter_paid(export_filter):
+            yield ReceiptRow(
+                id=receipt.id,
+                shift_id=receipt.shift_id,
+                total=receipt.total,
+                discount_total=receipt.discount_total,
+                currency=payment.currency if payment else None,
+                rate=payment.rate if payment else None,
+                converted_amount=payment.converted_amount if payment else None,
+                paid_at=payment.paid_at if payment else None)
+
+    def iter_sales_lines(self,
+                         export_filter: ExportFilter) -> Iterator[SalesLineRow]:
+        for receipt, payment in self._iter_paid(export_filter):
+            for item in cast(List[SoldItem], receipt.items):
+                yield SalesLineRow(
+                    receipt_id=receipt.id,
+                    shift_id=receipt.shift_id,
+                    item_id=item.id,
+                    item_type=type(item).__name__,
+                    quantity=item.quantity,
+                    price=item.price,
+                    total=item.total,
+                    discount_price=item.discount_price,
+                    discount_total=item.discount_total,
+                    currency=payment.currency if payment else None,
+                    paid_at=payment.paid_at if payment else None)
+
+
+
 @dataclass
 class InMemoryRepoFactory(RepoFactory):
     _products: ProductInMemoryRepository = field(
@@ -283,6 +571,24 @@ class InMemoryRepoFactory(RepoFactory):
         default_factory=BuyNGetNCampaignInMemoryRepository,
     )
 
+    _payments: PaymentInMemoryRepository = field(init=False)
+
+    _reports: ReportInMemoryRepository = field(
+        init=False,
+        default_factory=ReportInMemoryRepository,
+    )
+
+    _catalog_version: CatalogVersionInMemoryRepository = field(
+        init=False,
+        default_factory=CatalogVersionInMemoryRepository,
+    )
+
+    def __post_init__(self) -> None:
+        # Settling a payment closes the receipt it pays for, while its shift
+        # is open
+        self._payments = PaymentInMemoryRepository(receipts=self._receipts,
+                                                   shifts=self._shifts)
+
     def products(self) -> IProductRepository:
         return self._products
 
@@ -304,3 +610,19 @@ class InMemoryRepoFactory(RepoFactory):
     def buy_n_get_n_campaign(self) -> IBuyNGetNCampaignRepository:
         return self._buy_n_get_n_campaign
 
+    def payments(self) -> IPaymentRepository:
+        return self._payments
+
+    def reports(self) -> IReportRepository:
+        return self._reports
+
+    def report_engine(self) -> Optional[IReportEngine]:
+        return None
+
+    def exports(self) -> IExportRepository:
+        return ExportInMemoryRepository(receipts=self._receipts,
+                                        payments=self._payments)
+
+    def catalog_version(self) -> ICatalogVersionRepository:
+        return self._catalog_version
+
@@ -0,0 +1,99 @@
+import json
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+import httpx
+
+from app.core.exceptions.payment_exceptions import (
+    ExchangeRateUnavailableError,
+)
+from app.core.repositories.rate_provider import IRateProvider
+from app.infra.circuit_breaker import HALF_OPEN, CircuitBreaker
+
+BASE_URL = "https://economia.awesomeapi.com.br"
+
+
+@dataclass
+class HttpRateProvider(IRateProvider):
+    base_url: str = BASE_URL
+    limits: httpx.Limits = field(default_factory=lambda: httpx.Limits(
+        max_connections=20, max_keepalive_connections=10,
+        keepalive_expiry=30.0))
+    # Tight timeouts: a slow upstream must not hold checkout workers
+    timeout: httpx.Timeout = field(default_factory=lambda: httpx.Timeout(
+        2.0, connect=1.0))
+    breaker: CircuitBreaker = field(default_factory=CircuitBreaker)
+    client: Optional[httpx.AsyncClient] = field(default=None, init=False)
+
+    async def open(self) -> None:
+        if self.client is None:
+            self.client = httpx.AsyncClient(limits=self.limits,
+                                            timeout=self.timeout)
+
+    async def close(self) -> None:
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    async def get_rate(self, from_currency: str, to_currency: str) -> float:
+        # Fail fast while the breaker is open instead of queueing on a
+        # provider that is known to be down
+        if self.client is None or not self.breaker.allow():
+            raise ExchangeRateUnavailableError(from_currency=from_currency,
+                                               to_currency=to_currency)
+
+        trial = self.breaker.state == HALF_OPEN
+        url = f"{self.base_url}/json/last/{from_currency}-{to_currency}"
+        try:
+            response = await self.client.get(url)
+            response.raise_for_status()
+            data = response.json()
+            rate = float(data[f"{from_currency}{to_currency}"]["ask"])
+        except (httpx.HTTPError, KeyError, TypeError, ValueError):
+            self.breaker.record_failure()
+            raise ExchangeRateUnavailableError(from_currency=from_currency,
+                                               to_currency=to_currency)
+        finally:
+            # Cancellation records no outcome, which would leave the trial
+            # running and the breaker rejecting every later call
+            if trial:
+                self.breaker.release_trial()
+
+        self.breaker.record_success()
+        return rate
+
+
+@dataclass
+class FixedRateProvider(IRateProvider):
+    # Rates keyed by "FROM-TO", e.g. {"GEL-USD": 0.37}
+    rates: Dict[str, float]
+
+    @classmethod
+    def from_file(cls, path: str) -> 'FixedRateProvider':
+        with open(path) as rates_file:
+            rates = json.load(rates_file)
+        return cls(rates={pair: float(rate) for pair, rate in rates.items()})
+
+    async def open(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    async def get_rate(self, from_currency: str, to_currency: str) -> float:
+        rate = self.rates.get(f"{from_currency}-{to_currency}")
+        if rate is None:
+            raise ExchangeRateUnavailableError(from_currency=from_currency,
+                                               to_currency=to_currency)
+        return rate
+
+
+def create_rate_provider(rates_file: Optional[str] = None,
+                         max_connections: int = 20) -> IRateProvider:
+    # A rates file switches payments to fixed rates, e.g. offline perf boxes
+    if rates_file:
+        return FixedRateProvider.from_file(rates_file)
+    return HttpRateProvider(limits=httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections // 2,
+        keepalive_expiry=30.0))
@@ -0,0 +1,163 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from app.core.facade import POSCore
+from app.core.models.receipt import Receipt
+from app.core.models.report import ReportTotals
+from app.core.services.report_service import ReportService
+from app.infra.data.sqlite import (
+    PaymentSqliteRepository,
+    ReceiptSqliteRepository,
+    ReportSqliteRepository,
+    SharedConnection,
+    SqliteRepoFactory,
+    connect,
+)
+
+# Several partitions per worker keep the pool busy when shift sizes vary
+PARTITIONS_PER_WORKER = 4
+# Keeps the IN lists under SQLite's bound parameter limit
+SHIFTS_PER_QUERY = 500
+
+
+def _connect_read_only(database_path: str) -> SharedConnection:
+    uri = f"{Path(database_path).resolve().as_uri()}?mode=ro"
+    return connect(uri, uri=True)
+
+
+def aggregate_shifts(database_path: str,
+                     shift_ids: List[str]) -> Dict[str, ReportTotals]:
+    # Runs inside a worker process, on its own read-only connection
+    connection = _connect_read_only(database_path)
+    try:
+        receipts = ReceiptSqliteRepository(connection)
+        payments = PaymentSqliteRepository(connection)
+        report_service = ReportService(ReportSqliteRepository(connection))
+        totals: Dict[str, ReportTotals] = {}
+        # A few statements per chunk of shifts, not one per receipt
+        for start in range(0, len(shift_ids), SHIFTS_PER_QUERY):
+            chunk = shift_ids[start:start + SHIFTS_PER_QUERY]
+            by_shift: Dict[str, List[Receipt]] = {}
+            for receipt in receipts.get_paid_by_shifts(chunk):
+                by_shift.setdefault(receipt.shift_id, []).append(receipt)
+            if not by_shift:
+                continue
+            # Shift by shift, so items keep their first-sold order
+            merge_scopes(totals, report_service.aggregate(
+                receipts=[receipt for shift_id in chunk
+                          for receipt in by_shift.get(shift_id, [])],
+                payments=payments.get_paid_by_shifts(chunk)))
+
+        return totals
+    finally:
+        connection.close()
+
+
+def merge_scopes(target: Dict[str, ReportTotals],
+                 partial: Dict[str, ReportTotals]) -> Dict[str, ReportTotals]:
+    for scope, totals in partial.items():
+        target.setdefault(scope, ReportTotals()).merge(totals)
+    return target
+
+
+@dataclass
+class RecomputeResult:
+    shifts: int
+    totals: Dict[str, ReportTotals]
+
+
+@dataclass
+class ParallelReportRecompute:
+    database_path: str
+    workers: Optional[int] = None
+    progress: Optional[Callable[[int, int], None]] = None
+
+    def _get_shift_ids(self) -> List[str]:
+        connection = _connect_read_only(self.database_path)
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT id FROM shifts ORDER BY rowid")
+            return [row[0] for row in cursor.fetchall()]
+        finally:
+            connection.close()
+
+    def _partition(self, shift_ids: List[str],
+                   workers: int) -> List[List[str]]:
+        if not shift_ids:
+            return []
+        count = min(len(shift_ids), workers * PARTITIONS_PER_WORKER)
+        size = -(-len(shift_ids) // count)
+        return [shift_ids[start:start + size]
+                for start in range(0, len(shift_ids), size)]
+
+    def compute(self) -> RecomputeResult:
+        shift_ids = self._get_shift_ids()
+        workers = self.workers or os.cpu_count() or 1
+        partitions = self._partition(shift_ids, workers)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(aggregate_shifts, self.database_path,
+                                partition): index
+                for index, partition in enumerate(partitions)
+            }
+            partials: Dict[int, Dict[str, ReportTotals]] = {}
+            done = 0
+            for future in as_completed(futures):
+                index = futures[future]
+                partials[index] = future.result()
+                done += len(partitions[index])
+                if self.progress is not None:
+                    self.progress(done, len(shift_ids))
+
+        # Merging in partition order keeps items in first-sold order
+        totals: Dict[str, ReportTotals] = {}
+        for index in range(len(partitions)):
+            merge_scopes(totals, partials[index])
+
+        return RecomputeResult(shifts=len(shift_ids), totals=totals)
+
+    def rebuild(self) -> RecomputeResult:
+        result = self.compute()
+        # Stored through the same path as app.runner.backfill
+        connection = connect(self.database_path)
+        try:
+            core = POSCore.create(SqliteRepoFactory(connection=connection))
+            core.rebuild_reports(totals=result.totals)
+        finally:
+            connection.close()
+
+        return result
+
+    def audit(self) -> List[str]:
+        result = self.compute()
+        connection = _connect_read_only(self.database_path)
+        try:
+            reports = ReportSqliteRepository(connection)
+            # Stored scopes nothing backs any more are mismatches too
+            scopes = set(result.totals) | set(reports.get_scopes())
+            return [scope for scope in sorted(scopes)
+                    if not _same_totals(
+                        result.totals.get(scope, ReportTotals()),
+                        reports.get(scope))]
+        finally:
+            connection.close()
+
+
+def _same_totals(expected: ReportTotals, stored: ReportTotals) -> bool:
+    if expected.number_of_receipts != stored.number_of_receipts:
+        return False
+    if expected.sold_count != stored.sold_count:
+        return False
+    return (_same_amounts(expected.revenue, stored.revenue) and
+            _same_amounts(expected.sold_amount, stored.sold_amount))
+
+
+def _same_amounts(expected: Dict[str, float],
+                  stored: Dict[str, float]) -> bool:
+    keys = set(expected) | set(stored)
+    return all(round(expected.get(key, 0.0), 2) ==
+               round(stored.get(key, 0.0), 2)
+               for key in keys)
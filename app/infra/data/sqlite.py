@@ -1,25 +1,42 @@
 import json
 import sqlite3
+import threading
 import uuid
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Any, List, Optional
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
+from app.core.exceptions.shift_exceptions import (
+    GetShiftErrorMessage,
+    ShiftOpenedErrorMessage,
+)
 from app.core.factories.repo_factory import RepoFactory
 from app.core.models import ReceiptItem
 from app.core.models.campaign import (
     BuyNGetNCampaign,
+    Campaign,
     CampaignType,
     ComboCampaign,
     DiscountCampaign,
     ReceiptCampaign,
 )
-from app.core.models.product import Product
+from app.core.models.catalog import (
+    CatalogChange,
+    ChangeAction,
+    ChangeKind,
+)
+from app.core.models.export import ExportFilter, ReceiptRow, SalesLineRow
+from app.core.models.page import ProductQuery, prefix_upper_bound
+from app.core.models.payment import Payment
+from app.core.models.product import NumProduct, Product
 from app.core.models.receipt import (
     ComboForReceipt,
     GiftForReceipt,
     ProductForReceipt,
     Receipt,
 )
+from app.core.models.report import ReportTotals
 from app.core.models.shift import Shift
 from app.core.repositories.campaign_repository import (
     IBuyNGetNCampaignRepository,
@@ -27,15 +44,89 @@ from app.core.repositories.campaign_repository import (
     IProductDiscountCampaignRepository,
     IReceiptDiscountCampaignRepository,
 )
+from app.core.repositories.catalog_repository import (
+    ICatalogVersionRepository,
+)
+from app.core.repositories.export_repository import IExportRepository
+from app.core.repositories.payment_repository import IPaymentRepository
 from app.core.repositories.product_repository import IProductRepository
 from app.core.repositories.receipt_repesitory import IReceiptRepository
+from app.core.repositories.report_repository import (
+    IReportEngine,
+    IReportRepository,
+)
 from app.core.repositories.shift_repository import IShiftRepository
+from app.core.schemas.report_schema import ReportResponse
 from app.core.state.shift_state import ClosedShiftState, OpenShiftState
 
 
+class SharedConnection(sqlite3.Connection):
+    # One connection serves the request threadpool and the database executor,
+    # and every worker process opens its own. Transactions are begun only by
+    # transaction(), never implicitly by sqlite3, so writers take turns instead
+    # of committing or rolling back each other's statements
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.isolation_level = None
+        self._write_lock = threading.RLock()
+        self._depth = 0
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Cursor]:
+        # BEGIN IMMEDIATE takes the database write lock up front, so reads in
+        # the block see no write from another process until it ends. The
+        # RLock does the same for threads sharing this connection. Commits
+        # when the outermost block exits and rolls back on any exception;
+        # nested blocks join it
+        with self._write_lock:
+            self._depth += 1
+            try:
+                if self._depth > 1:
+                    yield self.cursor()
+                    return
+
+                # Called on the base class so tracing skips it, like commit()
+                sqlite3.Connection.execute(self, "BEGIN IMMEDIATE")
+                try:
+                    yield self.cursor()
+                except BaseException:
+                    self.rollback()
+                    raise
+                self.commit()
+            finally:
+                self._depth -= 1
+
+
+def connect(database: str, **kwargs: Any) -> SharedConnection:
+    return sqlite3.connect(database, factory=SharedConnection, **kwargs)
+
+
+def _format_timestamp(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _campaign_page(connection: sqlite3.Connection, table: str,
+                   after_id: Optional[str], limit: int) -> List[Campaign]:
+    # Listings only need the header, so combo and gift JSON is never decoded
+    if after_id is None:
+        cursor = connection.execute(
+            f"SELECT id, campaign_type FROM {table} ORDER BY id LIMIT ?",
+            (limit,))
+    else:
+        cursor = connection.execute(
+            f"SELECT id, campaign_type FROM {table} WHERE id > ? "
+            "ORDER BY id LIMIT ?", (after_id, limit))
+    return [Campaign(id=row[0], campaign_type=CampaignType(row[1]))
+            for row in cursor.fetchall()]
+
+
 @dataclass
 class SqliteRepoFactory(RepoFactory):
-    connection: sqlite3.Connection
+    connection: SharedConnection
 
     def __post_init__(self) -> None:
         self._initialize_db()
@@ -50,6 +141,10 @@ class SqliteRepoFactory(RepoFactory):
             ReceiptDiscountCampaignSqliteRepository(self.connection))
         self._buy_n_get_n_campaign =\
             BuyNGetNCampaignSqliteRepository(self.connection)
+        self._payments = PaymentSqliteRepository(self.connection)
+        self._reports = ReportSqliteRepository(self.connection)
+        self._catalog_version = CatalogVersionSqliteRepository(
+            self.connection)
 
     def _initialize_db(self) -> None:
         cursor = self.connection.cursor()
@@ -93,6 +188,52 @@ class SqliteRepoFactory(RepoFactory):
         )
         ''')
 
+        self._add_missing_column(cursor, "receipts", "opened_at TEXT")
+        self._add_missing_column(cursor, "receipts", "paid_at TEXT")
+
+        # Single-row counter shared by every worker on this database
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS catalog_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        )
+        ''')
+        cursor.execute(
+            "INSERT OR IGNORE INTO catalog_version (id, version) VALUES (1, 0)")
+
+        # Latest change per catalog entity, so a delta is bounded by what
+        # changed rather than by how often it changed
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS catalog_changes (
+            kind TEXT NOT NULL,
+            entity_id TEXT NOT NULL,
+            related_id TEXT NOT NULL,
+            action TEXT NOT NULL,
+            version INTEGER NOT NULL,
+            PRIMARY KEY (kind, entity_id, related_id)
+        )
+        ''')
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_catalog_changes_version
+        ON catalog_changes (version)
+        ''')
+
+        # Keyset pagination of the catalog by name
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_products_name ON products (name, id)
+        ''')
+
+        # Indexes used by receipt lookups and report aggregates
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_receipts_shift
+        ON receipts (shift_id, status)
+        ''')
+
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_receipt_items_receipt
+        ON receipt_items (receipt_id)
+        ''')
+
         # Create shifts table
         cursor.execute('''
         CREATE TABLE IF NOT EXISTS shifts (
@@ -100,6 +241,37 @@ class SqliteRepoFactory(RepoFactory):
             state TEXT NOT NULL
         )
         ''')
+        self._add_missing_column(cursor, "shifts", "opened_at TEXT")
+        self._add_missing_column(cursor, "shifts", "closed_at TEXT")
+
+        # Create payments table, one tender record per paid receipt
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS payments (
+            receipt_id TEXT PRIMARY KEY,
+            shift_id TEXT NOT NULL,
+            currency TEXT NOT NULL,
+            rate REAL NOT NULL,
+            amount REAL NOT NULL,
+            converted_amount REAL NOT NULL,
+            paid_at TEXT NOT NULL,
+            FOREIGN KEY (receipt_id) REFERENCES receipts (id)
+        )
+        ''')
+
+        # Date range exports filter on payment time
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_payments_paid_at
+        ON payments (paid_at)
+        ''')
+
+        # Create zreport_snapshots table, written once when a shift closes
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS zreport_snapshots (
+            shift_id TEXT PRIMARY KEY,
+            report TEXT NOT NULL,
+            FOREIGN KEY (shift_id) REFERENCES shifts (id)
+        )
+        ''')
 
         # Create discount_campaigns table
         cursor.execute('''
@@ -152,8 +324,44 @@ class SqliteRepoFactory(RepoFactory):
         )
         ''')
 
+        # Create running report aggregate tables, keyed by report scope
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS report_totals (
+            scope TEXT PRIMARY KEY,
+            number_of_receipts INTEGER NOT NULL
+        )
+        ''')
+
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS report_revenue (
+            scope TEXT NOT NULL,
+            currency TEXT NOT NULL,
+            amount REAL NOT NULL,
+            PRIMARY KEY (scope, currency)
+        )
+        ''')
+
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS report_items (
+            scope TEXT NOT NULL,
+            item_id TEXT NOT NULL,
+            quantity INTEGER NOT NULL,
+            PRIMARY KEY (scope, item_id)
+        )
+        ''')
+        self._add_missing_column(cursor, "report_items",
+                                 "amount REAL NOT NULL DEFAULT 0")
+
         self.connection.commit()
 
+    def _add_missing_column(self, cursor: sqlite3.Cursor,
+                            table: str, column: str) -> None:
+        # Columns added after a table shipped need ALTER on existing files
+        cursor.execute(f"PRAGMA table_info({table})")
+        existing = {row[1] for row in cursor.fetchall()}
+        if column.split()[0] not in existing:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column}")
+
     def products(self) -> IProductRepository:
         return ProductSqliteRepository(self.connection)
 
@@ -175,26 +383,79 @@ class SqliteRepoFactory(RepoFactory):
     def buy_n_get_n_campaign(self) -> IBuyNGetNCampaignRepository:
         return BuyNGetNCampaignSqliteRepository(self.connection)
 
+    def payments(self) -> IPaymentRepository:
+        return PaymentSqliteRepository(self.connection)
+
+    def reports(self) -> IReportRepository:
+        return ReportSqliteRepository(self.connection)
+
+    def report_engine(self) -> Optional[IReportEngine]:
+        return SqliteReportEngine(self.connection)
+
+    def exports(self) -> IExportRepository:
+        return ExportSqliteRepository(self.connection)
+
+    def catalog_version(self) -> ICatalogVersionRepository:
+        return self._catalog_version
+
+
+@dataclass
+class CatalogVersionSqliteRepository(ICatalogVersionRepository):
+    connection: SharedConnection
+
+    def get_version(self) -> int:
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT version FROM catalog_version WHERE id = 1")
+        return int(cursor.fetchone()[0])
+
+    def record_change(self, change: CatalogChange) -> int:
+        with self.connection.transaction() as cursor:
+            cursor.execute("UPDATE catalog_version SET version = version + 1 "
+                           "WHERE id = 1")
+            cursor.execute("SELECT version FROM catalog_version WHERE id = 1")
+            version = int(cursor.fetchone()[0])
+            # Compacted on write: an entity keeps only its latest change
+            cursor.execute(
+                "INSERT INTO catalog_changes "
+                "(kind, entity_id, related_id, action, version) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (kind, entity_id, related_id) DO UPDATE SET "
+                "action = excluded.action, version = excluded.version",
+                (change.kind.value, change.entity_id, change.related_id,
+                 change.action.value, version)
+            )
+        return version
+
+    def get_changes(self, since: int, until: int) -> List[CatalogChange]:
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT kind, entity_id, related_id, action, version "
+                       "FROM catalog_changes "
+                       "WHERE version > ? AND version <= ? ORDER BY version",
+                       (since, until))
+        return [CatalogChange(kind=ChangeKind(row[0]), entity_id=row[1],
+                              related_id=row[2], action=ChangeAction(row[3]),
+                              version=row[4])
+                for row in cursor.fetchall()]
+
 
 @dataclass
 class ProductSqliteRepository(IProductRepository):
-    connection: sqlite3.Connection
+    connection: SharedConnection
 
     def create(self, product: Product) -> Product:
         product_id = str(uuid.uuid4())
         setattr(product, "id", product_id)
 
-        cursor = self.connection.cursor()
-        cursor.execute(
-            "INSERT INTO products (id, name, barcode, price, discount) "
-            "VALUES (?, ?, ?, ?, ?)",
-            (product.id,
-             product.name,
-             product.barcode,
-             product.price,
-             product.discount)
-        )
-        self.connection.commit()
+        with self.connection.transaction() as cursor:
+            cursor.execute(
+                "INSERT INTO products (id, name, barcode, price, discount) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (product.id,
+                 product.name,
+                 product.barcode,
+                 product.price,
+                 product.discount)
+            )
 
         return product
 
@@ -236,11 +497,59 @@ class ProductSqliteRepository(IProductRepository):
             )
         return products
 
-    def update(self, product_id: str, price: float) -> None:
+    def get_many(self, product_ids: List[str]) -> List[Product]:
+        products: List[Product] = []
         cursor = self.connection.cursor()
-        cursor.execute("UPDATE products SET price = ? WHERE id = ?",
-                       (price, product_id))
-        self.connection.commit()
+        # Chunked to stay under SQLite's bound parameter limit
+        for start in range(0, len(product_ids), 500):
+            chunk = product_ids[start:start + 500]
+            cursor.execute("SELECT id, name, barcode, price, discount "
+                           "FROM products WHERE id IN "
+                           f"({', '.join('?' * len(chunk))})", chunk)
+            products.extend(Product(id=row[0], name=row[1], barcode=row[2],
+                                    price=row[3], discount=row[4])
+                            for row in cursor.fetchall())
+        return products
+
+    def get_page(self, query: ProductQuery, after: Optional[List[str]],
+                 limit: int) -> List[Product]:
+        key = "name, id" if query.order_by == "name" else "id"
+        conditions = []
+        parameters: List[Any] = []
+        if after is not None:
+            placeholders = ", ".join("?" * len(after))
+            conditions.append(f"({key}) > ({placeholders})")
+            parameters.extend(after)
+        if query.name_prefix is not None:
+            conditions.append("name >= ? AND name < ?")
+            parameters.extend([query.name_prefix,
+                               prefix_upper_bound(query.name_prefix)])
+        if query.min_price is not None:
+            conditions.append("price >= ?")
+            parameters.append(query.min_price)
+        if query.max_price is not None:
+            conditions.append("price <= ?")
+            parameters.append(query.max_price)
+
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT id, name, barcode, price, discount "
+                       f"FROM products {where}ORDER BY {key} LIMIT ?",
+                       (*parameters, limit))
+        return [Product(id=row[0], name=row[1], barcode=row[2],
+                        price=row[3], discount=row[4])
+                for row in cursor.fetchall()]
+
+    def get_ids(self, after: Optional[str], limit: int) -> List[str]:
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT id FROM products WHERE id > ? "
+                       "ORDER BY id LIMIT ?", (after or "", limit))
+        return [row[0] for row in cursor.fetchall()]
+
+    def update(self, product_id: str, price: float) -> None:
+        with self.connection.transaction() as cursor:
+            cursor.execute("UPDATE products SET price = ? WHERE id = ?",
+                           (price, product_id))
 
     def has_barcode(self, barcode: str) -> bool:
         cursor = self.connection.cursor()
@@ -252,52 +561,49 @@ class ProductSqliteRepository(IProductRepository):
 
 @dataclass
 class ReceiptSqliteRepository(IReceiptRepository):
-    connection: sqlite3.Connection
+    connection: SharedConnection
 
     def create(self, receipt: Receipt) -> Receipt:
         receipt_id = str(uuid.uuid4())
         setattr(receipt, "id", receipt_id)
 
-        cursor = self.connection.cursor()
-        cursor.execute(
-            "INSERT INTO receipts (id,"
-            " shift_id,"
-            " total, "
-            "discount_total,"
-            " status) VALUES (?, ?, ?, ?, ?)",
-            (receipt.id,
-             receipt.shift_id,
-             receipt.total,
-             receipt.discount_total,
-             receipt.status)
-        )
-
-        # Save all items in the receipt
-        for item in receipt.items:
-            self._save_receipt_item(cursor, receipt.id, item)
+        with self.connection.transaction() as cursor:
+            cursor.execute(
+                "INSERT INTO receipts (id,"
+                " shift_id,"
+                " total, "
+                "discount_total,"
+                " status,"
+                " opened_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (receipt.id,
+                 receipt.shift_id,
+                 receipt.total,
+                 receipt.discount_total,
+                 receipt.status,
+                 _format_timestamp(receipt.opened_at))
+            )
 
-        self.connection.commit()
+            # Save all items in the receipt
+            for item in receipt.items:
+                self._save_receipt_item(cursor, receipt.id, item)
         return receipt
 
     def add_product(self, receipt: Receipt) -> Receipt:
-        cursor = self.connection.cursor()
-
-        # Update the receipt record
-        cursor.execute(
-            "UPDATE receipts SET total = ?, "
-            "discount_total = ? WHERE id = ?",
-            (receipt.total, receipt.discount_total, receipt.id)
-        )
-
-        # Delete all existing items for this receipt
-        cursor.execute("DELETE FROM receipt_items WHERE receipt_id = ?",
-                       (receipt.id,))
+        with self.connection.transaction() as cursor:
+            # Update the receipt record
+            cursor.execute(
+                "UPDATE receipts SET total = ?, "
+                "discount_total = ? WHERE id = ?",
+                (receipt.total, receipt.discount_total, receipt.id)
+            )
 
-        # Save all items in the receipt (including the new one)
-        for item in receipt.items:
-            self._save_receipt_item(cursor, receipt.id, item)
+            # Delete all existing items for this receipt
+            cursor.execute("DELETE FROM receipt_items WHERE receipt_id = ?",
+                           (receipt.id,))
 
-        self.connection.commit()
+            # Save all items in the receipt (including the new one)
+            for item in receipt.items:
+                self._save_receipt_item(cursor, receipt.id, item)
         return receipt
 
     def _save_receipt_item(self, cursor: sqlite3.Cursor,
@@ -466,8 +772,8 @@ class ReceiptSqliteRepository(IReceiptRepository):
     def get_one(self, receipt_id: str) -> Optional[Receipt]:
         cursor = self.connection.cursor()
         cursor.execute(
-            "SELECT id, shift_id, total, discount_total, status "
-            "FROM receipts WHERE id = ?",
+            "SELECT id, shift_id, total, discount_total, status, "
+            "opened_at, paid_at FROM receipts WHERE id = ?",
             (receipt_id,)
         )
 
@@ -503,73 +809,84 @@ class ReceiptSqliteRepository(IReceiptRepository):
             items=items,
             total=receipt_row[2],
             discount_total=receipt_row[3],
-            status=bool(receipt_row[4])
+            status=bool(receipt_row[4]),
+            opened_at=_parse_timestamp(receipt_row[5]),
+            paid_at=_parse_timestamp(receipt_row[6])
         )
 
     def get_all(self) -> List[Receipt]:
-        cursor = self.connection.cursor()
-        cursor.execute("SELECT id, shift_id, total, discount_total, status"
-                       " FROM receipts")
+        return self._get_where("", [])
 
-        receipts = []
-        for receipt_row in cursor.fetchall():
-            receipt_id = receipt_row[0]
+    def get_paid_by_shifts(self, shift_ids: List[str]) -> List[Receipt]:
+        placeholders = ", ".join("?" for _ in shift_ids)
+        return self._get_where(
+            f"WHERE shift_id IN ({placeholders}) AND status = 0", shift_ids)
 
-            # Get all items for this receipt
-            cursor.execute(
-                """
-                SELECT item_id, 
-                receipt_id,
-                 item_type,
-                  quantity, 
-                  price,
-                   total,
-                   discount_price,
-                    discount_total,
-                     item_data 
-                FROM receipt_items 
-                WHERE receipt_id = ?
-                """,
-                (receipt_id,)
-            )
+    def _get_where(self, where: str, params: List[str]) -> List[Receipt]:
+        cursor = self.connection.cursor()
+        # Two statements however many receipts there are
+        items_where = (f"WHERE receipt_id IN (SELECT id FROM receipts {where})"
+                       if where else "")
+        cursor.execute(
+            f"""
+            SELECT item_id,
+             receipt_id,
+             item_type,
+             quantity,
+             price,
+             total,
+             discount_price,
+             discount_total,
+             item_data
+            FROM receipt_items {items_where}
+            ORDER BY rowid
+            """,
+            params
+        )
 
-            items = []
-            for item_row in cursor.fetchall():
-                items.append(self._deserialize_receipt_item(item_row))
+        items: Dict[str, List[ReceiptItem]] = {}
+        for item_row in cursor.fetchall():
+            items.setdefault(item_row[1], []).append(
+                self._deserialize_receipt_item(item_row))
 
+        cursor.execute("SELECT id, shift_id, total, discount_total, status,"
+                       f" opened_at, paid_at FROM receipts {where}"
+                       " ORDER BY rowid", params)
+
+        receipts = []
+        for receipt_row in cursor.fetchall():
             receipts.append(
                 Receipt(
-                    id=receipt_id,
+                    id=receipt_row[0],
                     shift_id=receipt_row[1],
-                    items=items,
+                    items=items.get(receipt_row[0], []),
                     total=receipt_row[2],
                     discount_total=receipt_row[3],
-                    status=bool(receipt_row[4])
+                    status=bool(receipt_row[4]),
+                    opened_at=_parse_timestamp(receipt_row[5]),
+                    paid_at=_parse_timestamp(receipt_row[6])
                 )
             )
 
         return receipts
 
-    def update(self, receipt_id: str, status: bool) -> None:
-        cursor = self.connection.cursor()
-        cursor.execute(
-            "UPDATE receipts SET status = ? WHERE id = ?",
-            (status, receipt_id)
-        )
-        self.connection.commit()
+    def update(self, receipt_id: str, status: bool,
+               paid_at: Optional[datetime] = None) -> None:
+        with self.connection.transaction() as cursor:
+            cursor.execute(
+                "UPDATE receipts SET status = ?, paid_at = ? WHERE id = ?",
+                (status, _format_timestamp(paid_at), receipt_id)
+            )
 
     def delete(self, receipt_id: str) -> None:
-        cursor = self.connection.cursor()
+        with self.connection.transaction() as cursor:
+            # First delete all items related to this receipt
+            cursor.execute("DELETE FROM receipt_items "
+                           "WHERE receipt_id = ?", (receipt_id,))
 
-        # First delete all items related to this receipt
-        cursor.execute("DELETE FROM receipt_items "
-                       "WHERE receipt_id = ?", (receipt_id,))
-
-        # Then delete the receipt itself
-        cursor.execute("DELETE FROM receipts WHERE id = ?",
-                       (receipt_id,))
-
-        self.connection.commit()
+            # Then delete the receipt itself
+            cursor.execute("DELETE FROM receipts WHERE id = ?",
+                           (receipt_id,))
 
     def delete_item(self, receipt: Receipt) -> None:
         self.add_product(receipt)
@@ -577,45 +894,46 @@ class ReceiptSqliteRepository(IReceiptRepository):
 
 @dataclass
 class ShiftSqliteRepository(IShiftRepository):
-    connection: sqlite3.Connection
+    connection: SharedConnection
 
     def create(self, shift: Shift) -> Shift:
         shift_id = str(uuid.uuid4())
         setattr(shift, "id", shift_id)
 
-        cursor = self.connection.cursor()
-
-        # Convert state to string representation
-        state_str = "open" if isinstance(shift.state, OpenShiftState) else "closed"
-
-        cursor.execute(
-            "INSERT INTO shifts (id, state) VALUES (?, ?)",
-            (shift.id, state_str)
-        )
-
-        # Save all receipts in the shift (initially empty for a new shift)
-        for receipt in shift.receipts:
-            # Update the shift_id for the receipt
-            receipt.shift_id = shift.id
+        with self.connection.transaction() as cursor:
+            # Convert state to string representation
+            state_str = "open" if isinstance(shift.state, OpenShiftState) else "closed"
 
-            # Use the receipt repository to save the receipt
             cursor.execute(
-                "UPDATE receipts SET shift_id = ? WHERE id = ?",
-                (shift.id, receipt.id)
+                "INSERT INTO shifts (id, state, opened_at) VALUES (?, ?, ?)",
+                (shift.id, state_str, _format_timestamp(shift.opened_at))
             )
 
-        self.connection.commit()
+            # Save all receipts in the shift (initially empty for a new shift)
+            for receipt in shift.receipts:
+                # Update the shift_id for the receipt
+                receipt.shift_id = shift.id
+
+                # Use the receipt repository to save the receipt
+                cursor.execute(
+                    "UPDATE receipts SET shift_id = ? WHERE id = ?",
+                    (shift.id, receipt.id)
+                )
         return shift
 
-    def get_one(self, shift_id: str) -> Optional[Shift]:
+    def get_one(self, shift_id: str,
+                include_receipts: bool = True) -> Optional[Shift]:
         cursor = self.connection.cursor()
-        cursor.execute("SELECT id, state FROM shifts WHERE id = ?",
-                       (shift_id,))
+        cursor.execute("SELECT id, state, opened_at, closed_at "
+                       "FROM shifts WHERE id = ?", (shift_id,))
 
         shift_row = cursor.fetchone()
         if not shift_row:
             return None
 
+        if not include_receipts:
+            return self._make_shift(shift_row, receipts=[])
+
         # Get all receipts for this shift
         cursor.execute("SELECT id FROM receipts WHERE shift_id = ?",
                        (shift_id,))
@@ -632,131 +950,154 @@ class ShiftSqliteRepository(IShiftRepository):
                     if not receipt.status:
                         receipts.append(receipt)
 
-        # Create the shift state
-        state_str = shift_row[1]
-        state = OpenShiftState() if state_str == "open" else ClosedShiftState()
-
-        return Shift(
-            id=shift_row[0],
-            receipts=receipts,
-            state=state
-        )
+        return self._make_shift(shift_row, receipts)
 
     def add_receipt(self, shift: Shift) -> Shift:
-        cursor = self.connection.cursor()
+        with self.connection.transaction() as cursor:
+            # Update the state of the shift
+            state_str = "open" if isinstance(shift.state, OpenShiftState) else "closed"
+            cursor.execute(
+                "UPDATE shifts SET state = ? WHERE id = ?",
+                (state_str, shift.id)
+            )
 
-        # Update the state of the shift
-        state_str = "open" if isinstance(shift.state, OpenShiftState) else "closed"
-        cursor.execute(
-            "UPDATE shifts SET state = ? WHERE id = ?",
-            (state_str, shift.id)
-        )
+            # For each receipt, ensure it's properly linked to this shift
+            for receipt in shift.receipts:
+                cursor.execute(
+                    "UPDATE receipts SET shift_id = ? WHERE id = ?",
+                    (shift.id, receipt.id)
+                )
+        return shift
 
-        # For each receipt, ensure it's properly linked to this shift
-        for receipt in shift.receipts:
+    def attach_receipt(self, shift_id: str, receipt: Receipt) -> None:
+        with self.connection.transaction() as cursor:
             cursor.execute(
                 "UPDATE receipts SET shift_id = ? WHERE id = ?",
-                (shift.id, receipt.id)
+                (shift_id, receipt.id)
             )
 
-        self.connection.commit()
-        return shift
+    def _make_shift(self, shift_row: Tuple[Any, ...],
+                    receipts: List[Receipt]) -> Shift:
+        state = OpenShiftState() if shift_row[1] == "open" else ClosedShiftState()
+        return Shift(
+            id=shift_row[0],
+            receipts=receipts,
+            state=state,
+            opened_at=_parse_timestamp(shift_row[2]),
+            closed_at=_parse_timestamp(shift_row[3])
+        )
 
     def get_all(self) -> List[Shift]:
         cursor = self.connection.cursor()
-        cursor.execute("SELECT id, state FROM shifts")
-
-        shifts = []
-        receipt_repo = ReceiptSqliteRepository(self.connection)
-
-        for shift_row in cursor.fetchall():
-            shift_id = shift_row[0]
-
-            # Get all receipts for this shift
-            cursor.execute("SELECT id FROM receipts WHERE shift_id = ?",
-                           (shift_id,))
-
-            receipt_ids = [row[0] for row in cursor.fetchall()]
-            receipts = []
-
-            # For each receipt, get the full receipt object
-            for receipt_id in receipt_ids:
-                receipt = receipt_repo.get_one(receipt_id)
-                if receipt:
-                    if not receipt.status:
-                        receipts.append(receipt)
-
-            # Create the shift state
-            state_str = shift_row[1]
-            state = OpenShiftState() if state_str == "open" else ClosedShiftState()
-
-            shifts.append(
-                Shift(
-                    id=shift_id,
-                    receipts=receipts,
-                    state=state
-                )
+        cursor.execute("SELECT id, state, opened_at, closed_at FROM shifts")
+        shift_rows = cursor.fetchall()
+
+        # Receipts are loaded in one pass, not one query per shift and receipt
+        receipts: Dict[str, List[Receipt]] = {}
+        for receipt in ReceiptSqliteRepository(self.connection).get_all():
+            if not receipt.status:
+                receipts.setdefault(receipt.shift_id, []).append(receipt)
+
+        return [self._make_shift(shift_row,
+                                 receipts=receipts.get(shift_row[0], []))
+                for shift_row in shift_rows]
+
+    def update(self, shift_id: str, status: bool,
+               make_report: Optional[Callable[[], ReportResponse]] = None,
+               closed_at: Optional[datetime] = None) -> None:
+        with self.connection.transaction() as cursor:
+            state_str = "open" if status else "closed"
+            cursor.execute(
+                "UPDATE shifts SET state = ?, closed_at = ? WHERE id = ?",
+                (state_str, _format_timestamp(closed_at), shift_id)
             )
 
-        return shifts
+            # Built after the state change and committed with it; the write
+            # lock keeps payments out until both are stored
+            if make_report is not None:
+                cursor.execute(
+                    "INSERT OR REPLACE INTO zreport_snapshots (shift_id, report) "
+                    "VALUES (?, ?)",
+                    (shift_id, self._serialize_report(make_report()))
+                )
 
-    def update(self, shift_id: str, status: bool) -> None:
+    def get_reports(self,
+                    shift_ids: List[str]) -> Dict[str, ReportResponse]:
+        placeholders = ", ".join("?" for _ in shift_ids)
         cursor = self.connection.cursor()
-        state_str = "open" if status else "closed"
         cursor.execute(
-            "UPDATE shifts SET state = ? WHERE id = ?",
-            (state_str, shift_id)
+            "SELECT shift_id, report FROM zreport_snapshots "
+            f"WHERE shift_id IN ({placeholders})",
+            shift_ids
         )
-        self.connection.commit()
-
-    def delete(self, shift_id: str) -> None:
-        cursor = self.connection.cursor()
+        return {shift_id: self._deserialize_report(report)
+                for shift_id, report in cursor.fetchall()}
+
+    def _serialize_report(self, report: ReportResponse) -> str:
+        return json.dumps({
+            "number_of_receipts": report.number_of_receipts,
+            "revenue": report.revenue,
+            "sold_product_count": [
+                [product.product_id, product.num]
+                for product in report.sold_product_count
+            ]
+        })
 
-        # First, get all receipts for this shift
-        cursor.execute("SELECT id FROM receipts WHERE shift_id = ?",
-                       (shift_id,))
-        receipt_ids = [row[0] for row in cursor.fetchall()]
+    def _deserialize_report(self, report_str: str) -> ReportResponse:
+        report_data = json.loads(report_str)
+        return ReportResponse(
+            number_of_receipts=report_data["number_of_receipts"],
+            revenue=report_data["revenue"],
+            sold_product_count=[
+                NumProduct(product_id=product_id, num=num)
+                for product_id, num in report_data["sold_product_count"]
+            ]
+        )
 
-        # Delete all receipt_items for these receipts
-        for receipt_id in receipt_ids:
-            cursor.execute("DELETE FROM receipt_items WHERE receipt_id = ?",
-                           (receipt_id,))
+    def delete(self, shift_id: str) -> None:
+        with self.connection.transaction() as cursor:
+            # First, get all receipts for this shift
+            cursor.execute("SELECT id FROM receipts WHERE shift_id = ?",
+                           (shift_id,))
+            receipt_ids = [row[0] for row in cursor.fetchall()]
 
-        # Delete all receipts for this shift
-        cursor.execute("DELETE FROM receipts WHERE shift_id = ?",
-                       (shift_id,))
+            # Delete all receipt_items for these receipts
+            for receipt_id in receipt_ids:
+                cursor.execute("DELETE FROM receipt_items WHERE receipt_id = ?",
+                               (receipt_id,))
 
-        # Then delete the shift itself
-        cursor.execute("DELETE FROM shifts WHERE id = ?",
-                       (shift_id,))
+            # Delete all receipts for this shift
+            cursor.execute("DELETE FROM receipts WHERE shift_id = ?",
+                           (shift_id,))
 
-        self.connection.commit()
+            # Then delete the shift itself
+            cursor.execute("DELETE FROM shifts WHERE id = ?",
+                           (shift_id,))
 
 
 class ProductDiscountCampaignSqliteRepository(
     IProductDiscountCampaignRepository):
-    def __init__(self, connection: sqlite3.Connection):
+    def __init__(self, connection: SharedConnection):
         self.connection = connection
 
     def create(self,
     discount_campaign: DiscountCampaign) -> DiscountCampaign:
         campaign_id = str(uuid.uuid4())
         discount_campaign.id = campaign_id
-        self.connection.execute(
-            "INSERT INTO discount_campaigns (id, campaign_type, discount)"
-            " VALUES (?, ?, ?)",
-            (campaign_id, discount_campaign.campaign_type.value,
-             discount_campaign.discount)
-        )
-        self.connection.commit()
-        for product_id in discount_campaign.products:
-            self.connection.execute(
-                "INSERT INTO discount_campaign_products (campaign_id,"
-                " product_id)"
-                " VALUES (?, ?)",
-                (campaign_id, product_id)
+        with self.connection.transaction() as cursor:
+            cursor.execute(
+                "INSERT INTO discount_campaigns (id, campaign_type, discount)"
+                " VALUES (?, ?, ?)",
+                (campaign_id, discount_campaign.campaign_type.value,
+                 discount_campaign.discount)
             )
-        self.connection.commit()
+            for product_id in discount_campaign.products:
+                cursor.execute(
+                    "INSERT INTO discount_campaign_products (campaign_id,"
+                    " product_id)"
+                    " VALUES (?, ?)",
+                    (campaign_id, product_id)
+                )
         return discount_campaign
 
     def get_one_campaign(self, campaign_id: str) -> Optional[DiscountCampaign]:
@@ -780,6 +1121,11 @@ class ProductDiscountCampaignSqliteRepository(
 
         return None
 
+    def get_page(self, after_id: Optional[str],
+                 limit: int) -> List[Campaign]:
+        return _campaign_page(self.connection, "discount_campaigns",
+                              after_id, limit)
+
     def get_all(self) -> List[DiscountCampaign]:
         cursor = self.connection.execute("SELECT id, campaign_type, "
                                          "discount FROM discount_campaigns")
@@ -800,27 +1146,26 @@ class ProductDiscountCampaignSqliteRepository(
 
     def add_product(self, product_id: str,
                     campaign_id: str) -> Optional[DiscountCampaign]:
-        self.connection.execute(
-            "INSERT INTO discount_campaign_products "
-            "(campaign_id, product_id) VALUES (?, ?)",
-            (campaign_id, product_id)
-        )
-        self.connection.commit()
+        with self.connection.transaction() as cursor:
+            cursor.execute(
+                "INSERT INTO discount_campaign_products "
+                "(campaign_id, product_id) VALUES (?, ?)",
+                (campaign_id, product_id)
+            )
         return self.get_one_campaign(campaign_id)
 
     def delete_product(self, product_id: str, campaign_id: str) -> None:
-        self.connection.execute(
-            "DELETE FROM discount_campaign_products"
-            " WHERE campaign_id = ? AND product_id = ?",
-            (campaign_id, product_id)
-        )
-        self.connection.commit()
+        with self.connection.transaction() as cursor:
+            cursor.execute(
+                "DELETE FROM discount_campaign_products"
+                " WHERE campaign_id = ? AND product_id = ?",
+                (campaign_id, product_id)
+            )
 
     def delete_campaign(self, campaign_id: str) -> None:
-        self.connection.execute("DELETE FROM discount_campaigns"
-                                " WHERE id = ?",
-                                (campaign_id,))
-        self.connection.commit()
+        with self.connection.transaction() as cursor:
+            cursor.execute("DELETE FROM discount_campaigns WHERE id = ?",
+                           (campaign_id,))
 
     def get_campaign_with_product(self, product_id: str) -> Optional[DiscountCampaign]:
         cursor = self.connection.execute(
@@ -848,7 +1193,7 @@ class ProductDiscountCampaignSqliteRepository(
         return None
 
 class ComboCampaignSqliteRepository(IComboCampaignRepository):
-    def __init__(self, connection: sqlite3.Connection):
+    def __init__(self, connection: SharedConnection):
         self.connection = connection
 
     def create(self, combo_campaign: ComboCampaign) -> ComboCampaign:
@@ -865,18 +1210,23 @@ class ComboCampaignSqliteRepository(IComboCampaignRepository):
             "discount_total": p.discount_total
         } for p in combo_campaign.products])
 
-        self.connection.execute(
-            "INSERT INTO combo_campaigns"
-            " (id, campaign_type, discount, products) "
-            "VALUES (?, ?, ?, ?)",
-            (campaign_id,
-             combo_campaign.campaign_type.value,
-             combo_campaign.discount,
-             products_data)
-        )
-        self.connection.commit()
+        with self.connection.transaction() as cursor:
+            cursor.execute(
+                "INSERT INTO combo_campaigns"
+                " (id, campaign_type, discount, products) "
+                "VALUES (?, ?, ?, ?)",
+                (campaign_id,
+                 combo_campaign.campaign_type.value,
+                 combo_campaign.discount,
+                 products_data)
+            )
         return combo_campaign
 
+    def get_page(self, after_id: Optional[str],
+                 limit: int) -> List[Campaign]:
+        return _campaign_page(self.connection, "combo_campaigns",
+                              after_id, limit)
+
     def get_all(self) -> List[ComboCampaign]:
         cursor = self.connection.execute("SELECT id, "
                                          "campaign_type,"
@@ -942,39 +1292,41 @@ class ComboCampaignSqliteRepository(IComboCampaignRepository):
 
     def add_product(self, product: ProductForReceipt,
                     campaign_id: str) -> Optional[ComboCampaign]:
-        # Get current campaign
-        campaign = self.get_one_campaign(campaign_id)
-        if not campaign:
-            return None
-
-        # Add product to the list
-        campaign.products.append(product)
-
-        # Update products JSON in database
-        products_data = json.dumps([{
-            "id": p.id,
-            "quantity": p.quantity,
-            "price": p.price,
-            "total": p.total,
-            "discount_price": p.discount_price,
-            "discount_total": p.discount_total
-        } for p in campaign.products])
+        # Read and rewrite in one IMMEDIATE transaction, so concurrent adds
+        # are not lost, from this process or any other worker
+        with self.connection.transaction() as cursor:
+            # Get current campaign
+            campaign = self.get_one_campaign(campaign_id)
+            if not campaign:
+                return None
+
+            # Add product to the list
+            campaign.products.append(product)
+
+            # Update products JSON in database
+            products_data = json.dumps([{
+                "id": p.id,
+                "quantity": p.quantity,
+                "price": p.price,
+                "total": p.total,
+                "discount_price": p.discount_price,
+                "discount_total": p.discount_total
+            } for p in campaign.products])
 
-        self.connection.execute(
-            "UPDATE combo_campaigns SET products = ? WHERE id = ?",
-            (products_data, campaign_id)
-        )
-        self.connection.commit()
+            cursor.execute(
+                "UPDATE combo_campaigns SET products = ? WHERE id = ?",
+                (products_data, campaign_id)
+            )
         return campaign
 
     def delete_campaign(self, campaign_id: str) -> None:
-        self.connection.execute("DELETE FROM combo_campaigns WHERE id = ?",
-                                (campaign_id,))
-        self.connection.commit()
+        with self.connection.transaction() as cursor:
+            cursor.execute("DELETE FROM combo_campaigns WHERE id = ?",
+                           (campaign_id,))
 
 
 class BuyNGetNCampaignSqliteRepository(IBuyNGetNCampaignRepository):
-    def __init__(self, connection: sqlite3.Connection):
+    def __init__(self, connection: SharedConnection):
         self.connection = connection
 
     def create(self, buy_n_get_n_campaign: BuyNGetNCampaign) -> BuyNGetNCampaign:
@@ -1000,18 +1352,23 @@ class BuyNGetNCampaignSqliteRepository(IBuyNGetNCampaignRepository):
             "discount_total": buy_n_get_n_campaign.gift_product.discount_total
         })
 
-        self.connection.execute(
-            "INSERT INTO buy_n_get_n_campaigns "
-            "(id, campaign_type, buy_product, gift_product) "
-            "VALUES (?, ?, ?, ?)",
-            (campaign_id,
-             buy_n_get_n_campaign.campaign_type.value,
-             buy_product_data,
-             gift_product_data)
-        )
-        self.connection.commit()
+        with self.connection.transaction() as cursor:
+            cursor.execute(
+                "INSERT INTO buy_n_get_n_campaigns "
+                "(id, campaign_type, buy_product, gift_product) "
+                "VALUES (?, ?, ?, ?)",
+                (campaign_id,
+                 buy_n_get_n_campaign.campaign_type.value,
+                 buy_product_data,
+                 gift_product_data)
+            )
         return buy_n_get_n_campaign
 
+    def get_page(self, after_id: Optional[str],
+                 limit: int) -> List[Campaign]:
+        return _campaign_page(self.connection, "buy_n_get_n_campaigns",
+                              after_id, limit)
+
     def get_all(self) -> List[BuyNGetNCampaign]:
         cursor = self.connection.execute(
             "SELECT id, campaign_type, buy_product, gift_product "
@@ -1093,29 +1450,28 @@ class BuyNGetNCampaignSqliteRepository(IBuyNGetNCampaignRepository):
         return None
 
     def delete_campaign(self, campaign_id: str) -> None:
-        self.connection.execute("DELETE FROM buy_n_get_n_campaigns "
-                                "WHERE id = ?",
-                                (campaign_id,))
-        self.connection.commit()
+        with self.connection.transaction() as cursor:
+            cursor.execute("DELETE FROM buy_n_get_n_campaigns WHERE id = ?",
+                           (campaign_id,))
 
 
 class ReceiptDiscountCampaignSqliteRepository(
     IReceiptDiscountCampaignRepository):
-    def __init__(self, connection: sqlite3.Connection):
+    def __init__(self, connection: SharedConnection):
         self.connection = connection
 
     def create(self, receipt_campaign: ReceiptCampaign) -> ReceiptCampaign:
         campaign_id = str(uuid.uuid4())
         receipt_campaign.id = campaign_id
-        self.connection.execute(
-            "INSERT INTO receipt_discount_campaigns"
-            " (id, campaign_type, total, discount) VALUES (?, ?, ?, ?)",
-            (campaign_id,
-             receipt_campaign.campaign_type.value,
-             receipt_campaign.total,
-             receipt_campaign.discount)
-        )
-        self.connection.commit()
+        with self.connection.transaction() as cursor:
+            cursor.execute(
+                "INSERT INTO receipt_discount_campaigns"
+                " (id, campaign_type, total, discount) VALUES (?, ?, ?, ?)",
+                (campaign_id,
+                 receipt_campaign.campaign_type.value,
+                 receipt_campaign.total,
+                 receipt_campaign.discount)
+            )
         return receipt_campaign
 
     def get_one_campaign(self, campaign_id: str) -> Optional[ReceiptCampaign]:
@@ -1137,6 +1493,11 @@ class ReceiptDiscountCampaignSqliteRepository(
 
         return None
 
+    def get_page(self, after_id: Optional[str],
+                 limit: int) -> List[Campaign]:
+        return _campaign_page(self.connection, "receipt_discount_campaigns",
+                              after_id, limit)
+
     def get_all(self) -> List[ReceiptCampaign]:
         cursor = self.connection.execute("SELECT id, "
                                          "campaign_type, "
@@ -1152,9 +1513,9 @@ class ReceiptDiscountCampaignSqliteRepository(
         return campaigns
 
     def delete_campaign(self, campaign_id: str) -> None:
-        self.connection.execute("DELETE FROM receipt_discount_campaigns "
-                                "WHERE id = ?", (campaign_id,))
-        self.connection.commit()
+        with self.connection.transaction() as cursor:
+            cursor.execute("DELETE FROM receipt_discount_campaigns "
+                           "WHERE id = ?", (campaign_id,))
 
     def get_discount_on_amount(self, amount: float) -> Optional[ReceiptCampaign]:
         cursor = self.connection.execute(
@@ -1174,3 +1535,312 @@ class ReceiptDiscountCampaignSqliteRepository(
 
 
         return None
+
+
+@dataclass
+class PaymentSqliteRepository(IPaymentRepository):
+    connection: SharedConnection
+
+    def settle(self, payment: Payment,
+               on_settled: Callable[[], None]) -> bool:
+        with self.connection.transaction() as cursor:
+            # The guards make paying a paid receipt, or one whose shift has
+            # closed, a no-op; a miss writes nothing, so there is nothing to
+            # roll back
+            cursor.execute(
+                "UPDATE receipts SET status = 0, paid_at = ? "
+                "WHERE id = ? AND status = 1 AND shift_id IN "
+                "(SELECT id FROM shifts WHERE state = 'open')",
+                (payment.paid_at.isoformat(), payment.receipt_id)
+            )
+            if cursor.rowcount != 1:
+                return False
+
+            self._insert(cursor, payment)
+            # Repositories sharing this connection join the transaction
+            on_settled()
+        return True
+
+    def _insert(self, cursor: sqlite3.Cursor, payment: Payment) -> None:
+        cursor.execute(
+            "INSERT INTO payments (receipt_id, shift_id, currency, rate, "
+            "amount, converted_amount, paid_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (payment.receipt_id,
+             payment.shift_id,
+             payment.currency,
+             payment.rate,
+             payment.amount,
+             payment.converted_amount,
+             payment.paid_at.isoformat())
+        )
+
+    def get_by_receipts(self, receipt_ids: List[str]) -> Dict[str, Payment]:
+        placeholders = ", ".join("?" for _ in receipt_ids)
+        return self._get_where(f"receipt_id IN ({placeholders})",
+                               receipt_ids)
+
+    def get_paid_by_shifts(self, shift_ids: List[str]) -> Dict[str, Payment]:
+        placeholders = ", ".join("?" for _ in shift_ids)
+        return self._get_where(
+            "receipt_id IN (SELECT id FROM receipts "
+            f"WHERE shift_id IN ({placeholders}) AND status = 0)", shift_ids)
+
+    def _get_where(self, where: str, params: List[str]) -> Dict[str, Payment]:
+        cursor = self.connection.cursor()
+        cursor.execute(
+            "SELECT receipt_id, shift_id, currency, rate, amount, "
+            f"converted_amount, paid_at FROM payments WHERE {where}",
+            params
+        )
+        return {row[0]: Payment(receipt_id=row[0],
+                                shift_id=row[1],
+                                currency=row[2],
+                                rate=row[3],
+                                amount=row[4],
+                                converted_amount=row[5],
+                                paid_at=datetime.fromisoformat(row[6]))
+                for row in cursor.fetchall()}
+
+
+@dataclass
+class ReportSqliteRepository(IReportRepository):
+    connection: SharedConnection
+
+    def add(self, scopes: List[str], totals: ReportTotals) -> None:
+        with self.connection.transaction() as cursor:
+            for scope in scopes:
+                self._add_scope(cursor, scope, totals)
+
+    def replace(self, totals: Dict[str, ReportTotals]) -> None:
+        with self.connection.transaction() as cursor:
+            cursor.execute("DELETE FROM report_totals")
+            cursor.execute("DELETE FROM report_revenue")
+            cursor.execute("DELETE FROM report_items")
+            for scope, scope_totals in totals.items():
+                self._add_scope(cursor, scope, scope_totals)
+
+    def _add_scope(self, cursor: sqlite3.Cursor,
+                   scope: str, totals: ReportTotals) -> None:
+        cursor.execute(
+            "INSERT INTO report_totals (scope, number_of_receipts) "
+            "VALUES (?, ?) ON CONFLICT (scope) DO UPDATE SET "
+            "number_of_receipts = number_of_receipts + "
+            "excluded.number_of_receipts",
+            (scope, totals.number_of_receipts)
+        )
+        cursor.executemany(
+            "INSERT INTO report_revenue (scope, currency, amount) "
+            "VALUES (?, ?, ?) ON CONFLICT (scope, currency) DO UPDATE "
+            "SET amount = amount + excluded.amount",
+            [(scope, currency, amount)
+             for currency, amount in totals.revenue.items()]
+        )
+        cursor.executemany(
+            "INSERT INTO report_items (scope, item_id, quantity, amount) "
+            "VALUES (?, ?, ?, ?) ON CONFLICT (scope, item_id) DO UPDATE "
+            "SET quantity = quantity + excluded.quantity, "
+            "amount = amount + excluded.amount",
+            [(scope, item_id, quantity, totals.sold_amount.get(item_id, 0.0))
+             for item_id, quantity in totals.sold_count.items()]
+        )
+
+    def get(self, scope: str, include_items: bool = True) -> ReportTotals:
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT number_of_receipts FROM report_totals "
+                       "WHERE scope = ?", (scope,))
+        row = cursor.fetchone()
+        if not row:
+            return ReportTotals()
+
+        cursor.execute("SELECT currency, amount FROM report_revenue "
+                       "WHERE scope = ? ORDER BY rowid", (scope,))
+        revenue = {currency: amount for currency, amount in cursor.fetchall()}
+        totals = ReportTotals(number_of_receipts=row[0], revenue=revenue)
+        if not include_items:
+            return totals
+
+        # rowid keeps items in the order they were first sold
+        cursor.execute("SELECT item_id, quantity, amount FROM report_items "
+                       "WHERE scope = ? ORDER BY rowid", (scope,))
+        for item_id, quantity, amount in cursor.fetchall():
+            totals.sold_count[item_id] = quantity
+            totals.sold_amount[item_id] = amount
+
+        return totals
+
+
+    def get_range(self, start_scope: str,
+                  end_scope: str) -> Dict[str, ReportTotals]:
+        # Scope keys sort chronologically, so a bucket range is a
+        # primary key range scan on each aggregate table
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT scope, number_of_receipts FROM report_totals "
+                       "WHERE scope BETWEEN ? AND ? ORDER BY scope",
+                       (start_scope, end_scope))
+        totals = {scope: ReportTotals(number_of_receipts=number)
+                  for scope, number in cursor.fetchall()}
+
+        cursor.execute("SELECT scope, currency, amount FROM report_revenue "
+                       "WHERE scope BETWEEN ? AND ? ORDER BY scope, rowid",
+                       (start_scope, end_scope))
+        for scope, currency, amount in cursor.fetchall():
+            totals[scope].revenue[currency] = amount
+
+        cursor.execute("SELECT scope, item_id, quantity, amount "
+                       "FROM report_items WHERE scope BETWEEN ? AND ? "
+                       "ORDER BY scope, rowid",
+                       (start_scope, end_scope))
+        for scope, item_id, quantity, amount in cursor.fetchall():
+            totals[scope].sold_count[item_id] = quantity
+            totals[scope].sold_amount[item_id] = amount
+
+        return totals
+
+    def get_scopes(self) -> List[str]:
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT scope FROM report_totals")
+        return [row[0] for row in cursor.fetchall()]
+
+
+@dataclass
+class SqliteReportEngine(IReportEngine):
+    connection: SharedConnection
+
+    def make_xreport(self) -> ReportResponse:
+        return self._make_report(shift_id=None)
+
+    def make_zreport(self, shift_id: str) -> ReportResponse:
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT state FROM shifts WHERE id = ?", (shift_id,))
+        row = cursor.fetchone()
+        if not row:
+            raise GetShiftErrorMessage(shift_id=shift_id)
+        if row[0] == "open":
+            raise ShiftOpenedErrorMessage(shift_id=shift_id)
+
+        return self._make_report(shift_id=shift_id)
+
+    def _make_report(self, shift_id: Optional[str]) -> ReportResponse:
+        # Paid receipts of existing shifts, optionally narrowed to one shift
+        condition = "r.status = 0"
+        params: tuple[str, ...] = ()
+        if shift_id is not None:
+            condition += " AND r.shift_id = ?"
+            params = (shift_id,)
+
+        cursor = self.connection.cursor()
+
+        cursor.execute(
+            "SELECT COUNT(*) FROM receipts r "
+            "JOIN shifts s ON s.id = r.shift_id "
+            f"WHERE {condition}",
+            params
+        )
+        number_of_receipts = cursor.fetchone()[0]
+
+        # Receipts without a payment record count as GEL; a zero
+        # discount_total falls back to total, as in Report
+        cursor.execute(
+            "SELECT COALESCE(p.currency, 'GEL'), "
+            "SUM(COALESCE(p.converted_amount, "
+            "NULLIF(r.discount_total, 0), r.total)) "
+            "FROM receipts r JOIN shifts s ON s.id = r.shift_id "
+            "LEFT JOIN payments p ON p.receipt_id = r.id "
+            f"WHERE {condition} "
+            "GROUP BY COALESCE(p.currency, 'GEL')",
+            params
+        )
+        revenue = dict(cursor.fetchall())
+
+        cursor.execute(
+            "SELECT ri.item_id, SUM(ri.quantity) "
+            "FROM receipt_items ri "
+            "JOIN receipts r ON r.id = ri.receipt_id "
+            "JOIN shifts s ON s.id = r.shift_id "
+            f"WHERE {condition} "
+            "GROUP BY ri.item_id",
+            params
+        )
+        sold_count = {item_id: quantity
+                      for item_id, quantity in cursor.fetchall()}
+
+        return ReportTotals(number_of_receipts=number_of_receipts,
+                            revenue=revenue,
+                            sold_count=sold_count).to_response()
+
+
+@dataclass
+class ExportSqliteRepository(IExportRepository):
+    connection: SharedConnection
+
+    def _build_filter(self, export_filter: ExportFilter
+                      ) -> Tuple[str, List[str]]:
+        condition = "r.status = 0"
+        params: List[str] = []
+        if export_filter.shift_id is not None:
+            condition += " AND r.shift_id = ?"
+            params.append(export_filter.shift_id)
+        if export_filter.start is not None:
+            condition += " AND p.paid_at >= ?"
+            params.append(export_filter.start.isoformat())
+        if export_filter.end is not None:
+            condition += " AND p.paid_at < ?"
+            params.append(export_filter.end.isoformat())
+        return condition, params
+
+    def iter_receipts(self, export_filter: ExportFilter) -> Iterator[ReceiptRow]:
+        condition, params = self._build_filter(export_filter)
+        # A dedicated cursor is stepped lazily, one row at a time; there is
+        # no ORDER BY so SQLite never has to sort the whole result first
+        cursor = self.connection.cursor()
+        cursor.execute(
+            "SELECT r.id, r.shift_id, r.total, r.discount_total, "
+            "p.currency, p.rate, p.converted_amount, p.paid_at "
+            "FROM receipts r LEFT JOIN payments p ON p.receipt_id = r.id "
+            f"WHERE {condition}",
+            params
+        )
+        try:
+            for row in cursor:
+                yield ReceiptRow(
+                    id=row[0],
+                    shift_id=row[1],
+                    total=row[2],
+                    discount_total=row[3],
+                    currency=row[4],
+                    rate=row[5],
+                    converted_amount=row[6],
+                    paid_at=_parse_timestamp(row[7]))
+        finally:
+            cursor.close()
+
+    def iter_sales_lines(self,
+                         export_filter: ExportFilter) -> Iterator[SalesLineRow]:
+        condition, params = self._build_filter(export_filter)
+        cursor = self.connection.cursor()
+        cursor.execute(
+            "SELECT ri.receipt_id, r.shift_id, ri.item_id, ri.item_type, "
+            "ri.quantity, ri.price, ri.total, ri.discount_price, "
+            "ri.discount_total, p.currency, p.paid_at "
+            "FROM receipts r "
+            "JOIN receipt_items ri ON ri.receipt_id = r.id "
+            "LEFT JOIN payments p ON p.receipt_id = r.id "
+            f"WHERE {condition}",
+            params
+        )
+        try:
+            for row in cursor:
+                yield SalesLineRow(
+                    receipt_id=row[0],
+                    shift_id=row[1],
+                    item_id=row[2],
+                    item_type=row[3],
+                    quantity=row[4],
+                    price=row[5],
+                    total=row[6],
+                    discount_price=row[7],
+                    discount_total=row[8],
+                    currency=row[9],
+                    paid_at=_parse_timestamp(row[10]))
+        finally:
+            cursor.close()
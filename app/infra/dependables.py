@@ -4,4 +4,11 @@ from starlette.requests import Request
 
 
 def get_core(request: Request) -> Any:
-    return request.app.state.core
\ No newline at end of file
+    return request.app.state.core
+
+def get_metrics(request: Request) -> Any:
+    return request.app.state.metrics
+
+
+def get_sql_tracer(request: Request) -> Any:
+    return request.app.state.sql_tracer
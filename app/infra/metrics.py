@@ -0,0 +1,170 @@
+import bisect
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Sequence, Tuple
+
+from starlette.routing import BaseRoute, Route
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.schemas.payment_schema import RateCacheStatsResponse
+
+# Seconds, from a cached catalog read up to a stalled FX or database call
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATUS_CLASSES = ("1xx", "2xx", "3xx", "4xx", "5xx")
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@dataclass
+class Counter:
+    value: int = 0
+    # Incremented from the threadpool and the database executor too
+    _lock: threading.Lock = field(default_factory=threading.Lock,
+                                  repr=False)
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+
+@dataclass
+class Histogram:
+    buckets: Tuple[float, ...] = LATENCY_BUCKETS
+    # One slot per bucket plus +Inf; made cumulative only when rendered
+    counts: List[int] = field(init=False)
+    total: float = 0.0
+    count: int = 0
+
+    def __post_init__(self) -> None:
+        self.counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+@dataclass
+class RouteMetrics:
+    # Label set rendered once, when the route table is built
+    labels: str
+    latency: Histogram = field(default_factory=Histogram)
+    responses: List[int] = field(
+        default_factory=lambda: [0] * len(STATUS_CLASSES))
+
+    def observe(self, status: int, elapsed: float) -> None:
+        self.latency.observe(elapsed)
+        index = status // 100 - 1
+        if 0 <= index < len(STATUS_CLASSES):
+            self.responses[index] += 1
+
+
+@dataclass
+class Metrics:
+    receipts_created: Counter = field(default_factory=Counter)
+    receipts_paid: Counter = field(default_factory=Counter)
+    db_queries: Counter = field(default_factory=Counter)
+    _routes: Dict[Any, Dict[str, RouteMetrics]] = field(default_factory=dict)
+    _unmatched: RouteMetrics = field(
+        default_factory=lambda: RouteMetrics(
+            labels='method="",route="unmatched"'))
+
+    @classmethod
+    def for_routes(cls, routes: Sequence[BaseRoute]) -> 'Metrics':
+        metrics = cls()
+        for route in routes:
+            if isinstance(route, Route):
+                metrics._routes[route.endpoint] = {
+                    method: RouteMetrics(
+                        labels=f'method="{method}",route="{route.path}"')
+                    for method in route.methods or ()}
+        return metrics
+
+    def record_statement(self, sql: str, elapsed: float) -> None:
+        self.db_queries.inc()
+
+    def observe(self, scope: Scope, status: int, elapsed: float) -> None:
+        # The router leaves the matched endpoint in the scope; requests that
+        # matched nothing share one series instead of one per raw path
+        series = self._routes.get(scope.get("endpoint"), {}).get(
+            scope["method"], self._unmatched)
+        series.observe(status, elapsed)
+
+    def render(self, rate_stats: RateCacheStatsResponse) -> str:
+        lines: List[str] = []
+        route_series = [series for methods in self._routes.values()
+                        for series in methods.values()] + [self._unmatched]
+
+        lines += _header("pos_http_requests_total", "counter",
+                         "HTTP responses by route and status class")
+        for series in route_series:
+            for status, count in zip(STATUS_CLASSES, series.responses):
+                lines.append(f'pos_http_requests_total{{{series.labels},'
+                             f'status="{status}"}} {count}')
+
+        name = "pos_http_request_duration_seconds"
+        lines += _header(name, "histogram", "HTTP request latency by route")
+        for series in route_series:
+            cumulative = 0
+            latency = series.latency
+            for bound, count in zip(latency.buckets + (float("inf"),),
+                                    latency.counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{name}_bucket{{{series.labels},le="{le}"}} '
+                             f'{cumulative}')
+            lines.append(f"{name}_sum{{{series.labels}}} {latency.total}")
+            lines.append(f"{name}_count{{{series.labels}}} {latency.count}")
+
+        for name, help_text, value in (
+                ("pos_receipts_created_total", "Receipts opened",
+                 self.receipts_created.value),
+                ("pos_receipts_paid_total", "Receipts paid",
+                 self.receipts_paid.value),
+                ("pos_db_queries_total", "SQL statements executed",
+                 self.db_queries.value),
+                ("pos_fx_cache_misses_total", "FX rate cache misses",
+                 rate_stats.misses)):
+            lines += _header(name, "counter", help_text)
+            lines.append(f"{name} {value}")
+
+        name = "pos_fx_cache_hits_total"
+        lines += _header(name, "counter", "FX rate cache hits by freshness")
+        lines.append(f'{name}{{freshness="fresh"}} {rate_stats.hits}')
+        lines.append(f'{name}{{freshness="stale"}} {rate_stats.stale_hits}')
+        return "\n".join(lines) + "\n"
+
+
+def _header(name: str, kind: str, help_text: str) -> List[str]:
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+
+
+class MetricsMiddleware:
+    # Plain ASGI rather than BaseHTTPMiddleware, which would add a task and
+    # a response stream copy to every request
+    def __init__(self, app: ASGIApp, metrics: Metrics) -> None:
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive,
+                       send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Histograms are only touched here, on the event loop thread
+            self.metrics.observe(scope, status,
+                                 time.perf_counter() - started)
@@ -0,0 +1,54 @@
+import asyncio
+import contextlib
+import random
+from dataclasses import dataclass, field
+from typing import Optional
+
+from app.core.facade import POSCore
+
+
+@dataclass
+class RateRefresher:
+    core: POSCore
+    # Kept below the rate cache TTL so payments always find a fresh rate
+    interval: float = 30.0
+    initial_backoff: float = 1.0
+    max_backoff: float = 60.0
+    startup_timeout: float = 5.0
+    _task: Optional['asyncio.Task[None]'] = field(default=None, init=False)
+    _failures: int = field(default=0, init=False)
+
+    async def start(self) -> None:
+        # Prefetch before serving, but never hold startup for long; pairs
+        # are fetched concurrently, so one provider timeout fits the budget
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self._refresh(), self.startup_timeout)
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._next_delay())
+            await self._refresh()
+
+    async def _refresh(self) -> None:
+        try:
+            failed = await self.core.refresh_rates()
+        except Exception:
+            failed = ["*"]
+        self._failures = self._failures + 1 if failed else 0
+
+    def _next_delay(self) -> float:
+        if not self._failures:
+            return self.interval
+        backoff = min(self.max_backoff,
+                      self.initial_backoff * 2 ** (self._failures - 1))
+        # Full jitter keeps restarted workers from retrying in lockstep
+        return random.uniform(0, backoff)
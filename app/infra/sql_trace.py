@@ -0,0 +1,195 @@
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, cast
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.infra.data.sqlite import SharedConnection
+
+logger = logging.getLogger(__name__)
+
+# A SELECT repeated this often within one request is reported as an N+1
+N_PLUS_ONE_THRESHOLD = 5
+
+_WHITESPACE = re.compile(r"\s+")
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\?(?:, \?)+\)")
+
+# Called with the SQL text and seconds taken after every statement
+StatementListener = Callable[[str, float], None]
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(sql: str) -> str:
+    # Statements that differ only in literals or IN-list length share a key
+    sql = _WHITESPACE.sub(" ", sql).strip()
+    sql = _LITERALS.sub("?", sql)
+    return _PLACEHOLDER_LIST.sub("(?, ...)", sql)
+
+
+@dataclass
+class QueryStat:
+    sql: str
+    count: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+
+
+@dataclass
+class QueryStats:
+    statements: int = 0
+    total_time: float = 0.0
+    by_sql: Dict[str, QueryStat] = field(default_factory=dict)
+
+    def record(self, sql: str, elapsed: float) -> None:
+        self.statements += 1
+        self.total_time += elapsed
+        stat = self.by_sql.get(sql)
+        if stat is None:
+            stat = self.by_sql[sql] = QueryStat(sql=sql)
+        stat.count += 1
+        stat.total_time += elapsed
+        stat.max_time = max(stat.max_time, elapsed)
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD
+                 ) -> List[QueryStat]:
+        return [stat for stat in self.by_sql.values()
+                if stat.count >= threshold
+                and stat.sql.upper().startswith("SELECT")]
+
+    def slowest(self, limit: int = 20) -> List[QueryStat]:
+        return sorted(self.by_sql.values(),
+                      key=lambda stat: stat.total_time, reverse=True)[:limit]
+
+
+@dataclass
+class NPlusOneFinding:
+    request: str
+    sql: str
+    count: int
+
+
+# Statements of the request being served; copied into the threadpool and
+# the database executor along with the rest of the context
+_request_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "request_sql_stats", default=None)
+
+
+@dataclass
+class SqlTracer:
+    n_plus_one_threshold: int = N_PLUS_ONE_THRESHOLD
+    totals: QueryStats = field(default_factory=QueryStats)
+    findings: Deque[NPlusOneFinding] = field(
+        default_factory=lambda: deque(maxlen=100))
+    _captures: List[QueryStats] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock,
+                                  repr=False)
+
+    def record(self, sql: str, elapsed: float) -> None:
+        sql = normalize_sql(sql)
+        with self._lock:
+            self.totals.record(sql, elapsed)
+            for capture in self._captures:
+                capture.record(sql, elapsed)
+
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.record(sql, elapsed)
+
+    @contextmanager
+    def capture(self) -> Iterator[QueryStats]:
+        # Everything run on this connection meanwhile, from any thread
+        stats = QueryStats()
+        with self._lock:
+            self._captures.append(stats)
+        try:
+            yield stats
+        finally:
+            with self._lock:
+                self._captures.remove(stats)
+
+    @contextmanager
+    def track_request(self, request: str) -> Iterator[QueryStats]:
+        stats = QueryStats()
+        token = _request_stats.set(stats)
+        try:
+            yield stats
+        finally:
+            _request_stats.reset(token)
+            for stat in stats.repeated(self.n_plus_one_threshold):
+                self.findings.append(NPlusOneFinding(
+                    request=request, sql=stat.sql, count=stat.count))
+                logger.warning("Possible N+1 in %s: %d x %s",
+                               request, stat.count, stat.sql)
+
+
+class TracingCursor(sqlite3.Cursor):
+    # Times statement execution; rows fetched afterwards are not included.
+    # Listeners run here rather than from sqlite3's trace callback, which
+    # SQLite invokes while holding the connection mutex: with the connection
+    # shared by threads that deadlocks against a thread holding the GIL
+    def execute(self, sql: str, parameters: Any = (), /) -> 'TracingCursor':
+        started = time.perf_counter()
+        try:
+            super().execute(sql, parameters)
+            return self
+        finally:
+            self._notify(sql, time.perf_counter() - started)
+
+    def executemany(self, sql: str, parameters: Any, /) -> 'TracingCursor':
+        started = time.perf_counter()
+        try:
+            super().executemany(sql, parameters)
+            return self
+        finally:
+            self._notify(sql, time.perf_counter() - started)
+
+    def _notify(self, sql: str, elapsed: float) -> None:
+        for listener in cast(TracingConnection, self.connection).listeners:
+            listener(sql, elapsed)
+
+
+class TracingConnection(SharedConnection):
+    # Drop-in for the connection every *SqliteRepository is built on
+    listeners: List[StatementListener]
+
+    def cursor(self, factory: Any = TracingCursor) -> Any:
+        return super().cursor(factory)
+
+    def execute(self, sql: str, parameters: Any = (), /) -> Any:
+        # The C implementation would skip the cursor factory above
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, parameters: Any, /) -> Any:
+        return self.cursor().executemany(sql, parameters)
+
+
+def connect_traced(database: str, listeners: List[StatementListener],
+                   **kwargs: Any) -> TracingConnection:
+    connection = sqlite3.connect(database, factory=TracingConnection,
+                                 **kwargs)
+    connection.listeners = listeners
+    return connection
+
+
+class SqlTraceMiddleware:
+    def __init__(self, app: ASGIApp, tracer: SqlTracer) -> None:
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope: Scope, receive: Receive,
+                       send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with self.tracer.track_request(f"{scope['method']} {scope['path']}"):
+            await self.app(scope, receive, send)
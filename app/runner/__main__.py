@@ -5,4 +5,5 @@ from app.runner.setup import setup
 if __name__ == '__main__':
     UvicornServer.from_env().run(setup())
 
-// or run this command in terminal: uvicorn app.runner.asgi:app --reload
+# or run this command in terminal: uvicorn app.runner.asgi:app --reload
+# several workers: gunicorn -c python:app.runner.gunicorn_conf app.runner.asgi:app
@@ -0,0 +1,11 @@
+import sys
+
+from app.core.facade import POSCore
+from app.infra.data.sqlite import SqliteRepoFactory, connect
+
+if __name__ == '__main__':
+    database_path = sys.argv[1] if len(sys.argv) > 1 else "oop.db"
+    connection = connect(database_path)
+    core = POSCore.create(SqliteRepoFactory(connection=connection))
+    count = core.rebuild_reports()
+    print(f"Rebuilt sales and report totals from {count} paid receipts.")
@@ -0,0 +1,9 @@
+# gunicorn -c python:app.runner.gunicorn_conf app.runner.asgi:app
+from app.runner.settings import Settings
+
+settings = Settings.load()
+
+bind = settings.bind
+# Every worker owns its store, so in-memory data cannot be spread over several
+workers = settings.workers if settings.backend == "sqlite" else 1
+worker_class = "uvicorn.workers.UvicornWorker"
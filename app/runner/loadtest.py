@@ -0,0 +1,219 @@
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from app.runner.settings import BACKENDS, Settings
+from app.runner.setup import setup
+
+CURRENCIES = ("gel", "usd", "eur")
+# Fixed rates, so a run never waits on the FX service
+FX_RATES = {"GEL-USD": 0.37, "GEL-EUR": 0.34}
+PERCENTILES = (0.50, 0.95, 0.99)
+
+
+@dataclass
+class Catalog:
+    products: List[str] = field(default_factory=list)
+    combos: List[str] = field(default_factory=list)
+    gifts: List[str] = field(default_factory=list)
+
+
+@dataclass
+class LoadResult:
+    backend: str
+    cashiers: int
+    checkouts: int = 0
+    elapsed: float = 0.0
+    # Seconds per request, keyed by method and route template
+    latencies: Dict[str, List[float]] = field(
+        default_factory=lambda: defaultdict(list))
+    errors: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+
+@dataclass
+class Session:
+    client: httpx.AsyncClient
+    result: Optional[LoadResult] = None
+
+    async def call(self, endpoint: str, url: str,
+                   json_body: Optional[Dict[str, Any]] = None) -> Any:
+        method = endpoint.split(" ", 1)[0]
+        started = time.perf_counter()
+        response = await self.client.request(method, url, json=json_body)
+        if self.result is not None:
+            self.result.latencies[endpoint].append(
+                time.perf_counter() - started)
+            if response.is_error:
+                self.result.errors[endpoint] += 1
+        if response.is_error:
+            return None
+        return response.json() if response.content else None
+
+
+async def seed_catalog(session: Session, rng: random.Random,
+                       products: int) -> Catalog:
+    catalog = Catalog()
+    for number in range(products):
+        created = await session.call("POST /products/", "/products/", {
+            "name": f"product {number}",
+            "barcode": str(4860000000000 + number),
+            "price": rng.randint(50, 5000) / 100})
+        catalog.products.append(created["product"]["id"])
+
+    discount = await session.call("POST /campaign/discount",
+                                  "/campaign/discount", {"discount": 10})
+    for product_id in rng.sample(catalog.products, len(catalog.products) // 5):
+        await session.call(
+            "POST /campaign/discount/{campaign_id}/{product_id}",
+            f"/campaign/discount/{discount['id']}/{product_id}")
+
+    for _ in range(max(1, products // 20)):
+        combo = await session.call("POST /campaign/combo",
+                                   "/campaign/combo", {"discount": 5})
+        for product_id in rng.sample(catalog.products, 2):
+            await session.call(
+                "POST /campaign/combo/{campaign_id}/{product}",
+                f"/campaign/combo/{combo['id']}/{product_id}",
+                {"product_id": product_id, "quantity": 1})
+        catalog.combos.append(combo["id"])
+
+        buy, gift = rng.sample(catalog.products, 2)
+        gift_campaign = await session.call(
+            "POST /campaign/buy_n_get_n", "/campaign/buy_n_get_n", {
+                "product": {"product_id": buy, "num": 2},
+                "gift": {"product_id": gift, "num": 1}})
+        catalog.gifts.append(gift_campaign["id"])
+    return catalog
+
+
+async def cashier(session: Session, catalog: Catalog, rng: random.Random,
+                  receipts: int, items: int) -> int:
+    shift = await session.call("POST /shifts", "/shifts")
+    if shift is None:
+        return 0
+
+    checkouts = 0
+    for _ in range(receipts):
+        receipt = await session.call("POST /receipts", "/receipts",
+                                     {"shift_id": shift["id"]})
+        if receipt is None:
+            continue
+
+        receipt_id = receipt["id"]
+        for _ in range(items):
+            roll = rng.random()
+            if roll < 0.1:
+                await session.call(
+                    "POST /receipts/{receipt_id}/combo",
+                    f"/receipts/{receipt_id}/combo",
+                    {"combo_id": rng.choice(catalog.combos), "quantity": 1})
+            elif roll < 0.2:
+                await session.call(
+                    "POST /receipts/{receipt_id}/buy_n_get_n",
+                    f"/receipts/{receipt_id}/buy_n_get_n",
+                    {"gift_campaign_id": rng.choice(catalog.gifts),
+                     "quantity": 1})
+            else:
+                await session.call(
+                    "POST /receipts/{receipt_id}/product",
+                    f"/receipts/{receipt_id}/product",
+                    {"product_id": rng.choice(catalog.products),
+                     "quantity": rng.randint(1, 3)})
+
+        currency = rng.choice(CURRENCIES)
+        paid = await session.call(f"POST /pay/{currency}/{{receipt_id}}",
+                                  f"/pay/{currency}/{receipt_id}")
+        if paid is not None:
+            checkouts += 1
+
+    await session.call("PATCH /shifts/{shift_id}", f"/shifts/{shift['id']}")
+    return checkouts
+
+
+async def run_load(backend: str, cashiers: int, receipts: int, items: int,
+                   products: int, seed: int) -> LoadResult:
+    result = LoadResult(backend=backend, cashiers=cashiers)
+    with tempfile.TemporaryDirectory() as workdir:
+        rates_file = os.path.join(workdir, "rates.json")
+        with open(rates_file, "w") as rates:
+            json.dump(FX_RATES, rates)
+        app = setup(Settings(backend=backend,
+                             database_path=os.path.join(workdir, "pos.db"),
+                             fx_rates_file=rates_file))
+
+        # ASGITransport does not send lifespan events, so run them here
+        async with app.router.lifespan_context(app):
+            # Server errors are counted per endpoint instead of aborting
+            transport = httpx.ASGITransport(app=app,
+                                            raise_app_exceptions=False)
+            async with httpx.AsyncClient(transport=transport,
+                                         base_url="http://pos") as client:
+                session = Session(client=client)
+                catalog = await seed_catalog(session, random.Random(seed),
+                                             products)
+                session.result = result
+                started = time.perf_counter()
+                checkouts = await asyncio.gather(*(
+                    cashier(session, catalog, random.Random(seed + number),
+                            receipts, items)
+                    for number in range(cashiers)))
+                result.elapsed = time.perf_counter() - started
+
+    result.checkouts = sum(checkouts)
+    return result
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    # Nearest rank, so a reported value is always one that was measured
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+def print_report(result: LoadResult) -> None:
+    requests = sum(len(values) for values in result.latencies.values())
+    print(f"{result.backend}: {result.cashiers} cashiers, "
+          f"{result.checkouts} checkouts, {requests} requests "
+          f"in {result.elapsed:.2f}s "
+          f"({result.checkouts / result.elapsed:.1f} checkouts/s, "
+          f"{requests / result.elapsed:.1f} requests/s)")
+    print(f"  {'endpoint':<42} {'count':>6} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'errors':>6}")
+    for endpoint, values in sorted(result.latencies.items()):
+        ordered = sorted(values)
+        columns = " ".join(f"{percentile(ordered, fraction) * 1000:>8.2f}"
+                           for fraction in PERCENTILES)
+        print(f"  {endpoint:<42} {len(values):>6} {columns} "
+              f"{result.errors.get(endpoint, 0):>6}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        prog="python -m app.runner.loadtest",
+        description="Drive simulated cashier checkouts through the app "
+                    "in-process and report latency per endpoint.")
+    parser.add_argument("--backend", choices=BACKENDS + ("both",),
+                        default="both")
+    parser.add_argument("--cashiers", type=int, default=8)
+    parser.add_argument("--receipts", type=int, default=20,
+                        help="receipts paid by each cashier")
+    parser.add_argument("--items", type=int, default=5,
+                        help="items scanned per receipt")
+    parser.add_argument("--products", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    backends = BACKENDS if args.backend == "both" else (args.backend,)
+    for name in backends:
+        print_report(asyncio.run(run_load(
+            backend=name, cashiers=args.cashiers, receipts=args.receipts,
+            items=args.items, products=args.products, seed=args.seed)))
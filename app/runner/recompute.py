@@ -0,0 +1,38 @@
+import argparse
+import sys
+import time
+
+from app.infra.data.recompute import ParallelReportRecompute
+
+
+def print_progress(done: int, total: int) -> None:
+    print(f"\r{done}/{total} shifts", end="", file=sys.stderr, flush=True)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        prog="python -m app.runner.recompute",
+        description="Recompute report totals from raw receipts in parallel.")
+    parser.add_argument("database", nargs="?", default="oop.db")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--audit", action="store_true",
+                        help="compare with the stored totals, do not write")
+    args = parser.parse_args()
+
+    job = ParallelReportRecompute(database_path=args.database,
+                                  workers=args.workers,
+                                  progress=print_progress)
+    started = time.perf_counter()
+    if args.audit:
+        mismatched = job.audit()
+        print(file=sys.stderr)
+        for scope in mismatched:
+            print(f"mismatch: {scope}")
+        print(f"Audit finished in {time.perf_counter() - started:.2f}s, "
+              f"{len(mismatched)} mismatched scopes.")
+        sys.exit(1 if mismatched else 0)
+
+    result = job.rebuild()
+    print(file=sys.stderr)
+    print(f"Recomputed {len(result.totals)} report scopes from "
+          f"{result.shifts} shifts in {time.perf_counter() - started:.2f}s.")
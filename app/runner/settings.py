@@ -0,0 +1,70 @@
+import os
+from dataclasses import Field, dataclass, fields
+from typing import Any, Dict, Mapping, Optional
+
+ENV_PREFIX = "POS_"
+BACKENDS = ("sqlite", "memory")
+
+
+@dataclass(frozen=True)
+class Settings:
+    backend: str = "sqlite"
+    database_path: str = "oop.db"
+    # Seconds a write waits for another worker's lock before failing
+    busy_timeout: float = 5.0
+    db_workers: int = 1
+    fx_max_connections: int = 20
+    fx_rates_file: Optional[str] = None
+    # Seconds a fetched FX rate is served as fresh, then, while refreshes
+    # fail, how old it may get before payments in that currency fail
+    fx_rate_ttl: float = 60.0
+    fx_max_staleness: float = 600.0
+    workers: int = os.cpu_count() or 1
+    bind: str = "0.0.0.0:8000"
+    # Times every SQL statement and serves the totals at /debug/sql
+    sql_trace: bool = False
+
+    def __post_init__(self) -> None:
+        if self.backend not in BACKENDS:
+            raise ValueError(f"Unknown storage backend: {self.backend}")
+        # Every SQLite repository shares one connection per worker process
+        if self.backend == "sqlite" and self.db_workers != 1:
+            raise ValueError("db_workers must be 1 with the sqlite backend")
+        if not 0 < self.fx_rate_ttl <= self.fx_max_staleness:
+            raise ValueError("fx_rate_ttl must be positive and at most "
+                             "fx_max_staleness")
+
+    @classmethod
+    def load(cls, environ: Mapping[str, str] = os.environ) -> 'Settings':
+        # POS_SETTINGS_FILE provides defaults, POS_* variables override them
+        values: Dict[str, Any] = {}
+        settings_file = environ.get(ENV_PREFIX + "SETTINGS_FILE")
+        if settings_file:
+            from dotenv import dotenv_values
+
+            values.update(_select(dotenv_values(settings_file)))
+        values.update(_select(environ))
+        return cls(**{settings_field.name: _convert(
+            settings_field, values[settings_field.name])
+            for settings_field in fields(cls)
+            if settings_field.name in values})
+
+
+def _select(source: Mapping[str, Optional[str]]) -> Dict[str, str]:
+    selected = {}
+    for settings_field in fields(Settings):
+        value = source.get(ENV_PREFIX + settings_field.name.upper())
+        if value is not None:
+            selected[settings_field.name] = value
+
+    return selected
+
+
+def _convert(settings_field: 'Field[Any]', value: str) -> Any:
+    if settings_field.type is bool:
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    if settings_field.type is int:
+        return int(value)
+    if settings_field.type is float:
+        return float(value)
+    return value
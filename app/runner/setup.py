@@ -1,30 +1,104 @@
-import sqlite3
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
 
 from fastapi import FastAPI
 
 from app.core.facade import POSCore
+from app.core.factories.repo_factory import RepoFactory
+from app.core.services.db_executor import DatabaseExecutor
+from app.core.services.rate_cache import RateCache
 from app.infra.api.campaign import campaign_api
+from app.infra.api.debug import debug_api
+from app.infra.api.exports import exports_api
+from app.infra.api.metrics import metrics_api
 from app.infra.api.payments import payment_api
 from app.infra.api.products import products_api
 from app.infra.api.receipts import receipts_api
 from app.infra.api.reports import reports_api
 from app.infra.api.shifts import shifts_api
+from app.infra.data.in_memory import InMemoryRepoFactory
+from app.infra.data.rates import create_rate_provider
 from app.infra.data.sqlite import SqliteRepoFactory
+from app.infra.metrics import Metrics, MetricsMiddleware
+from app.infra.rate_refresher import RateRefresher
+from app.infra.sql_trace import (
+    SqlTraceMiddleware,
+    SqlTracer,
+    StatementListener,
+    connect_traced,
+)
+from app.runner.settings import Settings
 
 
-def setup() -> FastAPI:
-    app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Runs in every worker process after it starts, so connections, threads
+    # and HTTP clients are never inherited across a fork
+    settings = app.state.settings
+    listeners = [app.state.metrics.record_statement]
+    if settings.sql_trace:
+        listeners.append(app.state.sql_tracer.record)
+    database = create_database(settings, listeners=listeners)
+    rate_provider = create_rate_provider(
+        rates_file=settings.fx_rates_file,
+        max_connections=settings.fx_max_connections)
+    db_executor = DatabaseExecutor(max_workers=settings.db_workers)
+    app.state.infra = database
+    app.state.rate_provider = rate_provider
+    app.state.db_executor = db_executor
+    app.state.core = POSCore.create(
+        database, rate_provider=rate_provider, db_executor=db_executor,
+        rate_cache=RateCache(ttl=settings.fx_rate_ttl,
+                             max_staleness=settings.fx_max_staleness))
+
+    # The HTTP client lives exactly as long as the app and its event loop
+    await rate_provider.open()
+    refresher = RateRefresher(core=app.state.core,
+                              interval=settings.fx_rate_ttl / 2)
+    await refresher.start()
+    yield
+    await refresher.stop()
+    await rate_provider.close()
+    db_executor.shutdown()
+    if isinstance(database, SqliteRepoFactory):
+        database.connection.close()
+
+
+def create_database(settings: Settings,
+                    listeners: Optional[List[StatementListener]] = None
+                    ) -> RepoFactory:
+    if settings.backend == "memory":
+        return InMemoryRepoFactory()
+
+    # Statements are counted for /metrics, and traced when enabled
+    connection = connect_traced(settings.database_path, listeners or [],
+                                timeout=settings.busy_timeout,
+                                check_same_thread=False)
+    # WAL lets the other workers keep reading while one of them writes
+    connection.execute("PRAGMA journal_mode=WAL")
+    return SqliteRepoFactory(connection=connection)
+
+
+def setup(settings: Optional[Settings] = None) -> FastAPI:
+    app = FastAPI(lifespan=lifespan)
     app.include_router(products_api, prefix="/products", tags=["Product"])
     app.include_router(campaign_api, prefix="/campaign", tags=["Campaign"])
     app.include_router(receipts_api, prefix="/receipts", tags=["Receipt"])
     app.include_router(shifts_api, prefix="/shifts", tags=["Shift"])
     app.include_router(payment_api, prefix="/pay", tags=["Payment"])
     app.include_router(reports_api, prefix="/reports", tags=["Report"])
+    app.include_router(exports_api, prefix="/exports", tags=["Export"])
+    app.include_router(metrics_api, tags=["Metrics"])
 
-    connection = sqlite3.connect("oop.db", check_same_thread=False)
-    database = SqliteRepoFactory(connection=connection)
-    # database = InMemoryRepoFactory()
-    app.state.infra = database
-    app.state.core = POSCore.create(database)
+    # Storage is opened by the lifespan, not here: importing the app must
+    # stay cheap and safe for a pre-forking server
+    app.state.settings = settings or Settings.load()
+    if app.state.settings.sql_trace:
+        app.state.sql_tracer = SqlTracer()
+        app.add_middleware(SqlTraceMiddleware, tracer=app.state.sql_tracer)
+        app.include_router(debug_api, prefix="/debug", tags=["Debug"])
 
-    return app
\ No newline at end of file
+    # Series for every route are allocated here, once, not per request
+    app.state.metrics = Metrics.for_routes(app.routes)
+    app.add_middleware(MetricsMiddleware, metrics=app.state.metrics)
+    return app
@@ -0,0 +1,91 @@
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+from app.core.models.campaign import (
+    BuyNGetNCampaign,
+    Campaign,
+    CampaignType,
+    ComboCampaign,
+    DiscountCampaign,
+)
+from app.core.models.product import Product
+from app.core.models.receipt import ProductForReceipt
+from app.core.schemas.campaign_schema import GetAllCampaignsResponse
+from app.core.schemas.products_schema import GetAllProductResponse
+from app.infra.api.encoders import FastJSONResponse
+
+# python -m benchmarks.json_encoding [number of products]
+ROUNDS = 5
+
+
+def make_products(count: int) -> GetAllProductResponse:
+    random.seed(7)
+    return GetAllProductResponse(products=[
+        Product(id=f"p{number}", name=f"product {number}",
+                barcode=str(4860000000000 + number),
+                price=random.randint(50, 5000) / 100,
+                discount=random.randint(10, 40) / 100
+                if random.random() < 0.3 else None)
+        for number in range(count)])
+
+
+def make_campaigns(count: int) -> GetAllCampaignsResponse:
+    random.seed(7)
+    campaigns: List[Campaign] = []
+    for number in range(count):
+        item = ProductForReceipt(id=f"p{number}", quantity=2, price=3.5)
+        kind = number % 3
+        if kind == 0:
+            campaigns.append(ComboCampaign(
+                id=f"c{number}", campaign_type=CampaignType.COMBO,
+                discount=1.5, products=[item, item]))
+        elif kind == 1:
+            campaigns.append(DiscountCampaign(
+                id=f"c{number}", campaign_type=CampaignType.DISCOUNT,
+                discount=10, products=[f"p{number}"]))
+        else:
+            campaigns.append(BuyNGetNCampaign(
+                id=f"c{number}", campaign_type=CampaignType.BUY_N_GET_N,
+                buy_product=item, gift_product=item))
+    return GetAllCampaignsResponse(campaigns=campaigns)
+
+
+def default_path(response: BaseModel) -> bytes:
+    # What FastAPI does for a response_model: validate, dump, json.dumps
+    adapter: TypeAdapter[Any] = TypeAdapter(type(response))
+    value = adapter.validate_python(response)
+    return bytes(JSONResponse(adapter.dump_python(value, mode="json")).body)
+
+
+def fast_path(response: BaseModel) -> bytes:
+    return bytes(FastJSONResponse(response).body)
+
+
+def timed(run: Callable[[], bytes]) -> Tuple[float, bytes]:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        result = run()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    listings: Dict[str, BaseModel] = {
+        "products": make_products(count),
+        "campaigns": make_campaigns(count),
+    }
+    print(f"{count} items per listing, best of {ROUNDS}")
+    for name, response in listings.items():
+        default_time, expected = timed(lambda: default_path(response))
+        fast_time, actual = timed(lambda: fast_path(response))
+        assert actual == expected
+        print(f"{name:<10} default: {default_time:.3f}s  "
+              f"fast: {fast_time:.3f}s  "
+              f"({default_time / fast_time:.1f}x)")
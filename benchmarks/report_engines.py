@@ -0,0 +1,81 @@
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+from app.core.models.payment import Payment
+from app.core.models.receipt import ProductForReceipt, Receipt
+from app.core.models.report import XReport
+from app.core.schemas.report_schema import ReportResponse
+from app.core.services.columnar_report import SalesColumns, numpy_available
+
+# python -m benchmarks.report_engines [number of sales lines]
+LINES_PER_RECEIPT = 5
+PRODUCTS = 2_000
+
+
+def make_sales(lines: int) -> Tuple[List[Receipt], Dict[str, Payment]]:
+    random.seed(7)
+    receipts = []
+    payments = {}
+    for number in range(lines // LINES_PER_RECEIPT):
+        receipt = Receipt(id=f"r{number}", shift_id="s", items=[], total=0.0,
+                          status=False)
+        for _ in range(LINES_PER_RECEIPT):
+            price = random.randint(50, 5000) / 100
+            receipt.items.append(ProductForReceipt(
+                id=f"p{random.randrange(PRODUCTS)}",
+                quantity=random.randint(1, 4),
+                price=price,
+                discount_price=round(price * 0.9, 2)
+                if random.random() < 0.3 else None))
+        amount = receipt.get_discounted_price() or receipt.get_price()
+        if number % 3:
+            currency = random.choice(["GEL", "USD", "EUR"])
+            rate = 1.0 if currency == "GEL" else 0.37
+            payments[receipt.id] = Payment(
+                receipt_id=receipt.id, shift_id="s", currency=currency,
+                rate=rate, amount=amount, converted_amount=round(amount * rate, 2))
+        receipts.append(receipt)
+    return receipts, payments
+
+
+def object_path(receipts: List[Receipt],
+                payments: Dict[str, Payment]) -> ReportResponse:
+    report = XReport()
+    return ReportResponse(number_of_receipts=len(receipts),
+                          revenue=report._get_revenue(receipts, payments),
+                          sold_product_count=report._get_sold_count(receipts))
+
+
+def columnar_path(receipts: List[Receipt],
+                  payments: Dict[str, Payment]) -> ReportResponse:
+    return SalesColumns.from_receipts(receipts, payments).to_totals(
+        ).to_response()
+
+
+def timed(run: Callable[[], ReportResponse]) -> Tuple[float, ReportResponse]:
+    started = time.perf_counter()
+    result = run()
+    return time.perf_counter() - started, result
+
+
+if __name__ == '__main__':
+    if not numpy_available():
+        sys.exit("numpy is not installed")
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    receipts, payments = make_sales(lines)
+    print(f"{len(receipts)} receipts, {lines} sales lines")
+
+    object_time, expected = timed(lambda: object_path(receipts, payments))
+    columnar_time, actual = timed(lambda: columnar_path(receipts, payments))
+    columns = SalesColumns.from_receipts(receipts, payments)
+    reduce_time, _ = timed(lambda: columns.to_totals().to_response())
+
+    assert actual.number_of_receipts == expected.number_of_receipts
+    assert actual.sold_product_count == expected.sold_product_count
+    assert actual.revenue == expected.revenue
+
+    print(f"object path:               {object_time:.3f}s")
+    print(f"columnar, load + reduce:   {columnar_time:.3f}s")
+    print(f"columnar, reduce only:     {reduce_time:.3f}s")
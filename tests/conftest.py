@@ -0,0 +1,56 @@
+import json
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.infra.data.sqlite import SqliteRepoFactory
+from app.infra.sql_trace import QueryStats, SqlTracer, connect_traced
+from app.runner.settings import BACKENDS, Settings
+from app.runner.setup import setup
+
+
+def make_client(backend: str, tmp_path: Path,
+                sql_trace: bool = False) -> TestClient:
+    # Fixed rates, so no test ever reaches the FX service
+    rates_file = tmp_path / "rates.json"
+    rates_file.write_text(json.dumps({"GEL-USD": 0.37, "GEL-EUR": 0.34}))
+    return TestClient(setup(Settings(backend=backend,
+                                     database_path=str(tmp_path / "pos.db"),
+                                     fx_rates_file=str(rates_file),
+                                     sql_trace=sql_trace)))
+
+
+@pytest.fixture(params=BACKENDS)
+def client(request: pytest.FixtureRequest,
+           tmp_path: Path) -> Iterator[TestClient]:
+    with make_client(request.param, tmp_path) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def sqlite_client(tmp_path: Path) -> Iterator[TestClient]:
+    with make_client("sqlite", tmp_path) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def sql_tracer() -> SqlTracer:
+    return SqlTracer()
+
+
+@pytest.fixture
+def traced_sqlite(sql_tracer: SqlTracer) -> Iterator[SqliteRepoFactory]:
+    connection = connect_traced(":memory:", [sql_tracer.record],
+                                check_same_thread=False)
+    yield SqliteRepoFactory(connection=connection)
+    connection.close()
+
+
+@pytest.fixture
+def sql_queries(sql_tracer: SqlTracer,
+                traced_sqlite: SqliteRepoFactory) -> Iterator[QueryStats]:
+    # Requested after traced_sqlite, so creating the schema is not counted
+    with sql_tracer.capture() as stats:
+        yield stats
@@ -0,0 +1,63 @@
+from typing import Any, Dict
+
+from fastapi.testclient import TestClient
+
+
+def _create_product(client: TestClient, name: str, barcode: str) -> str:
+    return str(client.post("/products/", json={
+        "name": name, "barcode": barcode,
+        "price": 2}).json()["product"]["id"])
+
+
+def _changes(client: TestClient, since: int) -> Dict[str, Any]:
+    response = client.get("/products/changes", params={"since": since})
+    assert response.status_code == 200
+    return dict(response.json())
+
+
+def test_changes_since_zero_list_each_product_once(
+        client: TestClient) -> None:
+    bread = _create_product(client, "bread", "4860000000301")
+    milk = _create_product(client, "milk", "4860000000302")
+    client.patch(f"/products/{bread}", json={"price": 3})
+
+    delta = _changes(client, since=0)
+
+    # Compacted on write: the update replaces the creation of bread
+    assert delta["version"] == 3
+    assert [product["id"] for product in delta["created"]] == [milk]
+    assert [(product["id"], product["price"])
+            for product in delta["updated"]] == [(bread, 3.0)]
+
+
+def test_changes_are_bounded_by_since(client: TestClient) -> None:
+    _create_product(client, "bread", "4860000000303")
+    version = _changes(client, since=0)["version"]
+    milk = _create_product(client, "milk", "4860000000304")
+
+    delta = _changes(client, since=version)
+    caught_up = _changes(client, since=delta["version"])
+
+    assert delta["since"] == version
+    assert [product["id"] for product in delta["created"]] == [milk]
+    assert caught_up["version"] == delta["version"]
+    assert caught_up["created"] == caught_up["updated"] == []
+
+
+def test_campaign_membership_delete_replaces_its_add(
+        client: TestClient) -> None:
+    product = _create_product(client, "bread", "4860000000305")
+    campaign = client.post("/campaign/discount",
+                           json={"discount": 10}).json()["id"]
+    version = _changes(client, since=0)["version"]
+    client.post(f"/campaign/discount/{campaign}/{product}")
+    client.delete(f"/campaign/discount/{campaign}/{product}")
+
+    delta = _changes(client, since=version)
+
+    assert delta["campaign_products"] == [{
+        "campaign_id": campaign, "product_id": product,
+        "action": "deleted"}]
+    assert delta["campaigns"] == []
+    assert _changes(client, since=0)["campaigns"] == [
+        {"campaign_id": campaign, "action": "created"}]
@@ -0,0 +1,88 @@
+import asyncio
+
+import httpx
+
+from app.infra.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from app.infra.data.rates import HttpRateProvider
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _open_breaker(clock: FakeClock) -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30.0,
+                             clock=clock)
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure()
+    return breaker
+
+
+def test_breaker_opens_after_threshold_failures() -> None:
+    breaker = _open_breaker(FakeClock())
+
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+
+def test_half_open_breaker_allows_one_trial() -> None:
+    clock = FakeClock()
+    breaker = _open_breaker(clock)
+    clock.now = 30.0
+
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()
+
+
+def test_successful_trial_closes_the_breaker() -> None:
+    clock = FakeClock()
+    breaker = _open_breaker(clock)
+    clock.now = 30.0
+    breaker.allow()
+
+    breaker.record_success()
+
+    assert breaker.state == CLOSED
+    assert breaker.allow() and breaker.allow()
+
+
+def test_failed_trial_reopens_the_breaker() -> None:
+    clock = FakeClock()
+    breaker = _open_breaker(clock)
+    clock.now = 30.0
+    breaker.allow()
+
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    clock.now = 60.0
+    assert breaker.allow()
+
+
+def test_cancelled_trial_call_frees_the_breaker() -> None:
+    clock = FakeClock()
+    provider = HttpRateProvider(breaker=_open_breaker(clock))
+    clock.now = 30.0
+
+    async def stall(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(60)
+        return httpx.Response(200)
+
+    async def scenario() -> bool:
+        provider.client = httpx.AsyncClient(
+            transport=httpx.MockTransport(stall))
+        trial = asyncio.create_task(provider.get_rate("GEL", "USD"))
+        await asyncio.sleep(0.01)
+        trial.cancel()
+        await asyncio.gather(trial, return_exceptions=True)
+        await provider.close()
+        return provider.breaker.allow()
+
+    assert asyncio.run(scenario())
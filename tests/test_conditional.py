@@ -0,0 +1,39 @@
+import pytest
+from fastapi.testclient import TestClient
+
+
+def _create_product(client: TestClient, barcode: str) -> None:
+    client.post("/products/", json={"name": "milk", "barcode": barcode,
+                                    "price": 3})
+
+
+@pytest.mark.parametrize("if_none_match", [
+    "{etag}", "W/{etag}", "*", '"catalog-0", {etag}'])
+def test_unchanged_catalog_is_not_modified(client: TestClient,
+                                           if_none_match: str) -> None:
+    _create_product(client, "4860000000201")
+    etag = client.get("/products/").headers["ETag"]
+
+    response = client.get("/products/", headers={
+        "If-None-Match": if_none_match.format(etag=etag)})
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+
+def test_catalog_write_changes_the_etag(client: TestClient) -> None:
+    _create_product(client, "4860000000202")
+    products_etag = client.get("/products/").headers["ETag"]
+    campaigns_etag = client.get("/campaign").headers["ETag"]
+
+    client.post("/campaign/discount", json={"discount": 10})
+    products = client.get("/products/",
+                          headers={"If-None-Match": products_etag})
+    campaigns = client.get("/campaign",
+                           headers={"If-None-Match": campaigns_etag})
+
+    assert products.status_code == campaigns.status_code == 200
+    assert products.headers["ETag"] != products_etag
+    assert campaigns.headers["ETag"] != campaigns_etag
+    assert len(products.json()["products"]) == 1
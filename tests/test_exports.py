@@ -0,0 +1,35 @@
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+from fastapi.testclient import TestClient
+
+# Bounds in an offset other than the server's, as a client abroad sends them
+CLIENT_ZONE = timezone(timedelta(hours=4, minutes=30))
+
+
+def _pay_receipt(client: TestClient) -> str:
+    shift = client.post("/shifts").json()
+    receipt = client.post("/receipts", json={"shift_id": shift["id"]}).json()
+    client.post(f"/pay/gel/{receipt['id']}")
+    return str(receipt["id"])
+
+
+def _export(client: TestClient, start: datetime,
+            end: datetime) -> List[Dict[str, Any]]:
+    response = client.get("/exports/receipts", params={
+        "start": start.isoformat(), "end": end.isoformat()})
+    assert response.status_code == 200
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_export_accepts_timezone_aware_bounds(client: TestClient) -> None:
+    receipt_id = _pay_receipt(client)
+    now = datetime.now(CLIENT_ZONE)
+
+    rows = _export(client, now - timedelta(hours=1), now + timedelta(hours=1))
+    earlier = _export(client, now - timedelta(hours=2),
+                      now - timedelta(hours=1))
+
+    assert [row["id"] for row in rows] == [receipt_id]
+    assert earlier == []
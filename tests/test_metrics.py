@@ -0,0 +1,68 @@
+import re
+from typing import Dict, List, Tuple
+
+from fastapi.testclient import TestClient
+
+LABEL = r'[a-zA-Z_][a-zA-Z0-9_]*="(?:[^"\\\n]|\\.)*"'
+SAMPLE = re.compile(
+    rf'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{{{LABEL}(?:,{LABEL})*\}})? (\S+)$')
+HISTOGRAM_SUFFIXES = ("_bucket", "_sum", "_count")
+
+
+def _parse(text: str) -> Dict[str, float]:
+    # Checks the exposition format while collecting every sample by series
+    types: Dict[str, str] = {}
+    samples: Dict[str, float] = {}
+    assert text.endswith("\n")
+    for line in text.splitlines():
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ")
+            assert kind in ("counter", "gauge", "histogram")
+            types[name] = kind
+            continue
+        if line.startswith("# HELP "):
+            continue
+
+        match = SAMPLE.match(line)
+        assert match, line
+        name, labels, value = match.groups()
+        family = name
+        for suffix in HISTOGRAM_SUFFIXES:
+            if name.endswith(suffix) and \
+                    types.get(name.removesuffix(suffix)) == "histogram":
+                family = name.removesuffix(suffix)
+        assert family in types, f"{name} has no TYPE line"
+        series = name + (labels or "")
+        assert series not in samples, f"duplicate series {series}"
+        samples[series] = float(value)
+    return samples
+
+
+def _buckets(samples: Dict[str, float],
+             labels: str) -> List[Tuple[str, float]]:
+    prefix = f"pos_http_request_duration_seconds_bucket{{{labels},le="
+    return [(series[len(prefix):-1], value)
+            for series, value in samples.items()
+            if series.startswith(prefix)]
+
+
+def test_metrics_exposes_per_route_series(client: TestClient) -> None:
+    client.post("/shifts")
+    client.post("/shifts")
+    client.get("/no/such/route")
+
+    response = client.get("/metrics")
+    samples = _parse(response.text)
+
+    assert response.headers["content-type"].startswith(
+        "text/plain; version=0.0.4")
+    route = 'method="POST",route="/shifts"'
+    assert samples[f'pos_http_requests_total{{{route},status="2xx"}}'] == 2
+    assert samples['pos_http_requests_total{method="",route="unmatched",'
+                   'status="4xx"}'] == 1
+
+    buckets = _buckets(samples, route)
+    counts = [count for _, count in buckets]
+    assert buckets[-1] == ('"+Inf"', 2)
+    assert counts == sorted(counts)
+    assert samples[f"pos_http_request_duration_seconds_count{{{route}}}"] == 2
@@ -0,0 +1,88 @@
+from typing import Any, Dict, List, Optional
+
+from fastapi.testclient import TestClient
+
+PRODUCTS = (("pear", 4.0), ("apple", 1.5), ("plum", 2.0), ("apricot", 3.0),
+            ("banana", 0.5), ("peach", 5.0))
+
+
+def _create_products(client: TestClient) -> Dict[str, str]:
+    return {name: client.post("/products/", json={
+        "name": name, "barcode": str(4860000000100 + number),
+        "price": price}).json()["product"]["id"]
+        for number, (name, price) in enumerate(PRODUCTS)}
+
+
+def _walk(client: TestClient, url: str, key: str,
+          **params: Any) -> List[List[Dict[str, Any]]]:
+    pages = []
+    cursor: Optional[str] = None
+    while True:
+        if cursor is not None:
+            params["cursor"] = cursor
+        response = client.get(url, params=params)
+        assert response.status_code == 200
+        pages.append(response.json()[key])
+        cursor = response.json()["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_products_by_id_walk_every_product_once(client: TestClient) -> None:
+    ids = _create_products(client)
+
+    pages = _walk(client, "/products/", "products", limit=3)
+
+    # An exactly full last page ends the walk instead of an empty one
+    assert [len(page) for page in pages] == [3, 3]
+    assert [product["id"] for page in pages for product in page] == sorted(
+        ids.values())
+
+
+def test_products_by_name_are_ordered_across_pages(
+        client: TestClient) -> None:
+    _create_products(client)
+
+    pages = _walk(client, "/products/", "products", limit=4,
+                  order_by="name")
+
+    assert [len(page) for page in pages] == [4, 2]
+    assert [product["name"] for page in pages for product in page] == sorted(
+        name for name, _ in PRODUCTS)
+
+
+def test_products_filter_by_name_prefix_and_price(
+        client: TestClient) -> None:
+    _create_products(client)
+
+    pages = _walk(client, "/products/", "products", limit=1,
+                  order_by="name", name_prefix="p", min_price=2.0,
+                  max_price=4.0)
+
+    assert [product["name"] for page in pages for product in page] == [
+        "pear", "plum"]
+
+
+def test_products_reject_a_malformed_cursor(client: TestClient) -> None:
+    response = client.get("/products/", params={"cursor": "not a cursor"})
+
+    assert response.status_code == 400
+
+
+def test_campaigns_walk_and_filter_by_type(client: TestClient) -> None:
+    discounts = [client.post("/campaign/discount",
+                             json={"discount": 10}).json()["id"]
+                 for _ in range(3)]
+    combos = [client.post("/campaign/combo",
+                          json={"discount": 5}).json()["id"]
+              for _ in range(2)]
+
+    pages = _walk(client, "/campaign", "campaigns", limit=2)
+    filtered = _walk(client, "/campaign", "campaigns", limit=2,
+                     campaign_type="combo")
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [campaign["id"] for page in pages for campaign in page] == sorted(
+        discounts + combos)
+    assert [campaign["id"] for page in filtered for campaign in page] == (
+        sorted(combos))
@@ -0,0 +1,60 @@
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.exceptions.shift_exceptions import ShiftClosedErrorMessage
+from app.core.models.payment import Payment
+
+
+def test_pay_applies_receipt_campaign_once(client: TestClient) -> None:
+    product = client.post("/products/", json={
+        "name": "bread", "barcode": "4860000000001", "price": 100}).json()
+    client.post("/campaign/receipt_discount",
+                json={"discount": 10, "amount": 50})
+    shift = client.post("/shifts").json()
+    receipt = client.post("/receipts", json={"shift_id": shift["id"]}).json()
+    client.post(f"/receipts/{receipt['id']}/product", json={
+        "product_id": product["product"]["id"], "quantity": 1})
+
+    # Every read prices the receipt; none of them may change what is charged
+    for _ in range(3):
+        client.get(f"/receipts/{receipt['id']}")
+    response = client.post(f"/pay/gel/{receipt['id']}")
+
+    assert response.status_code == 200
+    assert response.json() == 90.0
+
+
+def test_pay_twice_is_rejected(client: TestClient) -> None:
+    shift = client.post("/shifts").json()
+    receipt = client.post("/receipts", json={"shift_id": shift["id"]}).json()
+
+    assert client.post(f"/pay/gel/{receipt['id']}").status_code == 200
+    assert client.post(f"/pay/gel/{receipt['id']}").status_code == 403
+
+
+def test_pay_is_rejected_once_the_shift_closes(client: TestClient) -> None:
+    product = client.post("/products/", json={
+        "name": "water", "barcode": "4860000000002", "price": 10}).json()
+    shift = client.post("/shifts").json()
+    receipt = client.post("/receipts", json={"shift_id": shift["id"]}).json()
+    client.post(f"/receipts/{receipt['id']}/product", json={
+        "product_id": product["product"]["id"], "quantity": 1})
+    app: Any = client.app
+    payments = app.state.core.payment_interactor
+
+    # The shift closes while the payment waits on its FX rate
+    payable, payable_shift, amount = payments._get_payable(receipt["id"])
+    assert client.patch(f"/shifts/{shift['id']}").status_code == 200
+    payment = Payment(receipt_id=payable.id, shift_id=payable.shift_id,
+                      currency="GEL", rate=1.0, amount=amount,
+                      converted_amount=amount)
+    with pytest.raises(ShiftClosedErrorMessage):
+        payments._settle(receipt=payable, shift=payable_shift,
+                         payment=payment)
+
+    report = client.get(f"/reports/Zreport/{shift['id']}").json()
+    sales = client.get("/reports/sales").json()
+    assert report["number_of_receipts"] == 0
+    assert sales["number_of_receipts"] == 0
@@ -0,0 +1,128 @@
+import asyncio
+from typing import List, Tuple
+
+import pytest
+
+from app.core.exceptions.payment_exceptions import (
+    ExchangeRateUnavailableError,
+)
+from app.core.services.rate_cache import RateCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Upstream:
+    def __init__(self) -> None:
+        self.rates: List[float] = []
+        self.calls = 0
+        self.failing = False
+
+    async def fetch(self, from_currency: str, to_currency: str) -> float:
+        self.calls += 1
+        await asyncio.sleep(0)
+        if self.failing:
+            raise ConnectionError("provider down")
+        return self.rates[self.calls - 1]
+
+
+def _make_cache() -> Tuple[RateCache, FakeClock, Upstream]:
+    clock = FakeClock()
+    cache = RateCache(ttl=60.0, max_staleness=600.0, clock=clock)
+    return cache, clock, Upstream()
+
+
+def test_fresh_rate_is_served_from_cache() -> None:
+    cache, clock, upstream = _make_cache()
+    upstream.rates = [0.37]
+
+    async def scenario() -> List[float]:
+        first = await cache.get("GEL", "USD", upstream.fetch)
+        clock.now = 60.0
+        return [first, await cache.get("GEL", "USD", upstream.fetch)]
+
+    assert asyncio.run(scenario()) == [0.37, 0.37]
+    assert upstream.calls == 1
+    assert (cache.stats.misses, cache.stats.hits) == (1, 1)
+
+
+def test_stale_rate_is_served_while_it_refreshes() -> None:
+    cache, clock, upstream = _make_cache()
+    upstream.rates = [0.37, 0.38]
+
+    async def scenario() -> List[float]:
+        first = await cache.get("GEL", "USD", upstream.fetch)
+        clock.now = 61.0
+        stale = await cache.get("GEL", "USD", upstream.fetch)
+        # Let the background refresh finish
+        await asyncio.sleep(0.01)
+        return [first, stale, await cache.get("GEL", "USD", upstream.fetch)]
+
+    assert asyncio.run(scenario()) == [0.37, 0.37, 0.38]
+    assert upstream.calls == 2
+    assert cache.stats.stale_hits == 1
+
+
+def test_rate_past_max_staleness_fails_while_upstream_is_down() -> None:
+    cache, clock, upstream = _make_cache()
+    upstream.rates = [0.37]
+
+    async def scenario() -> float:
+        await cache.get("GEL", "USD", upstream.fetch)
+        upstream.failing = True
+        clock.now = 601.0
+        return await cache.get("GEL", "USD", upstream.fetch)
+
+    with pytest.raises(ExchangeRateUnavailableError):
+        asyncio.run(scenario())
+    assert cache.stats.misses == 2
+
+
+def test_failed_background_refresh_keeps_the_stale_rate() -> None:
+    cache, clock, upstream = _make_cache()
+    upstream.rates = [0.37]
+
+    async def scenario() -> List[float]:
+        await cache.get("GEL", "USD", upstream.fetch)
+        upstream.failing = True
+        clock.now = 300.0
+        stale = await cache.get("GEL", "USD", upstream.fetch)
+        await asyncio.sleep(0.01)
+        return [stale, await cache.get("GEL", "USD", upstream.fetch)]
+
+    assert asyncio.run(scenario()) == [0.37, 0.37]
+    assert cache.stats.refresh_failures >= 1
+
+
+def test_concurrent_misses_share_one_upstream_call() -> None:
+    cache, _, upstream = _make_cache()
+    upstream.rates = [0.37]
+
+    async def scenario() -> List[float]:
+        return list(await asyncio.gather(
+            *(cache.get("GEL", "USD", upstream.fetch) for _ in range(10))))
+
+    assert asyncio.run(scenario()) == [0.37] * 10
+    assert upstream.calls == 1
+    assert cache.stats.coalesced == 9
+
+
+def test_upstream_error_reaches_every_waiter() -> None:
+    cache, _, upstream = _make_cache()
+    upstream.failing = True
+
+    async def scenario() -> List[object]:
+        return list(await asyncio.gather(
+            *(cache.get("GEL", "USD", upstream.fetch) for _ in range(10)),
+            return_exceptions=True))
+
+    results = asyncio.run(scenario())
+    assert upstream.calls == 1
+    assert all(isinstance(result, ExchangeRateUnavailableError)
+               for result in results)
+    assert len(results) == 10
@@ -0,0 +1,32 @@
+import asyncio
+
+from app.core.facade import POSCore
+from app.core.repositories.rate_provider import IRateProvider
+from app.infra.data.in_memory import InMemoryRepoFactory
+from app.infra.rate_refresher import RateRefresher
+
+
+class SlowRateProvider(IRateProvider):
+    async def open(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    async def get_rate(self, from_currency: str, to_currency: str) -> float:
+        await asyncio.sleep(0.2)
+        return 0.5
+
+
+def test_startup_prefetches_every_pair_within_timeout() -> None:
+    core = POSCore.create(InMemoryRepoFactory(),
+                          rate_provider=SlowRateProvider())
+    refresher = RateRefresher(core=core, startup_timeout=0.3)
+
+    async def start_and_stop() -> int:
+        await refresher.start()
+        size = core.payment_interactor.payment_service.rate_cache.size()
+        await refresher.stop()
+        return size
+
+    assert asyncio.run(start_and_stop()) == 2
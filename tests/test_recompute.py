@@ -0,0 +1,88 @@
+from pathlib import Path
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.models.report import ReportTotals
+from app.infra.data import recompute
+from app.infra.data.recompute import ParallelReportRecompute
+from app.infra.data.sqlite import connect
+from app.infra.sql_trace import SqlTracer, connect_traced
+
+
+def _pay_receipts(client: TestClient, count: int,
+                  barcode: str = "4860000000003") -> str:
+    product = client.post("/products/", json={
+        "name": "tea", "barcode": barcode, "price": 3}).json()
+    shift = client.post("/shifts").json()
+    for _ in range(count):
+        receipt = client.post("/receipts",
+                              json={"shift_id": shift["id"]}).json()
+        client.post(f"/receipts/{receipt['id']}/product", json={
+            "product_id": product["product"]["id"], "quantity": 2})
+        client.post(f"/pay/usd/{receipt['id']}")
+    return str(shift["id"])
+
+
+def test_audit_reports_stored_scopes_without_receipts(
+        sqlite_client: TestClient, tmp_path: Path) -> None:
+    _pay_receipts(sqlite_client, count=3)
+    job = ParallelReportRecompute(database_path=str(tmp_path / "pos.db"),
+                                  workers=2)
+    assert job.audit() == []
+
+    app: Any = sqlite_client.app
+    app.state.core.payment_interactor.report_service.report_repository.add(
+        scopes=["shift:deleted"], totals=ReportTotals(number_of_receipts=1))
+
+    assert job.audit() == ["shift:deleted"]
+
+
+def test_rebuild_drops_scopes_without_receipts(
+        sqlite_client: TestClient, tmp_path: Path) -> None:
+    _pay_receipts(sqlite_client, count=2)
+    app: Any = sqlite_client.app
+    app.state.core.payment_interactor.report_service.report_repository.add(
+        scopes=["shift:deleted"], totals=ReportTotals(number_of_receipts=1))
+    job = ParallelReportRecompute(database_path=str(tmp_path / "pos.db"),
+                                  workers=2)
+
+    result = job.rebuild()
+
+    assert result.totals["lifetime"].number_of_receipts == 2
+    assert job.audit() == []
+
+
+def test_audit_reports_drift_in_sold_amount(
+        sqlite_client: TestClient, tmp_path: Path) -> None:
+    _pay_receipts(sqlite_client, count=2)
+    database_path = str(tmp_path / "pos.db")
+    connection = connect(database_path)
+    with connection.transaction() as cursor:
+        cursor.execute("UPDATE report_items SET amount = amount + 1 "
+                       "WHERE scope = 'lifetime'")
+    connection.close()
+
+    job = ParallelReportRecompute(database_path=database_path, workers=2)
+
+    assert job.audit() == ["lifetime"]
+
+
+def test_aggregate_shifts_loads_receipts_in_bulk(
+        sqlite_client: TestClient, tmp_path: Path,
+        sql_tracer: SqlTracer, monkeypatch: pytest.MonkeyPatch) -> None:
+    shift_ids = [_pay_receipts(sqlite_client, count=4,
+                               barcode=f"486000000000{index}")
+                 for index in range(3)]
+    database_path = str(tmp_path / "pos.db")
+    monkeypatch.setattr(
+        recompute, "_connect_read_only",
+        lambda path: connect_traced(path, [sql_tracer.record]))
+
+    with sql_tracer.capture() as stats:
+        totals = recompute.aggregate_shifts(database_path, shift_ids)
+
+    assert totals["lifetime"].number_of_receipts == 12
+    # Items, receipts and payments for the one chunk
+    assert stats.statements == 3
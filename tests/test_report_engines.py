@@ -0,0 +1,132 @@
+from typing import Any, Dict, List, Tuple
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.schemas.report_schema import ReportResponse
+from app.core.services.report_service import ObjectReportEngine
+from app.infra.data.sqlite import SqliteReportEngine
+
+# Currencies each receipt of a shift is paid in; the last shift stays open
+SHIFTS = (("gel", "usd"), ("eur", "gel", "usd", "eur"), ("usd", "gel"))
+
+
+def _seed_sales(client: TestClient) -> List[str]:
+    products = [client.post("/products/", json={
+        "name": f"product {number}",
+        "barcode": str(4860000000000 + number),
+        "price": 2.5 + number}).json()["product"]["id"]
+        for number in range(6)]
+
+    discount = client.post("/campaign/discount",
+                           json={"discount": 10}).json()
+    client.post(f"/campaign/discount/{discount['id']}/{products[0]}")
+    combo = client.post("/campaign/combo", json={"discount": 5}).json()
+    for product_id in products[1:3]:
+        client.post(f"/campaign/combo/{combo['id']}/{product_id}",
+                    json={"product_id": product_id, "quantity": 1})
+    gift = client.post("/campaign/buy_n_get_n", json={
+        "product": {"product_id": products[3], "num": 2},
+        "gift": {"product_id": products[4], "num": 1}}).json()
+
+    shift_ids = []
+    for currencies in SHIFTS:
+        shift = client.post("/shifts").json()
+        for number, currency in enumerate(currencies):
+            receipt = client.post("/receipts",
+                                  json={"shift_id": shift["id"]}).json()
+            url = f"/receipts/{receipt['id']}"
+            client.post(f"{url}/product", json={
+                "product_id": products[0], "quantity": number + 1})
+            client.post(f"{url}/product", json={
+                "product_id": products[5], "quantity": 1})
+            client.post(f"{url}/combo",
+                        json={"combo_id": combo["id"], "quantity": 1})
+            client.post(f"{url}/buy_n_get_n",
+                        json={"gift_campaign_id": gift["id"], "quantity": 1})
+            assert client.post(
+                f"/pay/{currency}/{receipt['id']}").status_code == 200
+
+        # Unpaid receipts count in neither report
+        unpaid = client.post("/receipts", json={"shift_id": shift["id"]})
+        client.post(f"/receipts/{unpaid.json()['id']}/product", json={
+            "product_id": products[5], "quantity": 3})
+        shift_ids.append(shift["id"])
+
+    for shift_id in shift_ids[:-1]:
+        client.patch(f"/shifts/{shift_id}")
+    return shift_ids
+
+
+def _engines(client: TestClient) -> Tuple[SqliteReportEngine,
+                                          ObjectReportEngine]:
+    app: Any = client.app
+    core = app.state.core
+    return (SqliteReportEngine(app.state.infra.connection),
+            ObjectReportEngine(
+                shift_service=core.shift_interactor.shift_service,
+                payment_service=core.payment_interactor.payment_service))
+
+
+def _normalize(report: ReportResponse) -> Dict[str, Any]:
+    return {"number_of_receipts": report.number_of_receipts,
+            "revenue": {currency: round(amount, 6)
+                        for currency, amount in report.revenue.items()},
+            "sold": sorted((product.product_id, product.num)
+                           for product in report.sold_product_count)}
+
+
+def test_xreport_matches_object_engine(sqlite_client: TestClient) -> None:
+    _seed_sales(sqlite_client)
+    sql_engine, object_engine = _engines(sqlite_client)
+
+    report = _normalize(sql_engine.make_xreport())
+
+    assert report == _normalize(object_engine.make_xreport())
+    assert set(report["revenue"]) == {"GEL", "USD", "EUR"}
+    assert report["number_of_receipts"] == sum(map(len, SHIFTS))
+
+
+@pytest.mark.parametrize("shift", range(len(SHIFTS) - 1))
+def test_zreport_matches_object_engine(sqlite_client: TestClient,
+                                       shift: int) -> None:
+    shift_id = _seed_sales(sqlite_client)[shift]
+    sql_engine, object_engine = _engines(sqlite_client)
+
+    assert (_normalize(sql_engine.make_zreport(shift_id)) ==
+            _normalize(object_engine.make_zreport(shift_id)))
+
+
+def test_columnar_engine_matches_object_engine_exactly(
+        client: TestClient) -> None:
+    pytest.importorskip("numpy")
+    from app.core.services.columnar_report import ColumnarReportEngine
+
+    # 15% off 9.99 leaves fractional cents on every receipt
+    product = client.post("/products/", json={
+        "name": "coffee", "barcode": "4860000000021",
+        "price": 9.99}).json()["product"]["id"]
+    discount = client.post("/campaign/discount",
+                           json={"discount": 15}).json()
+    client.post(f"/campaign/discount/{discount['id']}/{product}")
+    shift = client.post("/shifts").json()
+    for _ in range(3):
+        receipt = client.post("/receipts",
+                              json={"shift_id": shift["id"]}).json()
+        client.post(f"/receipts/{receipt['id']}/product",
+                    json={"product_id": product, "quantity": 1})
+        client.post(f"/pay/gel/{receipt['id']}")
+    client.patch(f"/shifts/{shift['id']}")
+
+    app: Any = client.app
+    core = app.state.core
+    services = {"shift_service": core.shift_interactor.shift_service,
+                "payment_service": core.payment_interactor.payment_service}
+    columnar = ColumnarReportEngine(**services)
+    expected = ObjectReportEngine(**services)
+
+    assert columnar.make_xreport() == expected.make_xreport()
+    assert (columnar.make_zreport(shift["id"]) ==
+            expected.make_zreport(shift["id"]))
+    assert expected.make_xreport().revenue["GEL"] != round(
+        expected.make_xreport().revenue["GEL"], 2)
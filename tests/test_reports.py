@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+
+
+def test_top_products_bottom_includes_unsold_products(
+        client: TestClient) -> None:
+    sold, unsold = (client.post("/products/", json={
+        "name": name, "barcode": barcode, "price": 5}).json()["product"]["id"]
+        for name, barcode in (("milk", "4860000000011"),
+                              ("salt", "4860000000012")))
+    shift = client.post("/shifts").json()
+    receipt = client.post("/receipts", json={"shift_id": shift["id"]}).json()
+    client.post(f"/receipts/{receipt['id']}/product", json={
+        "product_id": sold, "quantity": 4})
+    client.post(f"/pay/gel/{receipt['id']}")
+
+    response = client.get("/reports/top-products", params={"limit": 1})
+
+    assert response.status_code == 200
+    assert [item["product_id"] for item in response.json()["top"]] == [sold]
+    assert response.json()["bottom"] == [
+        {"product_id": unsold, "quantity": 0, "amount": 0.0}]
+
+
+
+def test_top_products_unknown_shift_is_not_found(client: TestClient) -> None:
+    client.post("/products/", json={
+        "name": "milk", "barcode": "4860000000011", "price": 5})
+
+    response = client.get("/reports/top-products",
+                          params={"shift_id": "missing"})
+
+    assert response.status_code == 404
+
+def test_sales_analytics_accepts_timezone_aware_bounds(
+        client: TestClient) -> None:
+    shift = client.post("/shifts").json()
+    receipt = client.post("/receipts", json={"shift_id": shift["id"]}).json()
+    client.post(f"/pay/gel/{receipt['id']}")
+    # An offset other than the server's, as a client abroad sends it
+    now = datetime.now(timezone(timedelta(hours=4, minutes=30)))
+
+    response = client.get("/reports/analytics", params={
+        "start": (now - timedelta(minutes=5)).isoformat(),
+        "end": now.isoformat()})
+
+    assert response.status_code == 200
+    assert [bucket["number_of_receipts"]
+            for bucket in response.json()["buckets"]] == [1]
@@ -0,0 +1,26 @@
+import pytest
+
+from app.runner.settings import Settings
+
+
+def test_sqlite_rejects_more_than_one_db_worker() -> None:
+    with pytest.raises(ValueError):
+        Settings.load({"POS_BACKEND": "sqlite", "POS_DB_WORKERS": "2"})
+
+
+def test_memory_accepts_several_db_workers() -> None:
+    settings = Settings.load({"POS_BACKEND": "memory", "POS_DB_WORKERS": "4"})
+
+    assert settings.db_workers == 4
+
+
+def test_fx_rate_cache_lifetimes_are_configurable() -> None:
+    settings = Settings.load({"POS_FX_RATE_TTL": "15",
+                              "POS_FX_MAX_STALENESS": "120"})
+
+    assert (settings.fx_rate_ttl, settings.fx_max_staleness) == (15.0, 120.0)
+
+
+def test_fx_rate_ttl_above_max_staleness_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        Settings(fx_rate_ttl=120.0, fx_max_staleness=60.0)
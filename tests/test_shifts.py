@@ -0,0 +1,35 @@
+from typing import Any
+
+from fastapi.testclient import TestClient
+
+
+def test_zreport_snapshot_counts_receipts_without_running_totals(
+        client: TestClient) -> None:
+    product = client.post("/products/", json={
+        "name": "milk", "barcode": "4860000000002", "price": 4}).json()
+    shift = client.post("/shifts").json()
+    for quantity in (1, 2):
+        receipt = client.post("/receipts",
+                              json={"shift_id": shift["id"]}).json()
+        client.post(f"/receipts/{receipt['id']}/product", json={
+            "product_id": product["product"]["id"], "quantity": quantity})
+        client.post(f"/pay/gel/{receipt['id']}")
+
+    # Running totals start empty, as for sales made before they existed
+    app: Any = client.app
+    app.state.core.payment_interactor.report_service.report_repository \
+        .replace(totals={})
+    assert client.patch(f"/shifts/{shift['id']}").status_code == 200
+    report = client.get(f"/reports/Zreport/{shift['id']}").json()
+
+    assert report["number_of_receipts"] == 2
+    assert report["revenue"] == {"GEL": 12.0}
+    assert report["sold_product_count"] == [
+        {"product_id": product["product"]["id"], "num": 3}]
+
+
+def test_closing_a_closed_shift_is_rejected(client: TestClient) -> None:
+    shift = client.post("/shifts").json()
+
+    assert client.patch(f"/shifts/{shift['id']}").status_code == 200
+    assert client.patch(f"/shifts/{shift['id']}").status_code == 403
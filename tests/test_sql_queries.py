@@ -0,0 +1,63 @@
+from pathlib import Path
+from typing import Any
+
+from app.core.models.page import MAX_PAGE_SIZE
+from app.core.models.product import Product
+from app.core.models.receipt import Receipt
+from app.core.models.shift import Shift
+from app.core.services.product_service import ProductService
+from app.infra.data.sqlite import SqliteRepoFactory
+from app.infra.sql_trace import QueryStats
+from tests.conftest import make_client
+
+
+def test_shift_get_all_does_not_query_per_receipt(
+        traced_sqlite: SqliteRepoFactory, sql_queries: QueryStats) -> None:
+    shifts = traced_sqlite.shifts()
+    receipts = traced_sqlite.receipts()
+    for _ in range(3):
+        shift = shifts.create(Shift(id="", receipts=[]))
+        for _ in range(4):
+            receipts.create(Receipt(id="", shift_id=shift.id, items=[],
+                                    total=0, status=False))
+    sql_queries.statements = 0
+
+    loaded = shifts.get_all()
+
+    assert [len(shift.receipts) for shift in loaded] == [4, 4, 4]
+    assert sql_queries.statements == 3
+
+
+def test_open_receipt_does_not_load_the_shift_receipts(
+        tmp_path: Path) -> None:
+    with make_client("sqlite", tmp_path, sql_trace=True) as client:
+        app: Any = client.app
+        shift = client.post("/shifts").json()
+        for _ in range(3):
+            client.post("/receipts", json={"shift_id": shift["id"]})
+        with app.state.sql_tracer.capture() as stats:
+            response = client.post("/receipts",
+                                   json={"shift_id": shift["id"]})
+
+    # The shift lookup and the INSERT
+    assert response.status_code == 201
+    assert stats.statements == 2
+
+
+def test_unsold_products_are_read_as_ids_up_to_the_limit(
+        traced_sqlite: SqliteRepoFactory, sql_queries: QueryStats) -> None:
+    service = ProductService(
+        product_repository=traced_sqlite.products(),
+        catalog_version_repository=traced_sqlite.catalog_version())
+    ids = [service.create_product(Product(
+        id="", name=f"p{index}", barcode=f"48600000{index:05}", price=1)).id
+        for index in range(MAX_PAGE_SIZE + 5)]
+    sold = set(sorted(ids)[:MAX_PAGE_SIZE - 1])
+    sql_queries.by_sql.clear()
+
+    unsold = service.get_unsold_ids(sold, limit=3)
+
+    assert unsold == sorted(ids)[MAX_PAGE_SIZE - 1:MAX_PAGE_SIZE + 2]
+    assert [stat.sql for stat in sql_queries.by_sql.values()] == [
+        "SELECT id FROM products WHERE id > ? ORDER BY id LIMIT ?"]
+    assert sum(stat.count for stat in sql_queries.by_sql.values()) == 2
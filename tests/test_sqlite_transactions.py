@@ -0,0 +1,47 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from app.infra.data.sqlite import connect
+
+
+def test_transaction_takes_the_write_lock_before_reading(
+        tmp_path: Path) -> None:
+    path = str(tmp_path / "pos.db")
+    # Two connections stand in for two worker processes
+    first = connect(path, timeout=0.1)
+    second = connect(path, timeout=0.1)
+    with first.transaction() as cursor:
+        cursor.execute("CREATE TABLE counters (value INTEGER)")
+        cursor.execute("INSERT INTO counters VALUES (0)")
+
+    with first.transaction() as cursor:
+        value = cursor.execute("SELECT value FROM counters").fetchone()[0]
+        # A read-modify-write elsewhere must wait for this one to finish
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            with second.transaction() as other:
+                other.execute("UPDATE counters SET value = value + 1")
+        cursor.execute("UPDATE counters SET value = ?", (value + 1,))
+
+    with second.transaction() as other:
+        other.execute("UPDATE counters SET value = value + 1")
+    assert first.execute("SELECT value FROM counters").fetchone()[0] == 2
+    first.close()
+    second.close()
+
+
+def test_transaction_rolls_back_on_error(tmp_path: Path) -> None:
+    connection = connect(str(tmp_path / "pos.db"))
+    connection.execute("CREATE TABLE counters (value INTEGER)")
+
+    with pytest.raises(RuntimeError):
+        with connection.transaction() as cursor:
+            cursor.execute("INSERT INTO counters VALUES (1)")
+            with connection.transaction() as nested:
+                nested.execute("INSERT INTO counters VALUES (2)")
+            raise RuntimeError
+
+    assert not connection.in_transaction
+    assert connection.execute("SELECT COUNT(*) FROM counters").fetchone() == (0,)
+    connection.close()